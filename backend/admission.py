@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+HR Agent Admission - Search deadlines and load shedding
+Every search gets a deadline (the request's deadlineMs or the server
+default) counted from its arrival, so time spent waiting for a search
+worker comes out of its budget. A search that runs out returns the best
+results it has found so far, flagged partial. The admission controller
+watches how long admitted searches wait for a worker: past one limit new
+searches are degraded to a short budget, past a second they are turned
+away (503) until the queue drains.
+Pure Python 3 standard library implementation
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Budget of a search that does not ask for one (HR_AGENT_SEARCH_DEADLINE_MS overrides)
+DEFAULT_DEADLINE_MS = 2000
+MAX_DEADLINE_MS = 30000
+
+# Queue wait past which searches are degraded / rejected
+DEGRADE_AFTER_MS = 250
+REJECT_AFTER_MS = 1000
+
+# Worker time a degraded search gets once it starts
+DEGRADED_DEADLINE_MS = 100
+
+RETRY_AFTER_SECONDS = 1
+
+
+class Overloaded(Exception):
+    """Raised by AdmissionController.admit when searches queue for too long."""
+
+
+class Deadline:
+    """
+    A point in time a search should stop by. reached is set once the search
+    has seen it pass (and so returned partial results).
+    """
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+        self.reached = False
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        if not self.reached and time.monotonic() >= self.expires_at:
+            self.reached = True
+        return self.reached
+
+    def cap(self, seconds: float):
+        """Move the deadline to at most seconds from now."""
+        self.expires_at = min(self.expires_at, time.monotonic() + seconds)
+
+
+def default_deadline_ms() -> float:
+    try:
+        return float(os.environ.get("HR_AGENT_SEARCH_DEADLINE_MS", DEFAULT_DEADLINE_MS))
+    except ValueError:
+        return DEFAULT_DEADLINE_MS
+
+
+def parse_deadline_ms(value: Any, default: Optional[float] = None) -> float:
+    """
+    A request's deadlineMs (None: the default), capped at MAX_DEADLINE_MS.
+    Raises ValueError unless it is a positive number.
+    """
+    if value is None:
+        return default if default is not None else default_deadline_ms()
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError("deadlineMs must be a positive number of milliseconds")
+    return min(float(value), MAX_DEADLINE_MS)
+
+
+class Admission:
+    """One admitted search: its deadline and where it is in the queue."""
+
+    def __init__(self, deadline: Deadline, degraded: bool):
+        self.deadline = deadline
+        self.degraded = degraded
+        self.queued_at = time.monotonic()
+        self.waited = None
+
+    @property
+    def partial(self) -> bool:
+        return self.deadline.reached
+
+
+class AdmissionController:
+    """
+    Admits searches while the oldest one still waiting for a worker has
+    waited less than degrade_after_ms; up to reject_after_ms they are
+    admitted degraded, beyond it rejected. Callers report when an admitted
+    search starts running and when it is done.
+    """
+
+    def __init__(
+        self,
+        degrade_after_ms: float = DEGRADE_AFTER_MS,
+        reject_after_ms: float = REJECT_AFTER_MS,
+        degraded_deadline_ms: float = DEGRADED_DEADLINE_MS,
+    ):
+        self.degrade_after = degrade_after_ms / 1000
+        self.reject_after = reject_after_ms / 1000
+        self.degraded_deadline = degraded_deadline_ms / 1000
+        self._lock = threading.Lock()
+        # Admitted searches not yet running, oldest first
+        self._queued = OrderedDict()
+        self.last_wait = 0.0
+        self.stats = {"admitted": 0, "degraded": 0, "rejected": 0, "partial": 0}
+
+    def queue_wait(self) -> float:
+        """Seconds the oldest queued search has been waiting (0 if none)."""
+        with self._lock:
+            return self._queue_wait()
+
+    def _queue_wait(self) -> float:
+        if not self._queued:
+            return 0.0
+        oldest = next(iter(self._queued.values()))
+        return time.monotonic() - oldest.queued_at
+
+    def admit(self, deadline_ms: float) -> Admission:
+        """Admit a search with a deadline_ms budget; raises Overloaded to shed it."""
+        with self._lock:
+            wait = self._queue_wait()
+            if wait > self.reject_after:
+                self.stats["rejected"] += 1
+                raise Overloaded(
+                    f"Search queue wait {wait * 1000:.0f} ms exceeds {self.reject_after * 1000:.0f} ms; retry later"
+                )
+            degraded = wait > self.degrade_after
+            admission = Admission(Deadline(deadline_ms / 1000), degraded)
+            self._queued[id(admission)] = admission
+            self.stats["admitted"] += 1
+            if degraded:
+                self.stats["degraded"] += 1
+            return admission
+
+    def started(self, admission: Admission):
+        """The search got a worker; a degraded one now gets its short budget."""
+        with self._lock:
+            if self._queued.pop(id(admission), None) is None:
+                return
+            admission.waited = time.monotonic() - admission.queued_at
+            self.last_wait = admission.waited
+        if admission.degraded:
+            admission.deadline.cap(self.degraded_deadline)
+
+    def finished(self, admission: Admission):
+        with self._lock:
+            self._queued.pop(id(admission), None)
+            if admission.partial:
+                self.stats["partial"] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(
+                self.stats,
+                queued=len(self._queued),
+                queueWaitMs=round(self._queue_wait() * 1000, 1),
+                lastWaitMs=round(self.last_wait * 1000, 1),
+            )
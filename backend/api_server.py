@@ -1,52 +1,561 @@
-from flask import Flask, request, jsonify
+import threading
+
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
+from admission import RETRY_AFTER_SECONDS, AdmissionController, Overloaded, parse_deadline_ms
 from backend import (
+    DuplicateCandidate,
+    canonical_filters,
     get_backend,
-    parse_query,
-    search_candidates,
-    save_shortlist,
-    analytics_summary,
+)
+from responses import (
+    accepts_encoding,
+    choose_encoding,
+    compact_search_results,
+    compress,
+    encode_body,
+    http_date,
+    is_not_modified,
+    make_etag,
+)
+from cube import ANALYTICS_FILTERS
+from export import DEFAULT_COLUMNS, EXPORT_FORMATS, SEARCH_COLUMNS, export_stream, resolve_columns, search_rows
+from geo import DEFAULT_RADIUS_KM
+from importer import ImportManager
+from pubsub import KEEPALIVE, format_event, last_event_id, stream_preamble
+from suggest import DEFAULT_SUGGESTIONS, suggestion_limit
+from tenants import (
+    ADMIN_TOKEN_HEADER,
+    DEFAULT_TENANT,
+    TENANT_ENVIRON,
+    TENANT_HEADER,
+    TenantPathMiddleware,
+    TenantRegistry,
+    UnknownTenant,
+    is_admin,
 )
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=['ETag', 'Last-Modified', 'X-Search-Partial'], allow_headers=['Content-Type', TENANT_HEADER])
+# /t/<tenant>/api/... is served as /api/... for that tenant
+app.wsgi_app = TenantPathMiddleware(app.wsgi_app)
+
+# Responses at least this large are compressed when the client accepts it
+COMPRESS_MIN_BYTES = 1024
+
+# Requests without a tenant are served by the process-wide backend
+tenants = TenantRegistry(default=get_backend)
+
+# Searches scored at once; the rest queue under admission control (admission.py)
+SEARCH_SLOTS = 4
+search_slots = threading.BoundedSemaphore(SEARCH_SLOTS)
+admission = AdmissionController()
+
+
+@app.before_request
+def _acquire_tenant():
+    if not request.path.startswith('/api/') or request.method == 'OPTIONS':
+        return None
+    name = request.environ.get(TENANT_ENVIRON) or request.headers.get(TENANT_HEADER)
+    try:
+        g.backend = tenants.acquire(name)
+    except UnknownTenant as e:
+        return jsonify({'error': str(e)}), 404
+    g.tenant = name
+    return None
+
+
+@app.teardown_request
+def _release_tenant(exc):
+    # Can run twice for streamed responses (stream_with_context)
+    if g.pop('backend', None) is not None:
+        tenants.release(g.pop('tenant', None))
+
+
+def current_backend():
+    """The backend of the request's tenant."""
+    return g.backend
+
+
+def get_imports():
+    """Background bulk imports into the tenant's backend (created on first use)."""
+    return tenants.service(g.tenant, 'imports', ImportManager)
+
+
+def _not_modified(etag, last_modified):
+    """Return a 304 response if the request's validators match, else None."""
+    if is_not_modified(
+        etag,
+        last_modified,
+        request.headers.get('If-None-Match'),
+        request.headers.get('If-Modified-Since'),
+    ):
+        response = Response(status=304)
+        _set_validators(response, etag, last_modified)
+        return response
+    return None
+
+
+def _export_response(rows, allowed_columns, filename):
+    """Stream rows as CSV or XLSX (?format=, ?columns=) with chunked transfer."""
+    file_format = request.args.get('format', 'csv')
+    if file_format not in EXPORT_FORMATS:
+        return jsonify({'error': f'Unknown export format: {file_format}'}), 400
+    try:
+        columns = resolve_columns(request.args.get('columns'), allowed_columns)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return Response(
+        stream_with_context(export_stream(rows, columns, file_format)),
+        mimetype=EXPORT_FORMATS[file_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}.{file_format}"'},
+    )
+
+
+def _set_validators(response, etag, last_modified):
+    response.headers['ETag'] = etag
+    response.headers['Last-Modified'] = http_date(last_modified)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.after_request
+def vary_on_tenant(response):
+    """The same URL answers per tenant when the tenant comes from the header."""
+    response.vary.add(TENANT_HEADER)
+    return response
+
+
+@app.after_request
+def compress_response(response):
+    """gzip/deflate-compress large responses when the client accepts it."""
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or 'Content-Encoding' in response.headers
+    ):
+        return response
+    coding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+    if coding is None:
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+    response.set_data(compress(body, coding))
+    response.headers['Content-Encoding'] = coding
+    response.vary.add('Accept-Encoding')
+    return response
+
 
 @app.route('/api/analytics', methods=['GET'])
 def api_analytics():
     try:
-        data = analytics_summary()
-        return jsonify(data)
+        backend = current_backend()
+        filters = {key: request.args[key] for key in ANALYTICS_FILTERS if request.args.get(key)}
+        etag = make_etag('analytics', backend.data_version, canonical_filters(filters))
+        not_modified = _not_modified(etag, backend.last_modified)
+        if not_modified is not None:
+            return not_modified
+        data = backend.analytics_summary(**filters)
+        return _set_validators(jsonify(data), etag, backend.last_modified)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/shortlists', methods=['GET', 'POST'])
 def api_shortlists():
-    backend = get_backend()
+    backend = current_backend()
     if request.method == 'GET':
-        return jsonify(backend.get_shortlists())
+        etag = make_etag('shortlists', backend.data_version)
+        not_modified = _not_modified(etag, backend.last_modified)
+        if not_modified is not None:
+            return not_modified
+        return _set_validators(
+            jsonify(backend.get_shortlists()), etag, backend.last_modified
+        )
     elif request.method == 'POST':
         data = request.get_json()
         name = data.get('name')
-        indices = data.get('candidate_indices', [])
-        success = save_shortlist(name, indices)
+        candidate_ids = data.get('candidate_ids')
+        if candidate_ids is None:
+            # Older clients send list positions
+            candidate_ids = backend.candidate_ids_from_indices(
+                data.get('candidate_indices', [])
+            )
+        success = backend.save_shortlist(name, candidate_ids)
         return jsonify({'success': success})
 
+@app.route('/api/shortlists/combine', methods=['POST'])
+def api_combine_shortlists():
+    # {"operation": "union"|"intersection"|"difference"|"symmetric_difference",
+    #  "shortlists": [names], "saveAs": optional new shortlist name}
+    backend = current_backend()
+    data = request.get_json() or {}
+    try:
+        result = backend.combine_shortlists(
+            data.get('operation'), data.get('shortlists') or [], data.get('saveAs')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if result is None:
+        return jsonify({'error': 'Shortlist not found'}), 404
+    return jsonify(result)
+
+@app.route('/api/shortlists/<name>', methods=['GET'])
+def api_shortlist_candidates(name):
+    backend = current_backend()
+    if name not in backend.shortlists:
+        return jsonify({'error': f'Shortlist not found: {name}'}), 404
+    return jsonify({
+        'name': name,
+        'candidates': backend.get_shortlist_candidates(name),
+    })
+
+@app.route('/api/shortlists/<name>/export', methods=['GET'])
+def api_export_shortlist(name):
+    backend = current_backend()
+    if name not in backend.shortlists:
+        return jsonify({'error': f'Shortlist not found: {name}'}), 404
+    return _export_response(backend.iter_shortlist_candidates(name), DEFAULT_COLUMNS, name)
+
+@app.route('/api/candidates', methods=['POST'])
+def api_create_candidate():
+    # Likely duplicates are refused (409) unless ?allowDuplicates=true
+    allow = request.args.get('allowDuplicates', '').lower() in ('1', 'true')
+    try:
+        candidate = current_backend().create_candidate(request.get_json(), allow_duplicates=allow)
+    except DuplicateCandidate as e:
+        return jsonify({'error': str(e), 'duplicates': e.duplicates}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(candidate), 201
+
+@app.route('/api/duplicates', methods=['GET'])
+def api_duplicates():
+    return jsonify(current_backend().duplicate_clusters())
+
+@app.route('/api/duplicates/check', methods=['POST'])
+def api_check_duplicates():
+    limit = request.args.get('limit', 5, type=int)
+    return jsonify(current_backend().find_duplicates(request.get_json() or {}, limit))
+
+@app.route('/api/duplicates/merge', methods=['POST'])
+def api_merge_duplicates():
+    data = request.get_json() or {}
+    try:
+        candidate = current_backend().merge_candidates(data.get('survivorId'), data.get('duplicateIds', []))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if candidate is None:
+        return jsonify({'error': f"Candidate not found: {data.get('survivorId')}"}), 404
+    return jsonify(candidate)
+
+@app.route('/api/candidates/near', methods=['GET'])
+def api_candidates_near():
+    try:
+        radius = float(request.args.get('radiusKm', DEFAULT_RADIUS_KM))
+        return jsonify(current_backend().candidates_near(request.args.get('location', ''), radius))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/candidates/<int:candidate_id>', methods=['GET', 'PUT', 'PATCH', 'DELETE'])
+def api_candidate(candidate_id):
+    backend = current_backend()
+    if request.method == 'GET':
+        candidate = backend.get_candidate(candidate_id)
+    elif request.method == 'DELETE':
+        if not backend.delete_candidate(candidate_id):
+            return jsonify({'error': f'Candidate not found: {candidate_id}'}), 404
+        return jsonify({'success': True})
+    else:
+        try:
+            candidate = backend.update_candidate(
+                candidate_id, request.get_json(), replace=request.method == 'PUT'
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    if candidate is None:
+        return jsonify({'error': f'Candidate not found: {candidate_id}'}), 404
+    return jsonify(candidate)
+
+@app.route('/api/candidates/<int:candidate_id>/stage', methods=['POST'])
+def api_move_candidate(candidate_id):
+    try:
+        candidate = current_backend().move_candidate(candidate_id, (request.get_json() or {}).get('stage'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if candidate is None:
+        return jsonify({'error': f'Candidate not found: {candidate_id}'}), 404
+    return jsonify(candidate)
+
+@app.route('/api/stages/<stage>/candidates', methods=['GET'])
+def api_stage_candidates(stage):
+    return jsonify(current_backend().candidates_in_stage(stage))
+
+@app.route('/api/analytics/funnel', methods=['GET'])
+def api_stage_funnel():
+    backend = current_backend()
+    start, end = request.args.get('from', ''), request.args.get('to', '')
+    etag = make_etag('funnel', backend.data_version, start, end)
+    not_modified = _not_modified(etag, backend.last_modified)
+    if not_modified is not None:
+        return not_modified
+    try:
+        funnel = backend.stage_funnel(start, end)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return _set_validators(jsonify(funnel), etag, backend.last_modified)
+
+@app.route('/api/candidates/<int:candidate_id>/matches', methods=['GET'])
+def api_candidate_matches(candidate_id):
+    limit = request.args.get('limit', 5, type=int)
+    matches = current_backend().semantic_jobs_for_candidate(candidate_id, limit)
+    if matches is None:
+        return jsonify({'error': f'Candidate not found: {candidate_id}'}), 404
+    return jsonify(matches)
+
+@app.route('/api/candidates/<int:candidate_id>/similar', methods=['GET'])
+def api_similar_candidates(candidate_id):
+    limit = request.args.get('limit', 5, type=int)
+    matches = current_backend().similar_candidates(candidate_id, limit)
+    if matches is None:
+        return jsonify({'error': f'Candidate not found: {candidate_id}'}), 404
+    return jsonify(matches)
+
+@app.route('/api/import', methods=['POST'])
+def api_start_import():
+    data = request.get_json() or {}
+    try:
+        started = get_imports().start(
+            data.get('file'),
+            file_format=data.get('format'),
+            allow_duplicates=bool(data.get('allowDuplicates', False)),
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(started), 202
+
+@app.route('/api/import/<import_id>', methods=['GET'])
+def api_import_progress(import_id):
+    progress = get_imports().get(import_id)
+    if progress is None:
+        return jsonify({'error': f'Import not found: {import_id}'}), 404
+    return jsonify(progress)
+
+@app.route('/api/jobs', methods=['POST'])
+def api_create_job():
+    try:
+        job = current_backend().create_job(request.get_json())
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(job), 201
+
+@app.route('/api/jobs/<int:job_id>', methods=['GET', 'PUT', 'PATCH', 'DELETE'])
+def api_job(job_id):
+    backend = current_backend()
+    if request.method == 'GET':
+        job = backend.get_job(job_id)
+    elif request.method == 'DELETE':
+        if not backend.delete_job(job_id):
+            return jsonify({'error': f'Job not found: {job_id}'}), 404
+        return jsonify({'success': True})
+    else:
+        try:
+            job = backend.update_job(job_id, request.get_json(), replace=request.method == 'PUT')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    if job is None:
+        return jsonify({'error': f'Job not found: {job_id}'}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/search', methods=['POST'])
+def api_search_jobs():
+    backend = current_backend()
+    data = request.get_json() or {}
+    try:
+        filters = backend.search_filters(data)
+        etag = make_etag(
+            'jobs-search', backend.data_version, canonical_filters(filters), data.get('offset'), data.get('limit')
+        )
+        not_modified = _not_modified(etag, backend.last_modified)
+        if not_modified is not None:
+            return not_modified
+        page = backend.search_jobs(filters, data.get('offset', 0), data.get('limit'))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    return _set_validators(jsonify(page), etag, backend.last_modified)
+
+@app.route('/api/jobs/<int:job_id>/matches', methods=['GET'])
+def api_job_matches(job_id):
+    limit = request.args.get('limit', 5, type=int)
+    matches = current_backend().semantic_candidates_for_job(job_id, limit)
+    if matches is None:
+        return jsonify({'error': f'Job not found: {job_id}'}), 404
+    return jsonify(matches)
+
 @app.route('/api/search', methods=['POST'])
 def api_search():
+    backend = current_backend()
+    data = request.get_json()
+    try:
+        filters = backend.search_filters(data)
+        deadline_ms = parse_deadline_ms(data.get('deadlineMs'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # The search key covers data version and filters; the rest covers the format
+    etag = make_etag(
+        'search',
+        backend.search_cache_key(filters),
+        data.get('format'),
+        data.get('fields'),
+        data.get('jobFields'),
+    )
+    not_modified = _not_modified(etag, backend.last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        ticket = admission.admit(deadline_ms)
+    except Overloaded as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': str(RETRY_AFTER_SECONDS)}
+    try:
+        with search_slots:
+            admission.started(ticket)
+            results = backend.search_candidates(filters, deadline=ticket.deadline)
+    finally:
+        admission.finished(ticket)
+
+    if data.get('format') != 'compact':
+        return _search_response(jsonify(results), ticket.partial, etag, backend.last_modified)
+    payload = compact_search_results(
+        results,
+        fields=data.get('fields'),
+        job_fields=data.get('jobFields'),
+    )
+    if ticket.partial:
+        payload['partial'] = True
+    use_gzip = bool(data.get('gzip')) and accepts_encoding(
+        request.headers.get('Accept-Encoding', ''), 'gzip'
+    )
+    body, headers = encode_body(payload, use_gzip=use_gzip)
+    response = Response(body, mimetype='application/json', headers=headers)
+    return _search_response(response, ticket.partial, etag, backend.last_modified)
+
+def _search_response(response, partial, etag, last_modified):
+    """Validators for complete results; results cut short by the deadline are flagged instead."""
+    if not partial:
+        return _set_validators(response, etag, last_modified)
+    response.headers['X-Search-Partial'] = 'true'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@app.route('/api/search/export', methods=['POST'])
+def api_search_export():
+    backend = current_backend()
+    data = request.get_json() or {}
+    try:
+        filters = backend.search_filters(data)
+        deadline_ms = parse_deadline_ms(data.get('deadlineMs'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Exports are searches too: they take a search slot under admission control
+    try:
+        ticket = admission.admit(deadline_ms)
+    except Overloaded as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': str(RETRY_AFTER_SECONDS)}
+    try:
+        with search_slots:
+            admission.started(ticket)
+            results = backend.search_candidates(filters, deadline=ticket.deadline)
+    finally:
+        admission.finished(ticket)
+
+    response = _export_response(search_rows(results), DEFAULT_COLUMNS + SEARCH_COLUMNS, 'search')
+    if ticket.partial and isinstance(response, Response):
+        response.headers['X-Search-Partial'] = 'true'
+    return response
+
+@app.route('/api/search/explain', methods=['POST'])
+def api_search_explain():
+    backend = current_backend()
     data = request.get_json()
-    filters = data.get('filters')
-    if not filters:
-        query = data.get('query', '')
-        filters = parse_query(query)
-    results = search_candidates(filters)
-    return jsonify(results)
+    try:
+        filters = backend.search_filters(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(backend.explain_search(filters))
+
+@app.route('/api/events', methods=['GET'])
+def api_events():
+    # Server-sent events: a snapshot, then analytics deltas and shortlist
+    # changes; reconnects resume from Last-Event-ID (or ?lastEventId=)
+    feed = current_backend().changes
+    last_id = last_event_id(request.headers.get('Last-Event-ID') or request.args.get('lastEventId'))
+
+    def stream():
+        cursor = last_id
+        feed.opened()
+        try:
+            yield stream_preamble()
+            while True:
+                events = feed.wait(cursor)
+                for event in events:
+                    cursor = event['id']
+                    yield format_event(event)
+                if not events:
+                    yield KEEPALIVE
+        finally:
+            feed.closed()
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+@app.route('/api/metrics', methods=['GET'])
+def api_metrics():
+    return jsonify({
+        'search': dict(current_backend().search_stats),
+        'events': {
+            'subscribers': current_backend().changes.subscribers,
+            'summariesComputed': current_backend().changes.summaries_computed,
+        },
+        'admission': admission.metrics(),
+        'tenant': tenants.metrics().get(g.tenant or DEFAULT_TENANT),
+    })
+
+@app.route('/api/tenants', methods=['GET'])
+def api_tenants():
+    # Tenants see only themselves; the admin token lists everyone
+    return jsonify(tenants.listing(g.tenant, admin=is_admin(request.headers.get(ADMIN_TOKEN_HEADER))))
+
+@app.route('/api/scoring/profiles', methods=['GET'])
+def api_scoring_profiles():
+    profiles = current_backend().scoring_profiles
+    return jsonify([profile.describe() for profile in profiles.values()])
 
 @app.route('/api/parse_query', methods=['POST'])
 def api_parse_query():
     data = request.get_json()
     query = data.get('query', '')
-    filters = parse_query(query)
+    filters = current_backend().parse_query(query)
     return jsonify(filters)
 
+@app.route('/api/suggest', methods=['GET'])
+def api_suggest():
+    backend = current_backend()
+    prefix = request.args.get('prefix', '')
+    limit = suggestion_limit(request.args.get('limit', DEFAULT_SUGGESTIONS, type=int))
+    etag = make_etag('suggest', backend.data_version, prefix, limit)
+    not_modified = _not_modified(etag, backend.last_modified)
+    if not_modified is not None:
+        return not_modified
+    return _set_validators(jsonify(backend.suggest(prefix, limit)), etag, backend.last_modified)
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=8000, debug=True)
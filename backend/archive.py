@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+HR Agent Archive - Cold tier for candidates in terminal pipeline stages
+Candidates moved to an archived stage (Rejected, Hired, Withdrawn) leave
+the in-memory indexes and the main storage engine for a sqlite3 file in
+the data directory; moving them back to an active stage promotes them.
+Searches read the archive only when asked to (includeArchived).
+Pure Python 3 standard library implementation
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+# Stages whose candidates live in the cold tier
+ARCHIVED_STAGES = ("Rejected", "Hired", "Withdrawn")
+
+ARCHIVE_FILE = "archive.sqlite3"
+
+# Rows fetched per round trip when streaming the archive
+ARCHIVE_BATCH = 500
+
+
+def archive_enabled() -> bool:
+    """Tiering is opt-in: HR_AGENT_ARCHIVE=1 (or true/yes)."""
+    return os.environ.get("HR_AGENT_ARCHIVE", "").strip().lower() in ("1", "true", "yes")
+
+
+def is_archived_stage(stage: Optional[str]) -> bool:
+    return (stage or "").strip().lower() in {s.lower() for s in ARCHIVED_STAGES}
+
+
+class ColdStore:
+    """
+    Archived candidates in one sqlite3 table (the full record as JSON plus
+    the columns looked up by id, email and stage). Per-stage counts are kept
+    in memory for analytics; records are read on demand.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS archived_candidates (
+            id INTEGER PRIMARY KEY,
+            email TEXT,
+            stage TEXT,
+            archived_at REAL NOT NULL,
+            doc TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_archived_email ON archived_candidates(email);
+        CREATE INDEX IF NOT EXISTS idx_archived_stage ON archived_candidates(stage);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        # Every thread's connection, so close() can close them all
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        conn = self._conn()
+        conn.executescript(self.SCHEMA)
+        self.stage_counts = Counter(
+            {stage: count for stage, count in conn.execute(
+                "SELECT stage, COUNT(*) FROM archived_candidates GROUP BY stage"
+            )}
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets searches stream while a write commits."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Only its own thread uses it; close() may come from another one
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def __len__(self) -> int:
+        return sum(self.stage_counts.values())
+
+    def put(self, candidate: Dict[str, Any]):
+        self.put_many([candidate])
+
+    def put_many(self, candidates: List[Dict[str, Any]]):
+        """Insert or replace archived candidates in one transaction."""
+        now = round(time.time(), 3)
+        with self._write_lock, self._conn() as conn:
+            for candidate in candidates:
+                previous = conn.execute(
+                    "SELECT stage FROM archived_candidates WHERE id = ?", (candidate["id"],)
+                ).fetchone()
+                if previous is not None:
+                    self._decrement(previous[0])
+                stage = candidate.get("stage", "Unknown")
+                conn.execute(
+                    "INSERT OR REPLACE INTO archived_candidates (id, email, stage, archived_at, doc) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        candidate["id"],
+                        candidate.get("email", "").strip().lower(),
+                        stage,
+                        now,
+                        json.dumps(candidate, ensure_ascii=False),
+                    ),
+                )
+                self.stage_counts[stage] += 1
+
+    def remove(self, candidate_id: int) -> bool:
+        """Drop an archived candidate (deleted, or promoted back to the hot tier)."""
+        with self._write_lock, self._conn() as conn:
+            row = conn.execute(
+                "SELECT stage FROM archived_candidates WHERE id = ?", (candidate_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM archived_candidates WHERE id = ?", (candidate_id,))
+            self._decrement(row[0])
+        return True
+
+    def _decrement(self, stage: str):
+        self.stage_counts[stage] -= 1
+        if self.stage_counts[stage] <= 0:
+            del self.stage_counts[stage]
+
+    def get(self, candidate_id: int) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT doc FROM archived_candidates WHERE id = ?", (candidate_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def ids(self) -> Set[int]:
+        return {row[0] for row in self._conn().execute("SELECT id FROM archived_candidates")}
+
+    def find_email(self, email: str) -> Optional[int]:
+        """ID of the archived candidate with this email (case-insensitive), or None."""
+        row = self._conn().execute(
+            "SELECT id FROM archived_candidates WHERE email = ? LIMIT 1", (email.strip().lower(),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def max_id(self) -> int:
+        row = self._conn().execute("SELECT MAX(id) FROM archived_candidates").fetchone()
+        return row[0] if row[0] is not None else -1
+
+    def in_stage(self, stage: str) -> List[Dict[str, Any]]:
+        """Archived candidates in a stage (case-insensitive), by ID."""
+        rows = self._conn().execute(
+            "SELECT doc FROM archived_candidates WHERE lower(stage) = ? ORDER BY id",
+            (stage.strip().lower(),),
+        )
+        return [json.loads(doc) for (doc,) in rows]
+
+    def iter_candidates(self) -> Iterator[Dict[str, Any]]:
+        """Stream every archived candidate by ID, a batch of rows at a time."""
+        cursor = self._conn().execute("SELECT doc FROM archived_candidates ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(ARCHIVE_BATCH)
+            if not rows:
+                return
+            for (doc,) in rows:
+                yield json.loads(doc)
+
+    def close(self):
+        """Close the connection of every thread that opened one."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local.conn = None
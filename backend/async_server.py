@@ -0,0 +1,911 @@
+#!/usr/bin/env python3
+"""
+HR Agent Async Server - asyncio serving mode for the REST API
+Searches are scored in a bounded thread pool and cancelled when the client
+disconnects; cheap reads are answered directly on the event loop.
+Pure Python 3 standard library implementation
+Usage: python async_server.py [--host 0.0.0.0] [--port 8000] [--search-workers 4]
+"""
+
+import argparse
+import asyncio
+import contextvars
+import functools
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Union
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from admission import RETRY_AFTER_SECONDS, AdmissionController, Overloaded, default_deadline_ms, parse_deadline_ms
+from backend import DuplicateCandidate, SearchCancelled, canonical_filters, get_backend
+from cube import ANALYTICS_FILTERS
+from export import DEFAULT_COLUMNS, EXPORT_FORMATS, SEARCH_COLUMNS, export_stream, resolve_columns, search_rows
+from geo import DEFAULT_RADIUS_KM
+from importer import ImportManager
+from pubsub import KEEPALIVE, KEEPALIVE_SECONDS, format_event, last_event_id, stream_preamble
+from suggest import DEFAULT_SUGGESTIONS, suggestion_limit
+from tenants import (
+    ADMIN_TOKEN_HEADER,
+    DEFAULT_TENANT,
+    TENANT_HEADER,
+    TenantRegistry,
+    UnknownTenant,
+    is_admin,
+    split_tenant_path,
+)
+from responses import (
+    choose_encoding,
+    compact_search_results,
+    compress,
+    dumps,
+    http_date,
+    is_not_modified,
+    make_etag,
+)
+
+# Responses at least this large are compressed when the client accepts it
+COMPRESS_MIN_BYTES = 1024
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+# Seconds between sweeps unloading idle tenants
+TENANT_SWEEP_SECONDS = 60
+# Threads for indexed reads (analytics, similar, suggest, ...) and for export chunks
+READ_WORKERS = 2
+EXPORT_WORKERS = 2
+
+# Tenant and backend of the request being handled on this connection
+_request_tenant = contextvars.ContextVar("tenant", default=None)
+_request_backend = contextvars.ContextVar("backend", default=None)
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    """A parsed HTTP request."""
+
+    def __init__(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        self.method = method
+        parts = urlsplit(target)
+        self.path = unquote(parts.path)
+        self.args = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Dict[str, Any]:
+        if not self.body:
+            return {}
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            raise HTTPError(400, "Invalid JSON body")
+
+
+class Response:
+    def __init__(
+        self,
+        payload: Any = None,
+        status: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+        stream: Optional[Union[Iterator[bytes], AsyncIterator[bytes]]] = None,
+    ):
+        """
+        stream: body chunks sent with chunked transfer encoding instead of
+        payload. A plain iterator is advanced in the export executor; an async
+        iterator (event streams) on the loop.
+        """
+        self.status = status
+        self.headers = dict(headers or {})
+        self.stream = stream
+        if payload is None:
+            self.body = b""
+        elif isinstance(payload, bytes):
+            self.body = payload
+        else:
+            self.body = dumps(payload)
+            self.headers.setdefault("Content-Type", "application/json")
+
+
+class AsyncAPIServer:
+    """
+    Serves the api_server.py routes on asyncio.
+
+    - /api/search runs in a bounded ThreadPoolExecutor; while it runs the
+      connection is watched, and a disconnect cancels the search at its
+      next checkpoint (see HRBackend.search_candidates should_cancel).
+      Searches have a deadline and pass admission control (admission.py).
+    - Analytics and other indexed reads run in a read executor, record
+      writes in a one-thread write executor and export chunks in an export
+      executor, so none of them waits behind the others or behind searches.
+    - /api/events holds the connection open and pushes change events;
+      the stream waits on the loop, not in an executor thread.
+    - Everything else (in-memory lookups) is answered on the event loop.
+    - Requests name a tenant with X-Tenant or a /t/<tenant>/ prefix; others
+      are served by the default backend (see tenants.py).
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        search_workers: int = 4,
+        tenants: Optional[TenantRegistry] = None,
+        keepalive_seconds: float = KEEPALIVE_SECONDS,
+        search_deadline_ms: Optional[float] = None,
+        admission: Optional[AdmissionController] = None,
+    ):
+        self.default_backend = backend or get_backend()
+        self.tenants = tenants or TenantRegistry(default=lambda: self.default_backend)
+        self.search_executor = ThreadPoolExecutor(
+            max_workers=search_workers, thread_name_prefix="search"
+        )
+        # Reads never queue behind a write's fsync or an export being encoded
+        self.read_executor = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="read")
+        self.write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="write")
+        self.export_executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix="export")
+        self.searches_cancelled = 0
+        self.keepalive_seconds = keepalive_seconds
+        self.search_deadline_ms = search_deadline_ms or default_deadline_ms()
+        self.admission = admission or AdmissionController()
+        self.routes = [
+            ("GET", re.compile(r"^/api/analytics$"), self.analytics),
+            ("GET", re.compile(r"^/api/analytics/funnel$"), self.stage_funnel),
+            ("GET", re.compile(r"^/api/shortlists$"), self.list_shortlists),
+            ("POST", re.compile(r"^/api/shortlists$"), self.save_shortlist),
+            ("POST", re.compile(r"^/api/shortlists/combine$"), self.combine_shortlists),
+            ("GET", re.compile(r"^/api/shortlists/(?P<name>[^/]+)$"), self.shortlist_candidates),
+            ("GET", re.compile(r"^/api/shortlists/(?P<name>[^/]+)/export$"), self.export_shortlist),
+            ("POST", re.compile(r"^/api/candidates$"), self.create_candidate),
+            ("GET", re.compile(r"^/api/candidates/near$"), self.candidates_near),
+            ("GET", re.compile(r"^/api/candidates/(?P<candidate_id>\d+)$"), self.candidate),
+            ("PUT", re.compile(r"^/api/candidates/(?P<candidate_id>\d+)$"), self.update_candidate),
+            ("PATCH", re.compile(r"^/api/candidates/(?P<candidate_id>\d+)$"), self.update_candidate),
+            ("DELETE", re.compile(r"^/api/candidates/(?P<candidate_id>\d+)$"), self.delete_candidate),
+            ("GET", re.compile(r"^/api/candidates/(?P<candidate_id>\d+)/matches$"), self.candidate_matches),
+            ("GET", re.compile(r"^/api/candidates/(?P<candidate_id>\d+)/similar$"), self.similar_candidates),
+            ("POST", re.compile(r"^/api/candidates/(?P<candidate_id>\d+)/stage$"), self.move_candidate),
+            ("GET", re.compile(r"^/api/stages/(?P<stage>[^/]+)/candidates$"), self.stage_candidates),
+            ("GET", re.compile(r"^/api/duplicates$"), self.duplicates),
+            ("POST", re.compile(r"^/api/duplicates/check$"), self.check_duplicates),
+            ("POST", re.compile(r"^/api/duplicates/merge$"), self.merge_duplicates),
+            ("POST", re.compile(r"^/api/import$"), self.start_import),
+            ("GET", re.compile(r"^/api/import/(?P<import_id>[0-9a-f]+)$"), self.import_progress),
+            ("POST", re.compile(r"^/api/jobs$"), self.create_job),
+            ("POST", re.compile(r"^/api/jobs/search$"), self.search_jobs),
+            ("GET", re.compile(r"^/api/jobs/(?P<job_id>\d+)/matches$"), self.job_matches),
+            ("GET", re.compile(r"^/api/jobs/(?P<job_id>\d+)$"), self.job),
+            ("PUT", re.compile(r"^/api/jobs/(?P<job_id>\d+)$"), self.update_job),
+            ("PATCH", re.compile(r"^/api/jobs/(?P<job_id>\d+)$"), self.update_job),
+            ("DELETE", re.compile(r"^/api/jobs/(?P<job_id>\d+)$"), self.delete_job),
+            ("POST", re.compile(r"^/api/search$"), self.search),
+            ("POST", re.compile(r"^/api/search/explain$"), self.explain_search),
+            ("POST", re.compile(r"^/api/search/export$"), self.export_search),
+            ("POST", re.compile(r"^/api/parse_query$"), self.parse_query),
+            ("GET", re.compile(r"^/api/suggest$"), self.suggest),
+            ("GET", re.compile(r"^/api/events$"), self.events),
+            ("GET", re.compile(r"^/api/metrics$"), self.metrics),
+            ("GET", re.compile(r"^/api/scoring/profiles$"), self.scoring_profiles),
+            ("GET", re.compile(r"^/api/tenants$"), self.list_tenants),
+        ]
+
+    @property
+    def backend(self):
+        """The backend of the request's tenant (the default one outside requests)."""
+        return _request_backend.get() or self.default_backend
+
+    @property
+    def imports(self) -> ImportManager:
+        return self.tenants.service(_request_tenant.get(), "imports", ImportManager)
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        buffer = bytearray()
+        try:
+            while True:
+                request = await self._read_request(reader, buffer)
+                if request is None:
+                    break
+                tenant, request.path = split_tenant_path(request.path)
+                tenant = tenant or request.headers.get(TENANT_HEADER.lower())
+                acquired = False
+                try:
+                    try:
+                        await self._acquire_tenant(tenant)
+                        acquired = True
+                        response = await self.dispatch(request, reader, buffer)
+                    except HTTPError as e:
+                        response = Response({"error": str(e)}, status=e.status)
+                    except SearchCancelled:
+                        # Client went away; nobody to answer
+                        break
+                    except Exception as e:
+                        response = Response({"error": str(e)}, status=500)
+
+                    self._finalize(request, response)
+                    keep_alive = request.headers.get("connection", "").lower() != "close"
+                    await self._write_response(writer, response, keep_alive)
+                finally:
+                    # Held until a streamed body is fully sent
+                    if acquired:
+                        self.tenants.release(tenant)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HTTPError as e:
+            await self._write_response(writer, Response({"error": str(e)}, status=e.status), False)
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader, buffer: bytearray) -> Optional[Request]:
+        while b"\r\n\r\n" not in buffer:
+            if len(buffer) > MAX_HEADER_BYTES:
+                raise HTTPError(431, "Request headers too large")
+            chunk = await reader.read(65536)
+            if not chunk:
+                return None
+            buffer.extend(chunk)
+
+        head_end = buffer.index(b"\r\n\r\n")
+        head = bytes(buffer[:head_end]).decode("latin-1")
+        del buffer[:head_end + 4]
+        lines = head.split("\r\n")
+        try:
+            method, target, _version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", "0") or 0)
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+        while len(buffer) < length:
+            chunk = await reader.read(65536)
+            if not chunk:
+                return None
+            buffer.extend(chunk)
+        body = bytes(buffer[:length])
+        del buffer[:length]
+        return Request(method.upper(), target, headers, body)
+
+    async def _write_response(self, writer: asyncio.StreamWriter, response: Response, keep_alive: bool):
+        reason = HTTPStatus(response.status).phrase
+        headers = {
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Expose-Headers": "ETag, Last-Modified",
+            "Connection": "keep-alive" if keep_alive else "close",
+        }
+        if response.stream is None:
+            headers["Content-Length"] = str(len(response.body))
+        else:
+            headers["Transfer-Encoding"] = "chunked"
+        headers.update(response.headers)
+        head = f"HTTP/1.1 {response.status} {reason}\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in headers.items()
+        ) + "\r\n"
+        if response.stream is None:
+            writer.write(head.encode("latin-1") + response.body)
+            await writer.drain()
+            return
+        writer.write(head.encode("latin-1"))
+        if hasattr(response.stream, "__anext__"):
+            try:
+                async for chunk in response.stream:
+                    writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    await writer.drain()
+            finally:
+                # Unsubscribes the stream when the client went away mid-write
+                await response.stream.aclose()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+            return
+        # Chunks are produced off the loop; drain() holds the producer back
+        # while the client is slow, so at most one chunk is buffered
+        loop = asyncio.get_running_loop()
+        while True:
+            chunk = await loop.run_in_executor(self.export_executor, next, response.stream, None)
+            if chunk is None:
+                break
+            if chunk:
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _acquire_tenant(self, tenant: Optional[str]):
+        """Bind the request's tenant backend to this connection's context; loads off the loop."""
+        try:
+            if self.tenants.is_loaded(tenant or DEFAULT_TENANT):
+                backend = self.tenants.acquire(tenant, evict=False)
+            else:
+                loop = asyncio.get_running_loop()
+                backend = await loop.run_in_executor(None, self.tenants.acquire, tenant)
+        except UnknownTenant as e:
+            raise HTTPError(404, str(e))
+        _request_tenant.set(tenant)
+        _request_backend.set(backend)
+
+    def _finalize(self, request: Request, response: Response):
+        """gzip/deflate-compress large responses when the client accepts it."""
+        if response.status != 200 or response.stream is not None or "Content-Encoding" in response.headers:
+            return
+        if len(response.body) < COMPRESS_MIN_BYTES:
+            return
+        coding = choose_encoding(request.headers.get("accept-encoding", ""))
+        if coding is None:
+            return
+        response.body = compress(response.body, coding)
+        response.headers["Content-Encoding"] = coding
+        response.headers["Vary"] = f"Accept-Encoding, {TENANT_HEADER}"
+
+    async def dispatch(self, request: Request, reader: asyncio.StreamReader, buffer: bytearray) -> Response:
+        if request.method == "OPTIONS":
+            return Response(status=204, headers={
+                "Access-Control-Allow-Methods": "GET, POST, PUT, PATCH, DELETE, OPTIONS",
+                "Access-Control-Allow-Headers": f"Content-Type, If-None-Match, If-Modified-Since, {TENANT_HEADER}",
+            })
+        path_matched = False
+        for method, pattern, handler in self.routes:
+            match = pattern.match(request.path)
+            if not match:
+                continue
+            path_matched = True
+            if method == request.method:
+                if handler in (self.search, self.events):
+                    return await handler(request, reader, buffer)
+                return await handler(request, **match.groupdict())
+        if path_matched:
+            raise HTTPError(405, "Method not allowed")
+        raise HTTPError(404, f"Not found: {request.path}")
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _conditional(self, request: Request, etag: str) -> Optional[Response]:
+        """Return a 304 response if the request's validators match, else None."""
+        last_modified = self.backend.last_modified
+        headers = {
+            "ETag": etag,
+            "Last-Modified": http_date(last_modified),
+            "Cache-Control": "no-cache",
+        }
+        if is_not_modified(
+            etag,
+            last_modified,
+            request.headers.get("if-none-match"),
+            request.headers.get("if-modified-since"),
+        ):
+            return Response(status=304, headers=headers)
+        return None
+
+    def _validators(self, etag: str) -> Dict[str, str]:
+        return {
+            "ETag": etag,
+            "Last-Modified": http_date(self.backend.last_modified),
+            "Cache-Control": "no-cache",
+        }
+
+    async def _run_until_disconnect(self, func, reader: asyncio.StreamReader, buffer: bytearray):
+        """
+        Run func(should_cancel) in the search executor. If the client closes
+        the connection first, flag the search so it stops at its next
+        checkpoint and raise SearchCancelled.
+        """
+        loop = asyncio.get_running_loop()
+        cancelled = threading.Event()
+        work = loop.run_in_executor(self.search_executor, func, cancelled.is_set)
+        watcher = asyncio.ensure_future(reader.read(65536))
+        try:
+            while True:
+                done, _ = await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+                if work in done:
+                    return work.result()
+                chunk = watcher.result()
+                if not chunk:
+                    cancelled.set()
+                    self.searches_cancelled += 1
+                    # Let the worker reach its checkpoint and release the thread
+                    try:
+                        await work
+                    except SearchCancelled:
+                        pass
+                    raise SearchCancelled("Client disconnected")
+                # Pipelined data from the client: keep it for the next request
+                buffer.extend(chunk)
+                watcher = asyncio.ensure_future(reader.read(65536))
+        finally:
+            if not watcher.done():
+                watcher.cancel()
+
+    # ------------------------------------------------------------------
+    # Routes
+    # ------------------------------------------------------------------
+
+    async def analytics(self, request: Request) -> Response:
+        filters = {key: request.args[key] for key in ANALYTICS_FILTERS if request.args.get(key)}
+        etag = make_etag("analytics", self.backend.data_version, canonical_filters(filters))
+        not_modified = self._conditional(request, etag)
+        if not_modified is not None:
+            return not_modified
+        loop = asyncio.get_running_loop()
+        try:
+            data = await loop.run_in_executor(
+                self.read_executor, functools.partial(self.backend.analytics_summary, **filters)
+            )
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        return Response(data, headers=self._validators(etag))
+
+    async def list_shortlists(self, request: Request) -> Response:
+        etag = make_etag("shortlists", self.backend.data_version)
+        not_modified = self._conditional(request, etag)
+        if not_modified is not None:
+            return not_modified
+        return Response(self.backend.get_shortlists(), headers=self._validators(etag))
+
+    async def save_shortlist(self, request: Request) -> Response:
+        data = request.json()
+        backend = self.backend
+
+        def save():
+            candidate_ids = data.get("candidate_ids")
+            if candidate_ids is None:
+                # Older clients send list positions
+                candidate_ids = backend.candidate_ids_from_indices(data.get("candidate_indices", []))
+            return backend.save_shortlist(data.get("name"), candidate_ids)
+
+        success = await self._write(save)
+        return Response({"success": success})
+
+    async def combine_shortlists(self, request: Request) -> Response:
+        data = request.json()
+        result = await self._write(
+            self.backend.combine_shortlists, data.get("operation"), data.get("shortlists") or [], data.get("saveAs")
+        )
+        if result is None:
+            raise HTTPError(404, "Shortlist not found")
+        return Response(result)
+
+    async def shortlist_candidates(self, request: Request, name: str) -> Response:
+        if name not in self.backend.shortlists:
+            raise HTTPError(404, f"Shortlist not found: {name}")
+        return Response({"name": name, "candidates": self.backend.get_shortlist_candidates(name)})
+
+    def _export(self, request: Request, rows, allowed_columns, filename: str) -> Response:
+        """Stream rows as CSV or XLSX (?format=, ?columns=) with chunked transfer."""
+        file_format = request.args.get("format", "csv")
+        if file_format not in EXPORT_FORMATS:
+            raise HTTPError(400, f"Unknown export format: {file_format}")
+        try:
+            columns = resolve_columns(request.args.get("columns"), allowed_columns)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        return Response(
+            headers={
+                "Content-Type": EXPORT_FORMATS[file_format],
+                "Content-Disposition": f'attachment; filename="{filename}.{file_format}"',
+            },
+            stream=export_stream(rows, columns, file_format),
+        )
+
+    async def export_shortlist(self, request: Request, name: str) -> Response:
+        if name not in self.backend.shortlists:
+            raise HTTPError(404, f"Shortlist not found: {name}")
+        return self._export(request, self.backend.iter_shortlist_candidates(name), DEFAULT_COLUMNS, name)
+
+    async def search_jobs(self, request: Request) -> Response:
+        data = request.json()
+        filters = self._search_filters(data)
+        etag = make_etag(
+            "jobs-search", self.backend.data_version, canonical_filters(filters), data.get("offset"), data.get("limit")
+        )
+        not_modified = self._conditional(request, etag)
+        if not_modified is not None:
+            return not_modified
+        loop = asyncio.get_running_loop()
+        try:
+            page = await loop.run_in_executor(
+                self.search_executor, self.backend.search_jobs, filters, data.get("offset", 0), data.get("limit")
+            )
+        except (TypeError, ValueError) as e:
+            raise HTTPError(400, str(e))
+        return Response(page, headers=self._validators(etag))
+
+    async def export_search(self, request: Request) -> Response:
+        data = request.json()
+        filters = self._search_filters(data)
+        try:
+            deadline_ms = parse_deadline_ms(data.get("deadlineMs"), self.search_deadline_ms)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        # Exports are searches too: they queue for the same workers
+        try:
+            admission = self.admission.admit(deadline_ms)
+        except Overloaded as e:
+            return Response({"error": str(e)}, status=503, headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+        backend = self.backend
+
+        def run():
+            self.admission.started(admission)
+            return backend.search_candidates(filters, deadline=admission.deadline)
+
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.search_executor, run)
+        finally:
+            self.admission.finished(admission)
+        response = self._export(request, search_rows(results), DEFAULT_COLUMNS + SEARCH_COLUMNS, "search")
+        if admission.partial:
+            response.headers["X-Search-Partial"] = "true"
+        return response
+
+    async def candidate(self, request: Request, candidate_id: str) -> Response:
+        # Archived candidates are read from the cold tier's SQLite file
+        candidate = await self._read(self.backend.get_candidate, int(candidate_id))
+        if candidate is None:
+            raise HTTPError(404, f"Candidate not found: {candidate_id}")
+        return Response(candidate)
+
+    async def job(self, request: Request, job_id: str) -> Response:
+        job = self.backend.get_job(int(job_id))
+        if job is None:
+            raise HTTPError(404, f"Job not found: {job_id}")
+        return Response(job)
+
+    async def _read(self, func, *args):
+        """Run a read that may wait on a lock or a file off the event loop; ValueError -> 400."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.read_executor, func, *args)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+    async def _write(self, func, *args):
+        """Run a record write (it fsyncs) off the event loop; ValueError -> 400."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.write_executor, func, *args)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+    async def create_candidate(self, request: Request) -> Response:
+        # Likely duplicates are refused (409) unless ?allowDuplicates=true
+        allow = request.args.get("allowDuplicates", "").lower() in ("1", "true")
+        try:
+            candidate = await self._write(self.backend.create_candidate, request.json(), allow)
+        except DuplicateCandidate as e:
+            return Response({"error": str(e), "duplicates": e.duplicates}, status=409)
+        return Response(candidate, status=201)
+
+    async def update_candidate(self, request: Request, candidate_id: str) -> Response:
+        candidate = await self._write(
+            self.backend.update_candidate, int(candidate_id), request.json(), request.method == "PUT"
+        )
+        if candidate is None:
+            raise HTTPError(404, f"Candidate not found: {candidate_id}")
+        return Response(candidate)
+
+    async def delete_candidate(self, request: Request, candidate_id: str) -> Response:
+        if not await self._write(self.backend.delete_candidate, int(candidate_id)):
+            raise HTTPError(404, f"Candidate not found: {candidate_id}")
+        return Response({"success": True})
+
+    async def move_candidate(self, request: Request, candidate_id: str) -> Response:
+        candidate = await self._write(self.backend.move_candidate, int(candidate_id), request.json().get("stage"))
+        if candidate is None:
+            raise HTTPError(404, f"Candidate not found: {candidate_id}")
+        return Response(candidate)
+
+    async def candidates_near(self, request: Request) -> Response:
+        try:
+            radius = float(request.args.get("radiusKm", DEFAULT_RADIUS_KM))
+        except ValueError:
+            raise HTTPError(400, "radiusKm must be a number")
+        # Reads the location indexes under the backend's write lock
+        return Response(await self._read(self.backend.candidates_near, request.args.get("location", ""), radius))
+
+    async def stage_candidates(self, request: Request, stage: str) -> Response:
+        return Response(await self._read(self.backend.candidates_in_stage, stage))
+
+    async def stage_funnel(self, request: Request) -> Response:
+        start, end = request.args.get("from", ""), request.args.get("to", "")
+        etag = make_etag("funnel", self.backend.data_version, start, end)
+        not_modified = self._conditional(request, etag)
+        if not_modified is not None:
+            return not_modified
+        # The stage log's lock is held across its fsyncs
+        funnel = await self._read(self.backend.stage_funnel, start, end)
+        return Response(funnel, headers=self._validators(etag))
+
+    async def duplicates(self, request: Request) -> Response:
+        loop = asyncio.get_running_loop()
+        clusters = await loop.run_in_executor(self.search_executor, self.backend.duplicate_clusters)
+        return Response(clusters)
+
+    async def check_duplicates(self, request: Request) -> Response:
+        loop = asyncio.get_running_loop()
+        matches = await loop.run_in_executor(
+            self.read_executor, self.backend.find_duplicates, request.json(), self._limit(request)
+        )
+        return Response(matches)
+
+    async def merge_duplicates(self, request: Request) -> Response:
+        data = request.json()
+        candidate = await self._write(
+            self.backend.merge_candidates, data.get("survivorId"), data.get("duplicateIds", [])
+        )
+        if candidate is None:
+            raise HTTPError(404, f"Candidate not found: {data.get('survivorId')}")
+        return Response(candidate)
+
+    async def start_import(self, request: Request) -> Response:
+        data = request.json()
+        try:
+            started = self.imports.start(
+                data.get("file"),
+                file_format=data.get("format"),
+                allow_duplicates=bool(data.get("allowDuplicates", False)),
+            )
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        return Response(started, status=202)
+
+    async def import_progress(self, request: Request, import_id: str) -> Response:
+        progress = self.imports.get(import_id)
+        if progress is None:
+            raise HTTPError(404, f"Import not found: {import_id}")
+        return Response(progress)
+
+    async def create_job(self, request: Request) -> Response:
+        job = await self._write(self.backend.create_job, request.json())
+        return Response(job, status=201)
+
+    async def update_job(self, request: Request, job_id: str) -> Response:
+        job = await self._write(self.backend.update_job, int(job_id), request.json(), request.method == "PUT")
+        if job is None:
+            raise HTTPError(404, f"Job not found: {job_id}")
+        return Response(job)
+
+    async def delete_job(self, request: Request, job_id: str) -> Response:
+        if not await self._write(self.backend.delete_job, int(job_id)):
+            raise HTTPError(404, f"Job not found: {job_id}")
+        return Response({"success": True})
+
+    def _limit(self, request: Request, default: int = 5) -> int:
+        try:
+            return int(request.args.get("limit", default))
+        except ValueError:
+            raise HTTPError(400, "limit must be an integer")
+
+    async def candidate_matches(self, request: Request, candidate_id: str) -> Response:
+        loop = asyncio.get_running_loop()
+        matches = await loop.run_in_executor(
+            self.read_executor, self.backend.semantic_jobs_for_candidate, int(candidate_id), self._limit(request)
+        )
+        if matches is None:
+            raise HTTPError(404, f"Candidate not found: {candidate_id}")
+        return Response(matches)
+
+    async def similar_candidates(self, request: Request, candidate_id: str) -> Response:
+        loop = asyncio.get_running_loop()
+        matches = await loop.run_in_executor(
+            self.read_executor, self.backend.similar_candidates, int(candidate_id), self._limit(request)
+        )
+        if matches is None:
+            raise HTTPError(404, f"Candidate not found: {candidate_id}")
+        return Response(matches)
+
+    async def job_matches(self, request: Request, job_id: str) -> Response:
+        loop = asyncio.get_running_loop()
+        matches = await loop.run_in_executor(
+            self.read_executor, self.backend.semantic_candidates_for_job, int(job_id), self._limit(request)
+        )
+        if matches is None:
+            raise HTTPError(404, f"Job not found: {job_id}")
+        return Response(matches)
+
+    async def events(self, request: Request, reader: asyncio.StreamReader, buffer: bytearray) -> Response:
+        """Server-sent events: a snapshot, then analytics deltas and shortlist changes."""
+        last_id = last_event_id(request.headers.get("last-event-id") or request.args.get("lastEventId"))
+        return Response(
+            headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"},
+            stream=self._event_stream(self.backend.changes, last_id, reader, buffer),
+        )
+
+    async def _event_stream(
+        self, feed, last_id: Optional[int], reader: asyncio.StreamReader, buffer: bytearray
+    ) -> AsyncIterator[bytes]:
+        """
+        Poll the feed (off the loop) whenever it signals news, until the
+        client disconnects; idle streams get a keep-alive comment.
+        """
+        loop = asyncio.get_running_loop()
+        news = asyncio.Event()
+
+        def wake():
+            loop.call_soon_threadsafe(news.set)
+
+        feed.listen(wake)
+        feed.opened()
+        watcher = asyncio.ensure_future(reader.read(65536))
+        try:
+            yield stream_preamble()
+            while True:
+                news.clear()
+                events = await loop.run_in_executor(self.read_executor, feed.poll, last_id)
+                for event in events:
+                    last_id = event["id"]
+                    yield format_event(event)
+                waiter = asyncio.ensure_future(news.wait())
+                done, _ = await asyncio.wait(
+                    {waiter, watcher}, timeout=self.keepalive_seconds, return_when=asyncio.FIRST_COMPLETED
+                )
+                if watcher in done:
+                    waiter.cancel()
+                    chunk = watcher.result()
+                    if not chunk:
+                        return
+                    # Pipelined data from the client: keep it for the next request
+                    buffer.extend(chunk)
+                    watcher = asyncio.ensure_future(reader.read(65536))
+                elif not done:
+                    waiter.cancel()
+                    yield KEEPALIVE
+        finally:
+            if not watcher.done():
+                watcher.cancel()
+            feed.closed()
+            feed.unlisten(wake)
+
+    async def metrics(self, request: Request) -> Response:
+        search = dict(self.backend.search_stats)
+        search["cancelled"] = self.searches_cancelled
+        tenant = self.tenants.metrics().get(_request_tenant.get() or DEFAULT_TENANT)
+        changes = self.backend.changes
+        events = {"subscribers": changes.subscribers, "summariesComputed": changes.summaries_computed}
+        return Response({
+            "search": search, "events": events, "admission": self.admission.metrics(), "tenant": tenant,
+        })
+
+    async def list_tenants(self, request: Request) -> Response:
+        # Tenants see only themselves; the admin token lists everyone
+        admin = is_admin(request.headers.get(ADMIN_TOKEN_HEADER.lower()))
+        return Response(self.tenants.listing(_request_tenant.get(), admin=admin))
+
+    async def explain_search(self, request: Request) -> Response:
+        data = request.json()
+        filters = self._search_filters(data)
+        loop = asyncio.get_running_loop()
+        explained = await loop.run_in_executor(self.search_executor, self.backend.explain_search, filters)
+        return Response(explained)
+
+    def _search_filters(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return self.backend.search_filters(data)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+    async def scoring_profiles(self, request: Request) -> Response:
+        return Response([profile.describe() for profile in self.backend.scoring_profiles.values()])
+
+    async def parse_query(self, request: Request) -> Response:
+        return Response(self.backend.parse_query(request.json().get("query", "")))
+
+    async def suggest(self, request: Request) -> Response:
+        prefix = request.args.get("prefix", "")
+        limit = suggestion_limit(self._limit(request, DEFAULT_SUGGESTIONS))
+        etag = make_etag("suggest", self.backend.data_version, prefix, limit)
+        not_modified = self._conditional(request, etag)
+        if not_modified is not None:
+            return not_modified
+        # Answered on the loop (a couple of bisections) unless a write left
+        # the vocabulary to rebuild
+        if self.backend.suggestions_ready():
+            suggestions = self.backend.suggest(prefix, limit)
+        else:
+            loop = asyncio.get_running_loop()
+            suggestions = await loop.run_in_executor(self.read_executor, self.backend.suggest, prefix, limit)
+        return Response(suggestions, headers=self._validators(etag))
+
+    async def search(self, request: Request, reader: asyncio.StreamReader, buffer: bytearray) -> Response:
+        data = request.json()
+        filters = self._search_filters(data)
+        try:
+            deadline_ms = parse_deadline_ms(data.get("deadlineMs"), self.search_deadline_ms)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+        etag = make_etag(
+            "search",
+            self.backend.search_cache_key(filters),
+            data.get("format"),
+            data.get("fields"),
+            data.get("jobFields"),
+        )
+        not_modified = self._conditional(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        try:
+            admission = self.admission.admit(deadline_ms)
+        except Overloaded as e:
+            return Response({"error": str(e)}, status=503, headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+        backend = self.backend
+
+        def run(should_cancel):
+            self.admission.started(admission)
+            return backend.search_candidates(filters, should_cancel, admission.deadline)
+
+        try:
+            results = await self._run_until_disconnect(run, reader, buffer)
+        finally:
+            self.admission.finished(admission)
+        if data.get("format") == "compact":
+            results = compact_search_results(
+                results, fields=data.get("fields"), job_fields=data.get("jobFields")
+            )
+        if not admission.partial:
+            return Response(results, headers=self._validators(etag))
+        # Best results found before the deadline: not what the ETag stands for
+        if data.get("format") == "compact":
+            results["partial"] = True
+        return Response(results, headers={"X-Search-Partial": "true", "Cache-Control": "no-store"})
+
+    # ------------------------------------------------------------------
+
+    async def serve(self, host: str = "0.0.0.0", port: int = 8000):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"HR Agent async API listening on http://{host}:{port}")
+        sweeper = asyncio.ensure_future(self._sweep_tenants())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sweeper.cancel()
+
+    async def _sweep_tenants(self):
+        """Unload idle tenants periodically (off the loop: unloading writes files)."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(TENANT_SWEEP_SECONDS)
+            await loop.run_in_executor(None, self.tenants.evict)
+
+    def close(self):
+        self.search_executor.shutdown(wait=False)
+        self.read_executor.shutdown(wait=False)
+        self.write_executor.shutdown(wait=False)
+        self.export_executor.shutdown(wait=False)
+        self.tenants.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HR Agent asyncio API server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--search-workers", type=int, default=4)
+    parser.add_argument("--search-deadline-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    server = AsyncAPIServer(search_workers=args.search_workers, search_deadline_ms=args.search_deadline_ms)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,43 +4,315 @@ HR Agent Backend - Core logic for candidate search, scoring, and email drafting
 Pure Python 3 standard library implementation
 """
 
+import bisect
+import heapq
 import json
 import os
 import re
-from collections import Counter
+import threading
+import time
+from collections import Counter, OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from admission import Deadline
+from archive import ARCHIVE_FILE, ColdStore, archive_enabled, is_archived_stage
+from bitmap import Bitmap, combine
+from cube import AnalyticsCube
+from dedup import DuplicateDetector, merge_records
+from fulltext import InvertedIndex, tokenize
+from geo import DEFAULT_RADIUS_KM, GridIndex, get_gazetteer
+from job_search import DEFAULT_PAGE_SIZE, JobIndex, page_bounds
+from planner import BOUND_EPSILON, QueryPlan, QueryPlanner, parse_date
+from pubsub import ChangeFeed
+from similar import SimilarityIndex
+from suggest import DEFAULT_SUGGESTIONS, SuggestIndex, build_suggestions
+from scoring import DEFAULT_PROFILE, DEFAULT_WEIGHTS, Scorer, ScoringProfile, load_profiles
+from stage_log import StageLog
+from storage import JSONStorage, open_storage
+from vectors import SemanticMatcher
+
+# Candidates scored between polls of a search's should_cancel callback
+CANCEL_CHECK_INTERVAL = 256
+
+# Candidates scored between deadline checks (and at least, before a search gives up)
+DEADLINE_CHECK_INTERVAL = 32
+
+# Query words that say what to search for rather than what to match in notes
+QUERY_FILLER_WORDS = {
+    "find", "show", "get", "search", "list", "me", "give", "need", "want",
+    "looking", "look", "top", "first", "best", "candidate", "people",
+    "profile", "developer", "engineer", "programmer", "dev", "year",
+    "experience", "experienced", "skill", "skilled", "month", "next",
+    "based", "located", "near", "who", "can", "some", "any", "all",
+}
+
+# Filler plus common words that say nothing about a candidate's notes;
+# none of them is scored against notes (stemmed like the notes index)
+QUERY_STOP_WORDS = QUERY_FILLER_WORDS | set(tokenize(
+    "know knows knowing knowledge familiar work worked working use used using "
+    "strong solid good great excellent proficient expert background someone "
+    "somebody anyone person also plus like able must should would could do does "
+    "did having had not but if than then very really more less least other such "
+    "into about only just well both either"
+))
+
+# Writable record fields: (type, default); a None default marks a required field
+CANDIDATE_FIELDS = {
+    "firstName": (str, None),
+    "lastName": (str, None),
+    "email": (str, None),
+    "phone": (str, ""),
+    "location": (str, ""),
+    "experienceYears": (int, 0),
+    "skills": (list, []),
+    "availabilityDate": (str, ""),
+    "stage": (str, "Applied"),
+    "notes": (str, ""),
+}
+JOB_FIELDS = {
+    "title": (str, None),
+    "location": (str, ""),
+    "skillsRequired": (list, []),
+    "jdSnippet": (str, ""),
+}
+
+
+class SearchCancelled(Exception):
+    """Raised when a search is cancelled (e.g. the client disconnected)."""
+
+
+class _DeadlineReached(Exception):
+    """Stops a scan whose deadline has passed (its results so far stand)."""
+
+
+class DuplicateCandidate(Exception):
+    """Raised when a new candidate is likely someone already stored."""
+
+    def __init__(self, duplicates: List[Dict[str, Any]]):
+        super().__init__(f"Likely duplicate of candidate {duplicates[0]['id']}")
+        self.duplicates = duplicates
+
+
+class _InflightSearch:
+    """A search being computed; followers wait here for the leader's result."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.results = None
+        self.error = None
+
+    def finish(self, results: Optional[List[Dict[str, Any]]]):
+        self.results = results
+        self.done.set()
+
+    def wait(
+        self,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Wait for the leader. Returns its results, or None if the leader was
+        cancelled. Raises the leader's error, SearchCancelled if this
+        follower is cancelled while waiting, or _DeadlineReached once the
+        follower's own deadline passes (deadline.reached is then set).
+        """
+        while True:
+            timeout = 0.05 if deadline is None else max(0.0, min(0.05, deadline.remaining()))
+            if self.done.wait(timeout):
+                break
+            if should_cancel is not None and should_cancel():
+                raise SearchCancelled("Search cancelled while waiting for identical search")
+            if deadline is not None and deadline.expired():
+                raise _DeadlineReached()
+        if self.error is not None:
+            raise self.error
+        return self.results
+
+
+SKILL_SYNONYMS = {
+    'js': 'JavaScript',
+    'nodejs': 'Node.js',
+    'node.js': 'Node.js',
+    'py': 'Python',
+    'reactjs': 'React',
+    'frontend': 'Frontend',
+    'backend': 'Backend',
+    'sql': 'SQL',
+    'db': 'Database',
+    'dbms': 'Database',
+    'html5': 'HTML',
+    'css3': 'CSS',
+}
+
+
+# Skill words parse_query turns into skill filters
+QUERY_SKILLS_PATTERN = r"\b(react|reactjs|javascript|js|python|py|java|node\.?js|nodejs|angular|vue|css|css3|html|html5|sql|db|dbms|mongodb|postgresql|docker|kubernetes|aws|azure|gcp|typescript|php|c\+\+|c#|ruby|go|rust|swift|kotlin|flutter|django|flask|spring|laravel|express|git|redis|elasticsearch|graphql|rest|api|frontend|backend)\b"
+
+
+def normalize_skill(skill: str) -> str:
+    """Normalize a skill name and resolve synonyms ("reactjs" -> "React")."""
+    skill = skill.lower().strip()
+    return SKILL_SYNONYMS.get(skill, skill.title())
+
+
+def canonical_filters(filters: Dict[str, Any]) -> str:
+    """Return a stable string key for a filters dict (used for caching)."""
+    return json.dumps(filters, sort_keys=True, separators=(",", ":"))
+
+
+def validate_record(
+    data: Dict[str, Any], fields: Dict[str, Any], partial: bool = False
+) -> Dict[str, Any]:
+    """
+    Check and normalize a candidate or job payload against fields.
+    Missing optional fields get their defaults unless partial (PATCH).
+    "id" is assigned by the server and ignored.
+    Returns: the cleaned record (without id); raises ValueError if invalid
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Record must be a JSON object")
+    unknown = sorted(set(data) - set(fields) - {"id"})
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    record = {}
+    for field, (kind, default) in fields.items():
+        if field not in data:
+            if partial:
+                continue
+            if default is None:
+                raise ValueError(f"Missing required field: {field}")
+            record[field] = list(default) if isinstance(default, list) else default
+            continue
+        value = data[field]
+        if kind is int:
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                raise ValueError(f"{field} must be a non-negative integer")
+        elif kind is list:
+            if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+                raise ValueError(f"{field} must be a list of strings")
+            value = [v.strip() for v in value if v.strip()]
+        else:
+            if not isinstance(value, str):
+                raise ValueError(f"{field} must be a string")
+            value = value.strip()
+            if default is None and not value:
+                raise ValueError(f"{field} must not be empty")
+        if field == "availabilityDate" and value:
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                raise ValueError("availabilityDate must be YYYY-MM-DD")
+        record[field] = value
+    return record
+
+
+def _add_posting(index: Dict[Any, set], key: Any, record_id: int):
+    index.setdefault(key, set()).add(record_id)
+
+
+def _remove_posting(index: Dict[Any, set], key: Any, record_id: int):
+    ids = index.get(key)
+    if ids is not None:
+        ids.discard(record_id)
+        if not ids:
+            del index[key]
+
+
+def _decrement(counter: Counter, keys: List[str]):
+    """Subtract one per key, dropping keys that reach zero."""
+    for key in keys:
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
 
 
 class HRBackend:
-    def __init__(self, data_dir: str = "data"):
+    def __init__(
+        self,
+        data_dir: str = "data",
+        search_cache_size: int = 128,
+        storage: Any = None,
+        archive: Optional[bool] = None,
+    ):
+        """
+        storage: a storage engine instance, an engine name ("json", "sqlite"),
+        or None for the default JSON files in data_dir.
+        archive: keep candidates in archived stages in a cold tier (see
+        archive.py); None reads HR_AGENT_ARCHIVE.
+        """
         self.data_dir = data_dir
+        if storage is None:
+            storage = JSONStorage(data_dir)
+        elif isinstance(storage, str):
+            storage = open_storage(storage, data_dir)
+        self.storage = storage
+        if archive is None:
+            archive = archive_enabled()
+        # Cold tier: archived-stage candidates, on disk only (None: no tiering)
+        self.archive = ColdStore(os.path.join(data_dir, ARCHIVE_FILE)) if archive else None
+        # Timestamped stage transitions and their daily rollups
+        self.stage_log = StageLog(data_dir)
+        # Named weight sets for search, compiled once (see scoring.py)
+        self.scoring_profiles = load_profiles(data_dir)
         self.candidates = []
         self.jobs = []
         self.shortlists = {}
+        # Shortlist members as bitsets over candidate IDs (set algebra, scoped search)
+        self.shortlist_bitmaps = {}
+        # Primary-key and secondary indexes over the lists above
+        self.candidates_by_id = {}
+        self.jobs_by_id = {}
+        self.candidate_ids_by_email = {}
+        # Posting lists: lowercase skill / lowercase location / experience
+        # years / availability date -> candidate IDs (used by the planner)
+        self.candidate_ids_by_skill = {}
+        self.candidate_ids_by_location = {}
+        self.candidate_ids_by_experience = {}
+        self.candidate_ids_by_availability = {}
+        self.planner = QueryPlanner(self)
+        # Full-text indexes over candidate notes and job title + description
+        self.notes_index = InvertedIndex()
+        self.job_text_index = InvertedIndex()
+        # Bumped on every data change; drives ETags and search cache invalidation
+        self.data_version = 0
+        self.last_modified = time.time()
+        self.search_cache_size = search_cache_size
+        self._search_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._inflight = {}
+        self.search_stats = {"executed": 0, "cacheHits": 0, "coalesced": 0, "partial": 0}
+        # Serializes record writes; each touches only the record's own entries
+        self._write_lock = threading.RLock()
+        # One journal compaction at a time, run outside the write lock
+        self._compact_lock = threading.Lock()
+        self._compaction = None
+        # One suggest index rebuild at a time, also outside the write lock
+        self._suggest_lock = threading.Lock()
+        # Analytics deltas and shortlist changes for /api/events subscribers
+        self.changes = ChangeFeed(self.analytics_summary, self.get_shortlists)
         self.load_data()
 
     def load_data(self):
-        """Load candidates, jobs, and existing shortlists from JSON files."""
+        """Load candidates, jobs, and existing shortlists from the storage engine."""
         try:
-            # Load candidates
-            candidates_path = os.path.join(self.data_dir, "candidates.json")
-            with open(candidates_path, "r", encoding="utf-8") as f:
-                self.candidates = json.load(f)
-
-            # Load jobs
-            jobs_path = os.path.join(self.data_dir, "jobs.json")
-            with open(jobs_path, "r", encoding="utf-8") as f:
-                self.jobs = json.load(f)
-
-            # Load existing shortlists (optional)
-            shortlists_path = os.path.join(self.data_dir, "shortlists.json")
-            if os.path.exists(shortlists_path):
-                with open(shortlists_path, "r", encoding="utf-8") as f:
-                    self.shortlists = json.load(f)
-
+            self.candidates = self.storage.load_candidates()
+            if self.archive is not None:
+                self.candidates = self._tier_candidates(self.candidates)
+            self.jobs = self.storage.load_jobs()
+            self._build_indexes()
+            if self.archive is not None:
+                self._next_candidate_id = max(self._next_candidate_id, self.archive.max_id() + 1)
+                # Analytics slices count both tiers
+                for candidate in self.archive.iter_candidates():
+                    self.cube.add_candidate(candidate)
+            self.shortlists = self.storage.load_shortlists(self.candidates)
+            self.shortlist_bitmaps = {name: Bitmap.from_ids(ids) for name, ids in self.shortlists.items()}
+
+            self._touch()
             print(
-                f"Loaded {len(self.candidates)} candidates, {len(self.jobs)} jobs, {len(self.shortlists)} shortlists"
+                f"Loaded {len(self.candidates)} candidates, {len(self.jobs)} jobs, {len(self.shortlists)} shortlists ({self.storage.name} storage)"
             )
 
         except FileNotFoundError as e:
@@ -53,24 +325,607 @@ class HRBackend:
             print(f"Invalid JSON format: {e}")
             raise
 
+    def _tier_candidates(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Split loaded candidates between the tiers: records in an archived
+        stage move to the cold store (first run with tiering, or a demotion
+        cut short), and records the cold store still holds despite an active
+        stage are dropped from it (a promotion cut short).
+        Returns: the active candidates
+        """
+        archived = [c for c in candidates if is_archived_stage(c.get("stage"))]
+        if archived:
+            self.archive.put_many(archived)
+            # One journal append (or transaction) for the whole batch
+            self.storage.delete_candidates([c["id"] for c in archived])
+            print(f"Archived {len(archived)} candidates in terminal stages")
+        active = [c for c in candidates if not is_archived_stage(c.get("stage"))]
+        cold_ids = self.archive.ids()
+        for candidate in active:
+            if candidate["id"] in cold_ids:
+                self.archive.remove(candidate["id"])
+        return active
+
+    def _is_cold(self, candidate: Dict[str, Any]) -> bool:
+        """Whether candidate belongs in the cold tier."""
+        return self.archive is not None and is_archived_stage(candidate.get("stage"))
+
+    def _build_indexes(self):
+        """
+        Rebuild every in-memory index and aggregate from the candidate and
+        job lists. Writes afterwards maintain them one record at a time.
+        """
+        self.candidates_by_id = {}
+        self.candidate_ids_by_email = {}
+        self.candidate_ids_by_skill = {}
+        self.candidate_ids_by_location = {}
+        self.candidate_ids_by_experience = {}
+        self.candidate_ids_by_availability = {}
+        self.candidate_ids_by_stage = {}
+        # City coordinates for distance scoring (bundled, shared by all backends)
+        self.gazetteer = get_gazetteer()
+        # Candidate location keys the gazetteer knows, by coordinates
+        self.location_grid = GridIndex()
+        self.notes_index = InvertedIndex()
+        # MinHash LSH buckets of skill sets behind similar_candidates
+        self.similar = SimilarityIndex(normalize_skill, self.gazetteer)
+        self.jobs_by_id = {}
+        self.job_text_index = InvertedIndex()
+        # Skill / location / title postings behind job search and matching jobs
+        self.job_index = JobIndex(self.gazetteer)
+        # Aggregates behind analytics_summary
+        self.stage_counts = Counter()
+        self.candidate_skill_counts = Counter()
+        self.job_location_counts = Counter()
+        self.job_skill_counts = Counter()
+        # Slice-and-dice counts behind filtered analytics_summary
+        self.cube = AnalyticsCube()
+        # List positions, so a record can be replaced or removed in O(1)
+        self._candidate_positions = {c["id"]: i for i, c in enumerate(self.candidates)}
+        self._job_positions = {job["id"]: i for i, job in enumerate(self.jobs)}
+        # candidate_id -> (jobs_version, candidate, recommendations), filled lazily
+        self._recommendations = {}
+        # TF-IDF vectors + LSH, built on first semantic query (see semantic)
+        self._semantic = None
+        # Duplicate-detection blocks, built here with the other indexes so
+        # no request pays for the whole pool under the write lock
+        self._duplicates = DuplicateDetector()
+        # (data_version, SuggestIndex) behind suggest, rebuilt after writes
+        # (readers keep using the previous one while it is rebuilt)
+        self._suggestions = None
+        self._jobs_version = 0
+        for job in self.jobs:
+            self._index_job(job)
+        for candidate in self.candidates:
+            self._index_candidate(candidate)
+        self._next_candidate_id = max(self.candidates_by_id, default=-1) + 1
+        self._next_job_id = max(self.jobs_by_id, default=-1) + 1
+
+    def _job_text(self, job: Dict[str, Any]) -> str:
+        """Text indexed for a job: its title and description snippet."""
+        return f"{job.get('title', '')} {job.get('jdSnippet', '')}"
+
+    def _index_candidate(self, candidate: Dict[str, Any]):
+        """Add one candidate to the in-memory indexes and aggregates."""
+        candidate_id = candidate["id"]
+        self.candidates_by_id[candidate_id] = candidate
+        email = candidate.get("email", "").strip().lower()
+        if email:
+            self.candidate_ids_by_email.setdefault(email, candidate_id)
+        for skill in candidate.get("skills", []):
+            _add_posting(self.candidate_ids_by_skill, skill.lower(), candidate_id)
+        location = candidate.get("location", "").lower()
+        _add_posting(self.candidate_ids_by_location, location, candidate_id)
+        if location not in self.location_grid.points:
+            point = self.gazetteer.point(location)
+            if point is not None:
+                self.location_grid.add(location, point)
+        _add_posting(self.candidate_ids_by_experience, candidate.get("experienceYears", 0), candidate_id)
+        available = parse_date(candidate.get("availabilityDate", ""))
+        if available is not None:
+            _add_posting(self.candidate_ids_by_availability, available, candidate_id)
+        _add_posting(self.candidate_ids_by_stage, candidate.get("stage", "Unknown").lower(), candidate_id)
+        self.notes_index.add(candidate_id, candidate.get("notes", ""))
+        self.similar.add(candidate)
+        if self._semantic is not None:
+            self._semantic.add("candidate", candidate)
+        self._duplicates.add(candidate)
+        self.stage_counts[candidate.get("stage", "Unknown")] += 1
+        self.candidate_skill_counts.update(candidate.get("skills", []))
+        self.cube.add_candidate(candidate)
+
+    def _unindex_candidate(self, candidate: Dict[str, Any]):
+        """Remove one candidate from the in-memory indexes and aggregates."""
+        candidate_id = candidate["id"]
+        self.candidates_by_id.pop(candidate_id, None)
+        email = candidate.get("email", "").strip().lower()
+        if self.candidate_ids_by_email.get(email) == candidate_id:
+            del self.candidate_ids_by_email[email]
+        for skill in candidate.get("skills", []):
+            _remove_posting(self.candidate_ids_by_skill, skill.lower(), candidate_id)
+        location = candidate.get("location", "").lower()
+        _remove_posting(self.candidate_ids_by_location, location, candidate_id)
+        if location not in self.candidate_ids_by_location:
+            self.location_grid.remove(location)
+        _remove_posting(self.candidate_ids_by_experience, candidate.get("experienceYears", 0), candidate_id)
+        available = parse_date(candidate.get("availabilityDate", ""))
+        if available is not None:
+            _remove_posting(self.candidate_ids_by_availability, available, candidate_id)
+        _remove_posting(self.candidate_ids_by_stage, candidate.get("stage", "Unknown").lower(), candidate_id)
+        self.notes_index.remove(candidate_id, candidate.get("notes", ""))
+        self.similar.remove(candidate_id)
+        if self._semantic is not None:
+            self._semantic.remove("candidate", candidate_id)
+        self._duplicates.remove(candidate_id)
+        _decrement(self.stage_counts, [candidate.get("stage", "Unknown")])
+        _decrement(self.candidate_skill_counts, candidate.get("skills", []))
+        self.cube.remove_candidate(candidate)
+        self._recommendations.pop(candidate_id, None)
+
+    def _index_job(self, job: Dict[str, Any]):
+        """Add one job to the in-memory indexes and aggregates."""
+        self.jobs_by_id[job["id"]] = job
+        self.job_text_index.add(job["id"], self._job_text(job))
+        self.job_index.add(job)
+        if self._semantic is not None:
+            self._semantic.add("job", job)
+        self.job_location_counts[job.get("location", "Unknown")] += 1
+        self.job_skill_counts.update(job.get("skillsRequired", []))
+        self.cube.add_job(job)
+
+    def _unindex_job(self, job: Dict[str, Any]):
+        """Remove one job from the in-memory indexes and aggregates."""
+        self.jobs_by_id.pop(job["id"], None)
+        self.job_text_index.remove(job["id"], self._job_text(job))
+        self.job_index.remove(job)
+        if self._semantic is not None:
+            self._semantic.remove("job", job["id"])
+        _decrement(self.job_location_counts, [job.get("location", "Unknown")])
+        _decrement(self.job_skill_counts, job.get("skillsRequired", []))
+        self.cube.remove_job(job)
+
+    # ------------------------------------------------------------------
+    # Record writes (create / update / delete)
+    # ------------------------------------------------------------------
+
+    def _check_email_free(self, email: str, candidate_id: Optional[int] = None):
+        owner = self.candidate_ids_by_email.get(email.strip().lower())
+        if owner is None and self.archive is not None and email.strip():
+            owner = self.archive.find_email(email)
+        if owner is not None and owner != candidate_id:
+            raise ValueError(f"Email already used by candidate {owner}")
+
+    def _after_write(self):
+        """
+        Invalidate caches; once the journal is due for compaction, fold it in
+        a background thread so writes do not wait for the files to be rewritten.
+        """
+        self._touch()
+        if self.storage.needs_compaction() and self._compaction is None:
+            self._compaction = threading.Thread(target=self._compact_in_background, name="compact", daemon=True)
+            self._compaction.start()
+
+    def _compact_in_background(self):
+        try:
+            self.compact_storage()
+        finally:
+            self._compaction = None
+
+    def compact_storage(self, force: bool = False):
+        """
+        Fold the storage engine's journal into its files if it has grown enough
+        (or force). Records are snapshotted under the write lock, the files
+        rewritten outside it. Must not be called with the write lock held.
+        """
+        with self._compact_lock:
+            with self._write_lock:
+                if not (self.storage.needs_compaction() or (force and getattr(self.storage, "journal_entries", 0))):
+                    return
+                # Records are replaced on update, never mutated, so copying the lists is enough
+                candidates, jobs = list(self.candidates), list(self.jobs)
+                mark = self.storage.journal_mark()
+            self.storage.compact(
+                sorted(candidates, key=lambda c: c["id"]),
+                sorted(jobs, key=lambda j: j["id"]),
+                mark,
+            )
+
+    @staticmethod
+    def _list_remove(records: List[Dict[str, Any]], positions: Dict[int, int], record_id: int):
+        """Remove a record from a list in O(1) by moving the last record into its slot."""
+        position = positions.pop(record_id)
+        last = records.pop()
+        if last["id"] != record_id:
+            records[position] = last
+            positions[last["id"]] = position
+
+    def create_candidate(self, data: Dict[str, Any], allow_duplicates: bool = True) -> Dict[str, Any]:
+        """
+        Add a candidate. Raises ValueError if the payload is invalid or the
+        email is already in use, and DuplicateCandidate if allow_duplicates
+        is False and the candidate looks like someone already stored.
+        Returns: the stored candidate (with its new id)
+        """
+        record = validate_record(data, CANDIDATE_FIELDS)
+        with self._write_lock:
+            if not allow_duplicates:
+                duplicates = self.find_duplicates(record)
+                if duplicates:
+                    raise DuplicateCandidate(duplicates)
+            self._check_email_free(record["email"])
+            candidate = {"id": self._next_candidate_id, **record}
+            if self._is_cold(candidate):
+                self.archive.put(candidate)
+                self.cube.add_candidate(candidate)
+                self._next_candidate_id += 1
+            else:
+                self.storage.upsert_candidate(candidate)
+                self._next_candidate_id += 1
+                self._candidate_positions[candidate["id"]] = len(self.candidates)
+                self.candidates.append(candidate)
+                self._index_candidate(candidate)
+            self.stage_log.record(candidate["id"], None, candidate["stage"])
+            self._after_write()
+        return candidate
+
+    def create_candidates(
+        self, records: List[Dict[str, Any]], allow_duplicates: bool = True
+    ) -> List[Any]:
+        """
+        Add a batch of candidates with one storage write (bulk imports).
+        Records are checked like create_candidate's, including against
+        earlier records of the same batch. The journal is not compacted
+        here; call compact_storage() when the import is done.
+        Returns: per record, the stored candidate or the ValueError /
+        DuplicateCandidate that rejected it
+        """
+        results = []
+        with self._write_lock:
+            created = []
+            archived = []
+            try:
+                for data in records:
+                    try:
+                        record = validate_record(data, CANDIDATE_FIELDS)
+                        if not allow_duplicates:
+                            duplicates = self.find_duplicates(record)
+                            if duplicates:
+                                raise DuplicateCandidate(duplicates)
+                        self._check_email_free(record["email"])
+                    except (ValueError, DuplicateCandidate) as e:
+                        results.append(e)
+                        continue
+                    candidate = {"id": self._next_candidate_id, **record}
+                    self._next_candidate_id += 1
+                    if self._is_cold(candidate):
+                        archived.append(candidate)
+                        results.append(candidate)
+                        continue
+                    self._candidate_positions[candidate["id"]] = len(self.candidates)
+                    self.candidates.append(candidate)
+                    # Indexed now so later records of the batch see it
+                    self._index_candidate(candidate)
+                    created.append(candidate)
+                    results.append(candidate)
+                self.storage.upsert_candidates(created)
+                if archived:
+                    self.archive.put_many(archived)
+                    for candidate in archived:
+                        self.cube.add_candidate(candidate)
+            except Exception:
+                for candidate in reversed(created):
+                    self._unindex_candidate(candidate)
+                    self._list_remove(self.candidates, self._candidate_positions, candidate["id"])
+                raise
+            now = round(time.time(), 3)
+            self.stage_log.record_many([[now, c["id"], None, c["stage"]] for c in created + archived])
+            self._touch()
+        return results
+
+    def update_candidate(
+        self, candidate_id: int, changes: Dict[str, Any], replace: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update a candidate: merge changes (PATCH), or replace the whole record
+        if replace (PUT). Raises ValueError if the payload is invalid.
+        Returns: the updated candidate, or None if not found
+        """
+        record = validate_record(changes, CANDIDATE_FIELDS, partial=not replace)
+        with self._write_lock:
+            current = self.candidates_by_id.get(candidate_id)
+            was_cold = current is None and self.archive is not None
+            if was_cold:
+                current = self.archive.get(candidate_id)
+            if current is None:
+                return None
+            if replace:
+                candidate = {"id": candidate_id, **record}
+            else:
+                candidate = {**current, **record}
+            self._check_email_free(candidate.get("email", ""), candidate_id)
+            # Tier moves write the destination first, so a crash in between
+            # leaves a copy that load_data resolves by stage
+            if self._is_cold(candidate):
+                self.archive.put(candidate)
+                if was_cold:
+                    self.cube.remove_candidate(current)
+                else:
+                    # Demotion
+                    self.storage.delete_candidate(candidate_id)
+                    self._unindex_candidate(current)
+                    self._list_remove(self.candidates, self._candidate_positions, candidate_id)
+                self.cube.add_candidate(candidate)
+            else:
+                self.storage.upsert_candidate(candidate)
+                if was_cold:
+                    # Promotion
+                    self.archive.remove(candidate_id)
+                    self.cube.remove_candidate(current)
+                    self._candidate_positions[candidate_id] = len(self.candidates)
+                    self.candidates.append(candidate)
+                else:
+                    # Replace rather than mutate: cached results still hold the old dict
+                    self._unindex_candidate(current)
+                    self.candidates[self._candidate_positions[candidate_id]] = candidate
+                self._index_candidate(candidate)
+            if candidate.get("stage") != current.get("stage"):
+                self.stage_log.record(candidate_id, current.get("stage"), candidate.get("stage"))
+            self._after_write()
+        return candidate
+
+    def delete_candidate(self, candidate_id: int) -> bool:
+        """
+        Delete a candidate and drop it from any shortlists.
+        Returns: True if it existed
+        """
+        with self._write_lock:
+            candidate = self.candidates_by_id.get(candidate_id)
+            if candidate is not None:
+                self.storage.delete_candidate(candidate_id)
+                self._unindex_candidate(candidate)
+                self._list_remove(self.candidates, self._candidate_positions, candidate_id)
+            elif self.archive is not None:
+                candidate = self.archive.get(candidate_id)
+                if candidate is None:
+                    return False
+                self.archive.remove(candidate_id)
+                self.cube.remove_candidate(candidate)
+            else:
+                return False
+            self.stage_log.record(candidate_id, candidate.get("stage"), None)
+            for name, members in list(self.shortlist_bitmaps.items()):
+                if candidate_id in members:
+                    self._store_shortlist(name, [i for i in self.shortlists[name] if i != candidate_id])
+            self._after_write()
+        return True
+
+    def move_candidate(self, candidate_id: int, stage: str) -> Optional[Dict[str, Any]]:
+        """
+        Move a candidate to another pipeline stage (logged with a timestamp).
+        Raises ValueError on an empty stage.
+        Returns: the updated candidate with its timeInStage, or None if not found
+        """
+        if not isinstance(stage, str) or not stage.strip():
+            raise ValueError("stage must be a non-empty string")
+        candidate = self.update_candidate(candidate_id, {"stage": stage.strip()})
+        if candidate is None:
+            return None
+        return {**candidate, "timeInStage": self.stage_log.time_in_stage(candidate_id)}
+
+    def candidates_near(self, location: str, radius_km: float = DEFAULT_RADIUS_KM) -> List[Dict[str, Any]]:
+        """
+        Candidates in gazetteer cities within radius_km of location, read off
+        the location grid (distances are computed per city, not per candidate).
+        Raises ValueError for a city the gazetteer does not know.
+        Returns: [{candidate, distanceKm}], nearest first
+        """
+        point = self.gazetteer.point(location)
+        if point is None:
+            raise ValueError(f"Unknown city: {location}")
+        with self._write_lock:
+            return [
+                {"candidate": self.candidates_by_id[candidate_id], "distanceKm": distance}
+                for key, distance in self.location_grid.near(point, radius_km)
+                for candidate_id in sorted(self.candidate_ids_by_location.get(key, ()))
+            ]
+
+    def candidates_in_stage(self, stage: str) -> List[Dict[str, Any]]:
+        """
+        Candidates currently in a stage (case-insensitive), read off the stage
+        index (or the cold tier for archived stages).
+        """
+        if self.archive is not None and is_archived_stage(stage):
+            return self.archive.in_stage(stage)
+        with self._write_lock:
+            ids = sorted(self.candidate_ids_by_stage.get(stage.strip().lower(), ()))
+            return [self.candidates_by_id[i] for i in ids]
+
+    def stage_funnel(self, start: str = "", end: str = "") -> Dict[str, Any]:
+        """
+        Historical funnel from the stage log's daily rollups between two
+        YYYY-MM-DD dates (inclusive, open-ended if empty), plus current
+        counts per stage. Raises ValueError on a malformed date.
+        Returns: {days: [{date, entered, exited, medianDaysInStage}], totals, current}
+        """
+        bounds = []
+        for value in (start, end):
+            day = parse_date(value)
+            if value and day is None:
+                raise ValueError(f"Invalid date (expected YYYY-MM-DD): {value}")
+            bounds.append(day)
+        funnel = self.stage_log.funnel(*bounds)
+        funnel["current"] = self._stage_counts()
+        return funnel
+
+    def _stage_counts(self) -> Dict[str, int]:
+        """Candidates per stage across both tiers."""
+        counts = dict(self.stage_counts)
+        if self.archive is not None:
+            for stage, count in self.archive.stage_counts.items():
+                counts[stage] = counts.get(stage, 0) + count
+        return counts
+
+    @property
+    def duplicates(self) -> DuplicateDetector:
+        """The duplicate-detection blocks, built at load and maintained by writes."""
+        return self._duplicates
+
+    def find_duplicates(self, data: Dict[str, Any], limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Existing candidates that are likely the same person as data (a
+        payload about to be created, or a stored candidate).
+        Returns: [{candidate, id, score, reasons}], best first
+        """
+        detector = self.duplicates
+        with self._write_lock:
+            return [
+                {"candidate": self.candidates_by_id[match["id"]], **match}
+                for match in detector.matches(data, limit)
+            ]
+
+    def duplicate_clusters(self) -> Dict[str, Any]:
+        """
+        Groups of candidates that are likely the same person, compared only
+        within blocks (email, phone, name skeleton, MinHash bands).
+        Returns: {clusters: [{ids, survivorId, pairs}], stats}
+        """
+        # Copy block membership under the lock; the pairwise comparisons
+        # then run without holding up writes
+        with self._write_lock:
+            detector = self.duplicates.snapshot()
+        clusters, stats = detector.clusters()
+        return {"clusters": clusters, "stats": stats}
+
+    def merge_candidates(self, survivor_id: int, duplicate_ids: List[int]) -> Optional[Dict[str, Any]]:
+        """
+        Fold duplicates into the survivor (see dedup.merge_records), point
+        shortlist entries at the survivor and delete the duplicates.
+        Raises ValueError if a duplicate ID is unknown.
+        Returns: the merged candidate, or None if the survivor is not found
+        """
+        with self._write_lock:
+            survivor = self.candidates_by_id.get(survivor_id)
+            if survivor is None:
+                return None
+            duplicate_ids = [i for i in dict.fromkeys(duplicate_ids) if i != survivor_id]
+            missing = [i for i in duplicate_ids if i not in self.candidates_by_id]
+            if missing:
+                raise ValueError(f"Unknown candidate IDs: {missing}")
+            merged = merge_records(survivor, [self.candidates_by_id[i] for i in duplicate_ids])
+            duplicates = Bitmap.from_ids(duplicate_ids)
+            for name, members in list(self.shortlist_bitmaps.items()):
+                if members & duplicates:
+                    remapped = [survivor_id if i in duplicate_ids else i for i in self.shortlists[name]]
+                    self._store_shortlist(name, list(dict.fromkeys(remapped)))
+            for duplicate_id in duplicate_ids:
+                self.delete_candidate(duplicate_id)
+            candidate = self.update_candidate(survivor_id, merged, replace=True)
+        print(f"Merged candidates {duplicate_ids} into {survivor_id}")
+        return candidate
+
+    def create_job(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add a job. Raises ValueError if the payload is invalid.
+        Returns: the stored job (with its new id)
+        """
+        record = validate_record(data, JOB_FIELDS)
+        with self._write_lock:
+            job = {"id": self._next_job_id, **record}
+            self.storage.upsert_job(job)
+            self._next_job_id += 1
+            self._job_positions[job["id"]] = len(self.jobs)
+            self.jobs.append(job)
+            self._index_job(job)
+            self._jobs_version += 1
+            self._after_write()
+        return job
+
+    def update_job(
+        self, job_id: int, changes: Dict[str, Any], replace: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update a job: merge changes (PATCH), or replace the whole record if
+        replace (PUT). Raises ValueError if the payload is invalid.
+        Returns: the updated job, or None if not found
+        """
+        record = validate_record(changes, JOB_FIELDS, partial=not replace)
+        with self._write_lock:
+            current = self.jobs_by_id.get(job_id)
+            if current is None:
+                return None
+            job = {"id": job_id, **record} if replace else {**current, **record}
+            self.storage.upsert_job(job)
+            self._unindex_job(current)
+            self.jobs[self._job_positions[job_id]] = job
+            self._index_job(job)
+            self._jobs_version += 1
+            self._after_write()
+        return job
+
+    def delete_job(self, job_id: int) -> bool:
+        """
+        Delete a job.
+        Returns: True if it existed
+        """
+        with self._write_lock:
+            job = self.jobs_by_id.get(job_id)
+            if job is None:
+                return False
+            self.storage.delete_job(job_id)
+            self._unindex_job(job)
+            self._list_remove(self.jobs, self._job_positions, job_id)
+            self._jobs_version += 1
+            self._after_write()
+        return True
+
+    def get_candidate(self, candidate_id: int) -> Optional[Dict[str, Any]]:
+        """Return the candidate with the given ID (either tier), or None."""
+        candidate = self.candidates_by_id.get(candidate_id)
+        if candidate is None and self.archive is not None:
+            candidate = self.archive.get(candidate_id)
+        return candidate
+
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Return the job with the given ID, or None."""
+        return self.jobs_by_id.get(job_id)
+
+    def find_candidate_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Return the candidate with the given email (case-insensitive), or None."""
+        candidate_id = self.candidate_ids_by_email.get(email.strip().lower())
+        if candidate_id is None and self.archive is not None:
+            candidate_id = self.archive.find_email(email)
+        if candidate_id is None:
+            return None
+        return self.get_candidate(candidate_id)
+
+    def candidate_ids_from_indices(self, indices: List[int]) -> List[int]:
+        """Translate legacy list positions (old API clients) to candidate IDs."""
+        return [
+            self.candidates[i]["id"]
+            for i in indices
+            if isinstance(i, int) and 0 <= i < len(self.candidates)
+        ]
+
+    def close(self):
+        """Fold the journal into the data files and release file handles (tenant unload)."""
+        self.compact_storage(force=True)
+        with self._write_lock:
+            self.storage.close()
+            self.stage_log.close()
+            if self.archive is not None:
+                self.archive.close()
+
+    def _touch(self):
+        """Record a data change: bump the version and drop cached searches."""
+        with self._cache_lock:
+            self.data_version += 1
+            self.last_modified = time.time()
+            self._search_cache.clear()
+        self.changes.changed(self.data_version)
+
     def _normalize_skill(self, skill):
         """Normalize skill names and handle synonyms."""
-        synonyms = {
-            'js': 'JavaScript',
-            'nodejs': 'Node.js',
-            'node.js': 'Node.js',
-            'py': 'Python',
-            'reactjs': 'React',
-            'frontend': 'Frontend',
-            'backend': 'Backend',
-            'sql': 'SQL',
-            'db': 'Database',
-            'dbms': 'Database',
-            'html5': 'HTML',
-            'css3': 'CSS',
-        }
-        skill = skill.lower().strip()
-        return synonyms.get(skill, skill.title())
+        return normalize_skill(skill)
 
     def _fuzzy_match(self, a, b):
         """Return True if a and b are similar (basic fuzzy match)."""
@@ -89,13 +944,26 @@ class HRBackend:
     def parse_query(self, text: str) -> Dict[str, Any]:
         """
         Parse natural language query into structured filters.
-        Returns: {role?, skills[], location?, minExp?, maxExp?, availabilityWindowDays?}
+        Returns: {role?, skills[], location?, radiusKm?, minExp?, maxExp?,
+                  availabilityWindowDays?, text[]?, phrases[]?}
         """
         filters = {}
         text_lower = text.lower()
+        # Character spans understood by the extractors below; the rest is free text
+        consumed = []
+
+        # Quoted phrases are matched against notes by position
+        phrases = []
+        for match in re.finditer(r'"([^"]+)"', text_lower):
+            terms = tokenize(match.group(1))
+            if terms:
+                phrases.append(terms)
+            consumed.append(match.span())
 
         # Enhanced: Recognize 'frontend developer' and variants as both role and skill
-        if re.search(r"front\s*-?\s*end\s+dev(eloppe?r)?", text_lower):
+        frontend_match = re.search(r"front\s*-?\s*end\s+dev(eloppe?r)?", text_lower)
+        if frontend_match:
+            consumed.append(frontend_match.span())
             filters["role"] = "Frontend Developer"
             # Add 'Frontend' and common frontend skills to skills list
             filters.setdefault("skills", []).extend([
@@ -117,11 +985,13 @@ class HRBackend:
             match = re.search(pattern, text_lower, re.IGNORECASE)
             if match:
                 filters["role"] = match.group(0).replace(".", " ").title()
+                consumed.append(match.span())
                 break
 
         # Extract technical skills (add 'frontend' as a skill)
-        skills_pattern = r"\b(react|reactjs|javascript|js|python|py|java|node\.?js|nodejs|angular|vue|css|css3|html|html5|sql|db|dbms|mongodb|postgresql|docker|kubernetes|aws|azure|gcp|typescript|php|c\+\+|c#|ruby|go|rust|swift|kotlin|flutter|django|flask|spring|laravel|express|git|redis|elasticsearch|graphql|rest|api|frontend|backend)\b"
-        skills_found = re.findall(skills_pattern, text_lower, re.IGNORECASE)
+        skill_matches = list(re.finditer(QUERY_SKILLS_PATTERN, text_lower, re.IGNORECASE))
+        skills_found = [match.group(1) for match in skill_matches]
+        consumed.extend(match.span() for match in skill_matches)
 
         if skills_found:
             normalized_skills = []
@@ -141,11 +1011,16 @@ class HRBackend:
                     filters["skills"].append(skill)
                     seen.add(skill)
 
-        # Extract location
-        location_pattern = r"\b(casablanca|rabat|marrakech|fez|tangier|agadir|meknes|oujda|kenitra|tetouan|sale|temara|mohammedia|el jadida|taza|settat|khouribga|beni mellal|nador|berrechid|khemisset|laayoune|paris|london|madrid|barcelona|amsterdam|berlin|rome|milan|new york|san francisco|toronto|montreal|dubai|cairo|tunis|algiers|lagos|nairobi|cape town|johannesburg|sydney|melbourne|tokyo|singapore|mumbai|bangalore|delhi|beijing|shanghai|hong kong|seoul|taipei|bangkok|jakarta|kuala lumpur|manila|ho chi minh|hanoi|istanbul|athens|vienna|prague|warsaw|stockholm|oslo|helsinki|copenhagen|brussels|geneva|zurich|lisbon)\b"
-        location_match = re.search(location_pattern, text_lower, re.IGNORECASE)
-        if location_match:
-            filters["location"] = location_match.group(0).title()
+        # Extract location (any city or alias in the gazetteer) and a radius
+        found = self.gazetteer.find(text_lower)
+        if found:
+            place, span = found
+            filters["location"] = place["name"]
+            consumed.append(span)
+        radius_match = re.search(r"\b(?:within|under|less than)?\s*(\d+)\s*(?:km|kilometers|kilometres)\b", text_lower)
+        if radius_match:
+            filters["radiusKm"] = int(radius_match.group(1))
+            consumed.append(radius_match.span())
 
         # Extract experience range
         exp_range_pattern = r"(\d+)[-–—](\d+)\s*years?"
@@ -154,23 +1029,28 @@ class HRBackend:
         if exp_range_match:
             filters["minExp"] = int(exp_range_match.group(1))
             filters["maxExp"] = int(exp_range_match.group(2))
+            consumed.append(exp_range_match.span())
         else:
             # Single number experience
             single_exp_pattern = r"(\d+)\s*years?"
             single_exp_match = re.search(single_exp_pattern, text_lower)
             if single_exp_match:
+                consumed.append(single_exp_match.span())
                 exp = int(single_exp_match.group(1))
                 filters["minExp"] = max(0, exp - 1)
                 filters["maxExp"] = exp + 1
 
         # Extract availability window
-        if re.search(
+        available_match = re.search(
             r"\b(available|this month|immediately|asap|now|soon)\b", text_lower
-        ):
+        )
+        if available_match:
             filters["availabilityWindowDays"] = 45  # Within next 45 days
+            consumed.append(available_match.span())
         elif re.search(r"\bnext\s*(\d+)\s*months?\b", text_lower):
             months_match = re.search(r"\bnext\s*(\d+)\s*months?\b", text_lower)
             if months_match:
+                consumed.append(months_match.span())
                 months = int(months_match.group(1))
                 filters["availabilityWindowDays"] = months * 30
 
@@ -182,155 +1062,650 @@ class HRBackend:
                 limit_match.group(1) or limit_match.group(2) or limit_match.group(3)
             )
             filters["limit"] = limit
+            consumed.append(limit_match.span())
         else:
             filters["limit"] = 5  # Default limit
 
+        # Free-text terms: whatever no extractor understood, for notes search
+        free_text = "".join(
+            " " if any(start <= i < end for start, end in consumed) else char
+            for i, char in enumerate(text_lower)
+        )
+        terms = [term for term in tokenize(free_text) if term not in QUERY_STOP_WORDS]
+        if terms:
+            filters["text"] = list(dict.fromkeys(terms))
+        if phrases:
+            filters["phrases"] = phrases
+
         return filters
 
-    def search_candidates(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def search_filters(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Filters for a search request body: {"filters": {...}} or
+        {"query": "..."}, plus an optional {"profile": "<scoring profile>"}.
+        Raises ValueError for an unknown profile.
+        """
+        filters = data.get("filters") or self.parse_query(data.get("query", ""))
+        if data.get("profile"):
+            filters = dict(filters, profile=data["profile"])
+        if data.get("shortlist"):
+            filters = dict(filters, shortlist=data["shortlist"])
+        if data.get("includeArchived"):
+            filters = dict(filters, includeArchived=True)
+        self._check_filters(filters)
+        return filters
+
+    def _check_filters(self, filters: Dict[str, Any]):
+        """Raise ValueError for an unknown scoring profile or shortlist."""
+        self.scoring_profile(filters.get("profile"))
+        if filters.get("shortlist"):
+            self.shortlist_members(filters["shortlist"])
+
+    def search_cache_key(self, filters: Dict[str, Any]) -> str:
+        """
+        Key identifying a search result: data version, day and canonical filters.
+        The day is included because availability scoring is relative to today.
+        """
+        today = datetime.now().date().isoformat()
+        return f"{self.data_version}:{today}:{canonical_filters(filters)}"
+
+    def search_candidates(
+        self,
+        filters: Dict[str, Any],
+        should_cancel: Optional[Callable[[], bool]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Flexible search: Score all candidates by partial matches and always return top results.
+        Results are cached per data version (see search_cache_size), and
+        identical concurrent searches are coalesced into one scan even when
+        caching is disabled.
+        should_cancel is polled while scoring; if it returns True the search
+        stops and raises SearchCancelled.
+        Past the deadline the search stops scoring and returns the best
+        results found so far (most promising candidates are scored first) and
+        sets deadline.reached; partial results are neither cached nor shared.
+        A request waiting on an identical search in flight stops waiting at its
+        own deadline and returns a partial scan of its own instead.
+        filters["profile"] picks a scoring profile and filters["shortlist"]
+        restricts the search to a shortlist's members (ValueError if unknown).
         Returns: [{candidate, score, reason}]
         """
-        results = []
+        self._check_filters(filters)
+        key = self.search_cache_key(filters)
+        while True:
+            with self._cache_lock:
+                if self.search_cache_size > 0:
+                    cached = self._search_cache.get(key)
+                    if cached is not None:
+                        self._search_cache.move_to_end(key)
+                        self.search_stats["cacheHits"] += 1
+                        return list(cached)
+
+                # Single flight: identical concurrent searches share one scan
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = _InflightSearch()
+                    self._inflight[key] = flight
+                else:
+                    self.search_stats["coalesced"] += 1
+
+            if leader:
+                return list(self._lead_search(key, flight, filters, should_cancel, deadline))
+
+            try:
+                results = flight.wait(should_cancel, deadline)
+            except _DeadlineReached:
+                # Out of time before the leader finished: a scan of our own stops
+                # at its first deadline check with the most promising candidates
+                results = self._search_candidates(filters, should_cancel, deadline)
+                with self._cache_lock:
+                    self.search_stats["executed"] += 1
+                    self.search_stats["partial"] += 1
+                return results
+            if results is not None:
+                return list(results)
+            # The leader was cancelled; retry (possibly as the new leader)
+
+    def _lead_search(
+        self,
+        key: str,
+        flight: "_InflightSearch",
+        filters: Dict[str, Any],
+        should_cancel: Optional[Callable[[], bool]],
+        deadline: Optional[Deadline] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run a search on behalf of every request waiting on flight."""
+        results = None
+        try:
+            results = self._search_candidates(filters, should_cancel, deadline)
+            return results
+        except SearchCancelled:
+            # Followers retry rather than inherit this request's cancellation
+            raise
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            partial = deadline is not None and deadline.reached
+            with self._cache_lock:
+                del self._inflight[key]
+                if results is not None:
+                    self.search_stats["executed"] += 1
+                    if partial:
+                        self.search_stats["partial"] += 1
+                # Skip caching if data changed while we were scoring
+                if (
+                    results is not None
+                    and not partial
+                    and self.search_cache_size > 0
+                    and key.startswith(f"{self.data_version}:")
+                ):
+                    self._search_cache[key] = results
+                    while len(self._search_cache) > self.search_cache_size:
+                        self._search_cache.popitem(last=False)
+            # Followers of a partial search run their own (under their own deadline)
+            flight.finish(None if partial else results)
+
+    def _plan_search(self, filters: Dict[str, Any]):
+        """
+        Everything a search needs before scoring: the plan and the scorer
+        bound to the query by its scoring profile.
+        Returns: (plan, matching_jobs, today, text_scores, scorer)
+        """
+        profile = self.scoring_profile(filters.get("profile"))
         today = datetime.now().date()
         matching_jobs = self._find_matching_jobs(filters)
+        # Indexes are read under the write lock; scoring runs on the plan's copies
+        with self._write_lock:
+            scope = None
+            if filters.get("shortlist"):
+                scope = set(self.shortlist_members(filters["shortlist"]))
+            text_scores = self._text_scores(filters, profile.weights["notes"])
+            plan = self.planner.plan(filters, matching_jobs, today, text_scores, profile.weights, scope)
+        scorer = profile.bind(self, filters, matching_jobs, today, text_scores)
+        return plan, matching_jobs, today, text_scores, scorer
+
+    def _search_candidates(
+        self,
+        filters: Dict[str, Any],
+        should_cancel: Optional[Callable[[], bool]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> List[Dict[str, Any]]:
+        """Score candidates against filters (uncached search)."""
+        plan, matching_jobs, today, text_scores, scorer = self._plan_search(filters)
+        results = self._run_plan(plan, filters, matching_jobs, today, text_scores, should_cancel, scorer, deadline)
+        if filters.get("includeArchived") and self.archive is not None:
+            if deadline is None or not deadline.expired():
+                results = self._search_archive(results, plan, filters, matching_jobs, today, should_cancel, deadline)
+        return results
+
+    def explain_search(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a search uncached and report the plan the planner chose.
+        Returns: {filters, profile, plan, statistics, results: [{id, score}]}
+        """
+        plan, matching_jobs, today, text_scores, scorer = self._plan_search(filters)
+        results = self._run_plan(plan, filters, matching_jobs, today, text_scores, scorer=scorer)
+        if filters.get("includeArchived") and self.archive is not None:
+            results = self._search_archive(results, plan, filters, matching_jobs, today)
+        return {
+            "filters": filters,
+            "profile": self.scoring_profile(filters.get("profile")).name,
+            "plan": plan.explain(),
+            "statistics": self.planner.statistics(),
+            "results": [{"id": r["id"], "score": r["score"]} for r in results],
+        }
 
-        for i, candidate in enumerate(self.candidates):
-            score = 0
-            reasons = []
-            candidate_skills = [self._normalize_skill(skill) for skill in candidate.get("skills", [])]
-            filter_skills = [self._normalize_skill(skill) for skill in filters.get("skills", [])]
-            matched_skills = []
-            fuzzy_matched_skills = []
-            for filter_skill in filter_skills:
-                for candidate_skill in candidate_skills:
-                    if self._fuzzy_match(filter_skill, candidate_skill):
-                        matched_skills.append(filter_skill)
-                        break
-                    elif filter_skill[:3] == candidate_skill[:3]:
-                        fuzzy_matched_skills.append(filter_skill)
+    def _run_plan(
+        self,
+        plan: QueryPlan,
+        filters: Dict[str, Any],
+        matching_jobs: List[Dict[str, Any]],
+        today,
+        text_scores: Dict[int, float],
+        should_cancel: Optional[Callable[[], bool]] = None,
+        scorer: Optional[Scorer] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a plan. Candidates are scored only if their score upper bound
+        can still reach the current top `limit` (ties included, since names
+        break them); whole posting lists are skipped once the rules left
+        cannot lift an unseen candidate that high. A scoped plan only ever
+        reads the candidates in plan.scope.
+        Candidates are visited highest bound first, so when the deadline
+        passes the scan stops with the most promising ones already scored.
+        """
+        limit = plan.limit
+        if plan.scope is None:
+            pool = self.candidates
+        else:
+            pool = [self.candidates_by_id[i] for i in sorted(plan.scope) if i in self.candidates_by_id]
+        results = []
+        scored = set()
+        # Sort keys (-score, firstName, id) of the best `limit` results so far;
+        # the last one is the entry a new candidate has to beat
+        best = []
+
+        def prunable(candidate: Dict[str, Any], bound: float) -> bool:
+            if limit <= 0 or len(best) < limit:
+                return False
+            worst_score, worst_name, worst_id = best[-1]
+            threshold = -worst_score
+            if bound + BOUND_EPSILON < threshold:
+                return True
+            # At best a tie on score, and the name tie-break would lose it
+            return bound <= threshold + BOUND_EPSILON and (
+                candidate.get("firstName", ""), candidate["id"]
+            ) > (worst_name, worst_id)
+
+        def consider(candidate: Dict[str, Any], bound: float):
+            if prunable(candidate, bound):
+                plan.stats["pruned"] += 1
+                return
+            # Cooperative cancellation checkpoint
+            if (
+                should_cancel is not None
+                and plan.stats["scored"] % CANCEL_CHECK_INTERVAL == 0
+                and should_cancel()
+            ):
+                raise SearchCancelled(f"Search cancelled after {plan.stats['scored']} candidates")
+            if (
+                deadline is not None
+                and plan.stats["scored"]
+                and plan.stats["scored"] % DEADLINE_CHECK_INTERVAL == 0
+                and deadline.expired()
+            ):
+                raise _DeadlineReached()
+            result = self._score_candidate(candidate, filters, matching_jobs, today, text_scores, scorer)
+            plan.stats["scored"] += 1
+            results.append(result)
+            if limit > 0:
+                bisect.insort(best, (-result["score"], candidate.get("firstName", ""), candidate["id"]))
+                if len(best) > limit:
+                    best.pop()
+
+        def threshold() -> Optional[float]:
+            return -best[-1][0] if limit > 0 and len(best) >= limit else None
+
+        def by_bound(item):
+            return (-item[0], item[1].get("firstName", ""), item[1]["id"])
+
+        stopped = False
+        try:
+            if plan.path == "full-scan":
+                # Highest bounds first, so the threshold rises before weak candidates
+                bounds = plan.bounds_by_id()
+                bounded = sorted(((bounds.get(c["id"], 0), c) for c in pool), key=by_bound)
+                for bound, candidate in bounded:
+                    consider(candidate, bound)
+            elif plan.path != "name-order":
+                remaining = plan.remaining_bounds()
+                for position, rule in enumerate(plan.rules):
+                    cutoff = threshold()
+                    if cutoff is not None and remaining[position] + BOUND_EPSILON < cutoff:
+                        plan.stats["rulesSkipped"] = [r.name for r in plan.rules[position:]]
                         break
-            if matched_skills:
-                skill_score = len(matched_skills) * 2
-                score += skill_score
-                skills_display = "+".join([s.title() for s in matched_skills])
-                reasons.append(f"{skills_display} match (+{skill_score})")
-            if fuzzy_matched_skills:
-                fuzzy_score = len(fuzzy_matched_skills)
-                score += fuzzy_score
-                skills_display = "+".join([s.title() for s in fuzzy_matched_skills])
-                reasons.append(f"Fuzzy skill match: {skills_display} (+{fuzzy_score})")
-
-            # Job-based skill matching bonus (+1 per job skill match)
-            job_skill_matches = 0
-            for job in matching_jobs:
-                job_skills = [skill.lower() for skill in job.get("skillsRequired", [])]
-                for job_skill in job_skills:
-                    for candidate_skill in candidate_skills:
-                        if job_skill in candidate_skill or candidate_skill in job_skill:
-                            job_skill_matches += 1
-                            break
-            if job_skill_matches > 0:
-                score += job_skill_matches
-                reasons.append(f"Job skills match (+{job_skill_matches})")
-
-            # Location matching (+1 for exact match, +0.5 for partial match)
-            candidate_location = candidate.get("location", "").lower()
-            filter_location = filters.get("location", "").lower()
-            if filter_location:
-                if candidate_location == filter_location:
-                    score += 1
-                    reasons.append(f"Location: {filters['location']} (exact match, +1)")
-                elif filter_location in candidate_location or candidate_location in filter_location:
-                    score += 0.5
-                    reasons.append(f"Location: partial match (+0.5)")
-                else:
-                    reasons.append(f"Location: not matched")
-
-            # Experience matching (+1 if within range ±1 year, +0.5 if within ±2 years)
-            if "minExp" in filters and "maxExp" in filters:
-                candidate_exp = candidate.get("experienceYears", 0)
-                if (filters["minExp"] - 1) <= candidate_exp <= (filters["maxExp"] + 1):
-                    score += 1
-                    reasons.append(f"Experience: {candidate_exp}y (in range, +1)")
-                elif (filters["minExp"] - 2) <= candidate_exp <= (filters["maxExp"] + 2):
-                    score += 0.5
-                    reasons.append(f"Experience: {candidate_exp}y (near range, +0.5)")
-                else:
-                    reasons.append(f"Experience: {candidate_exp}y (not matched)")
+                    unseen = [self.candidates_by_id.get(i) for i in rule.ids - scored]
+                    scored.update(rule.ids)
+                    bounded = sorted(((plan.bound(c), c) for c in unseen if c is not None), key=by_bound)
+                    for bound, candidate in bounded:
+                        consider(candidate, bound)
+        except _DeadlineReached:
+            stopped = True
+        if plan.path == "full-scan":
+            scored.update(result["id"] for result in results)
+
+        # Always return `limit` results: fill with unscored (zero-score) candidates by
+        # name (not after a deadline: unscored candidates there need not score zero)
+        positives = sum(1 for result in results if result["score"] > 0)
+        if positives < limit and not stopped:
+            fill = heapq.nsmallest(
+                limit + len(scored),
+                pool,
+                key=lambda c: (c.get("firstName", ""), c["id"]),
+            )
+            for candidate in fill:
+                if candidate["id"] not in scored and plan.stats["filled"] < limit:
+                    scored.add(candidate["id"])
+                    plan.stats["filled"] += 1
+                    results.append(
+                        self._score_candidate(candidate, filters, matching_jobs, today, text_scores, scorer)
+                    )
 
-            # Availability matching (+1 if within window, +0.5 if within 90 days)
-            if "availabilityWindowDays" in filters:
-                avail_date_str = candidate.get("availabilityDate", "")
-                if avail_date_str:
-                    try:
-                        avail_date = datetime.strptime(avail_date_str, "%Y-%m-%d").date()
-                        days_until_available = (avail_date - today).days
-                        if 0 <= days_until_available <= filters["availabilityWindowDays"]:
-                            score += 1
-                            if days_until_available <= 7:
-                                reasons.append("Available immediately (+1)")
-                            elif days_until_available <= 30:
-                                reasons.append("Available this month (+1)")
-                            else:
-                                reasons.append("Available soon (+1)")
-                        elif 0 <= days_until_available <= 90:
-                            score += 0.5
-                            reasons.append("Available within 3 months (+0.5)")
-                        else:
-                            reasons.append("Availability not matched")
-                    except ValueError:
-                        pass
-
-            # Always include all candidates, but only show reasons if score > 0
-            if not reasons:
-                reasons.append("Partial or general match")
-            reason_text = ", ".join(reasons) + f" → score {score}"
-            job_recommendations = self._get_job_recommendations(candidate)
-            results.append({
-                "candidate": candidate,
-                "score": score,
-                "reason": reason_text,
-                "index": i,
-                "recommendedJobs": job_recommendations,
-            })
-
-        # Sort by score descending, then by name
-        results.sort(key=lambda x: (-x["score"], x["candidate"].get("firstName", "")))
-        limit = filters.get("limit", 5)
+        # Sort by score descending, then by name (ID keeps ties stable across writes)
+        results.sort(key=lambda x: (-x["score"], x["candidate"].get("firstName", ""), x["id"]))
         # Always return top candidates, even if score is 0
         return results[:limit]
 
-    def save_shortlist(self, name: str, candidate_indices: List[int]) -> bool:
+    def _search_archive(
+        self,
+        results: List[Dict[str, Any]],
+        plan: QueryPlan,
+        filters: Dict[str, Any],
+        matching_jobs: List[Dict[str, Any]],
+        today,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Merge the cold tier's best candidates into a search's results
+        (includeArchived). The archive has no resident indexes, so it is
+        streamed and every candidate scored; notes are ranked with a BM25
+        index over the archive built for the query. Only the final top
+        `limit` get full result entries.
+        """
+        limit = plan.limit
+        profile = self.scoring_profile(filters.get("profile"))
+        text_scores = {}
+        if profile.weights["notes"] and (filters.get("text") or filters.get("phrases")):
+            notes = InvertedIndex()
+            for candidate in self.archive.iter_candidates():
+                notes.add(candidate["id"], candidate.get("notes", ""))
+            text_scores = self._text_scores(filters, profile.weights["notes"], notes)
+        scorer = profile.bind(self, filters, matching_jobs, today, text_scores)
+
+        def ranked():
+            for scanned, candidate in enumerate(self.archive.iter_candidates()):
+                if should_cancel is not None and scanned % CANCEL_CHECK_INTERVAL == 0 and should_cancel():
+                    raise SearchCancelled(f"Archive search cancelled after {scanned} candidates")
+                if deadline is not None and scanned % DEADLINE_CHECK_INTERVAL == 0 and deadline.expired():
+                    return
+                plan.stats["archiveScanned"] = scanned + 1
+                if plan.scope is not None and candidate["id"] not in plan.scope:
+                    continue
+                score, _ = scorer(candidate)
+                yield (-score, candidate.get("firstName", ""), candidate["id"]), candidate
+
+        best = heapq.nsmallest(max(limit, 0), ranked(), key=lambda item: item[0])
+        archived = [
+            self._score_candidate(candidate, filters, matching_jobs, today, text_scores, scorer)
+            for _, candidate in best
+        ]
+        merged = results + archived
+        merged.sort(key=lambda x: (-x["score"], x["candidate"].get("firstName", ""), x["id"]))
+        return merged[:limit]
+
+    @staticmethod
+    def _free_text_terms(filters: Dict[str, Any]) -> List[str]:
+        """
+        filters["text"] as notes index terms, without query stop words or words
+        another filter already matches (skills, location): structured filters
+        from clients are not cleaned by parse_query.
+        """
+        claimed = set(tokenize(" ".join(filters.get("skills", []) + [filters.get("location") or ""])))
+        terms = tokenize(" ".join(filters.get("text", [])))
+        return [term for term in dict.fromkeys(terms) if term not in QUERY_STOP_WORDS and term not in claimed]
+
+    def _text_scores(
+        self,
+        filters: Dict[str, Any],
+        points: float = DEFAULT_WEIGHTS["notes"],
+        index: Optional[InvertedIndex] = None,
+    ) -> Dict[int, float]:
+        """
+        BM25 scores of candidate notes (index: the hot tier's notes index by
+        default) for the query's free-text terms and quoted phrases, scaled
+        so the best match earns points.
+        Only the posting lists of the query terms are read.
+        Returns: {candidate_id: points}
+        """
+        if not points:
+            return {}
+        if index is None:
+            index = self.notes_index
+        terms = self._free_text_terms(filters)
+        scores = index.search(terms) if terms else {}
+        for phrase in filters.get("phrases", []):
+            phrase_docs = index.phrase_docs(phrase)
+            for doc_id, score in index.search(phrase).items():
+                if doc_id in phrase_docs:
+                    scores[doc_id] = scores.get(doc_id, 0.0) + score
+        if not scores:
+            return {}
+        best = max(scores.values())
+        return {
+            doc_id: round(points * score / best, 2)
+            for doc_id, score in scores.items()
+        }
+
+    @property
+    def semantic(self) -> SemanticMatcher:
+        """The vector matcher, built on first use and maintained by writes after."""
+        if self._semantic is None:
+            with self._write_lock:
+                if self._semantic is None:
+                    matcher = SemanticMatcher()
+                    matcher.build(self.candidates, self.jobs)
+                    self._semantic = matcher
+        return self._semantic
+
+    def similar_candidates(self, candidate_id: int, k: int = 5) -> Optional[List[Dict[str, Any]]]:
+        """
+        Candidates most like one candidate: weighted Jaccard of normalized
+        skills, then experience and location, among those sharing an LSH band.
+        Returns: [{candidate, id, similarity, sharedSkills, reasons}], or None if not found
+        """
+        with self._write_lock:
+            matches = self.similar.similar(candidate_id, k)
+            if matches is None:
+                return None
+            return [dict(match, candidate=self.candidates_by_id[match["id"]]) for match in matches]
+
+    def semantic_jobs_for_candidate(
+        self, candidate_id: int, limit: int = 5
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Jobs closest to a candidate's skills and notes (TF-IDF cosine).
+        Returns: [{job, jobId, similarity, sharedTerms}], or None if not found
+        """
+        if candidate_id not in self.candidates_by_id:
+            return None
+        matcher = self.semantic
+        with self._write_lock:
+            matches = matcher.jobs_for_candidate(candidate_id, limit)
+            vector = matcher.candidate_index.vectors.get(candidate_id, {})
+            return [
+                {
+                    "job": self.jobs_by_id[job_id],
+                    "jobId": job_id,
+                    "similarity": round(similarity, 4),
+                    "sharedTerms": matcher.shared_terms(vector, matcher.job_index.vectors[job_id]),
+                }
+                for job_id, similarity in matches
+            ]
+
+    def semantic_candidates_for_job(
+        self, job_id: int, limit: int = 5
+    ) -> Optional[List[Dict[str, Any]]]:
         """
-        Save a named shortlist of candidate indices.
+        Candidates closest to a job's title, skills and description (TF-IDF cosine).
+        Returns: [{candidate, id, similarity, sharedTerms}], or None if not found
+        """
+        if job_id not in self.jobs_by_id:
+            return None
+        matcher = self.semantic
+        with self._write_lock:
+            matches = matcher.candidates_for_job(job_id, limit)
+            vector = matcher.job_index.vectors.get(job_id, {})
+            return [
+                {
+                    "candidate": self.candidates_by_id[candidate_id],
+                    "id": candidate_id,
+                    "similarity": round(similarity, 4),
+                    "sharedTerms": matcher.shared_terms(vector, matcher.candidate_index.vectors[candidate_id]),
+                }
+                for candidate_id, similarity in matches
+            ]
+
+    def search_jobs_fulltext(self, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Rank jobs by BM25 over title and description.
+        Returns: [{job, score}]
+        """
+        scores = self.job_text_index.search(tokenize(text))
+        ranked = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        return [
+            {"job": self.jobs_by_id[job_id], "score": round(score, 3)}
+            for job_id, score in ranked
+        ]
+
+    def suggestions_ready(self) -> bool:
+        """Whether suggest() can answer without rebuilding its index."""
+        current = self._suggestions
+        return current is not None and current[0] == self.data_version
+
+    def _suggest_index(self) -> SuggestIndex:
+        """
+        The typeahead vocabulary for the current data version. Only the counts
+        are copied under the write lock; the index is built outside it, and
+        while one request rebuilds it the others answer from the previous one.
+        """
+        current = self._suggestions
+        if current is not None and current[0] == self.data_version:
+            return current[1]
+        if not self._suggest_lock.acquire(blocking=current is None):
+            return current[1]
+        try:
+            current = self._suggestions
+            if current is None or current[0] != self.data_version:
+                with self._write_lock:
+                    version = self.data_version
+                    skill_counts = dict(self.candidate_skill_counts)
+                    job_skills = list(self.job_skill_counts)
+                    location_counts = {key: len(ids) for key, ids in self.candidate_ids_by_location.items()}
+                    titles = [job.get("title", "") for job in self.jobs]
+                index = build_suggestions(
+                    skill_counts,
+                    job_skills,
+                    SKILL_SYNONYMS,
+                    normalize_skill,
+                    lambda key: re.fullmatch(QUERY_SKILLS_PATTERN, key, re.IGNORECASE) is not None,
+                    location_counts,
+                    self.gazetteer.places,
+                    titles,
+                )
+                current = self._suggestions = (version, index)
+            return current[1]
+        finally:
+            self._suggest_lock.release()
+
+    def suggest(self, prefix: str, limit: int = DEFAULT_SUGGESTIONS) -> Dict[str, Any]:
+        """
+        Typeahead for the search box: skills, cities and job titles starting
+        with the end of prefix, most frequent in the data first. "understood"
+        says whether parse_query turns the suggestion into a filter.
+        Returns: {prefix, completes, suggestions: [{text, kind, count, understood, matched}]}
+        """
+        return dict(self._suggest_index().suggest(prefix, limit), prefix=prefix)
+
+    def scoring_profile(self, name: Optional[str] = None) -> ScoringProfile:
+        """A scoring profile by name (None: the default); raises ValueError if unknown."""
+        profile = self.scoring_profiles.get(name or DEFAULT_PROFILE)
+        if profile is None:
+            raise ValueError(f"Unknown scoring profile: {name}")
+        return profile
+
+    def _score_candidate(
+        self,
+        candidate: Dict[str, Any],
+        filters: Dict[str, Any],
+        matching_jobs: List[Dict[str, Any]],
+        today,
+        text_scores: Dict[int, float],
+        scorer: Optional[Scorer] = None,
+    ) -> Dict[str, Any]:
+        """
+        Score one candidate against filters with the filters' scoring profile.
+        Searches pass the scorer they bound once for the query.
+        Returns: {candidate, score, reason, id, recommendedJobs}
+        """
+        if scorer is None:
+            profile = self.scoring_profile(filters.get("profile"))
+            scorer = profile.bind(self, filters, matching_jobs, today, text_scores)
+        score, reasons = scorer(candidate)
+
+        # Always include all candidates, but only show reasons if score > 0
+        if not reasons:
+            reasons.append("Partial or general match")
+        reason_text = ", ".join(reasons) + f" → score {score}"
+        job_recommendations = self._cached_job_recommendations(candidate)
+        return {
+            "candidate": candidate,
+            "score": score,
+            "reason": reason_text,
+            "id": candidate["id"],
+            "recommendedJobs": job_recommendations,
+        }
+
+    def save_shortlist(self, name: str, candidate_ids: List[int]) -> bool:
+        """
+        Save a named shortlist of candidate IDs.
         Returns: success boolean
         """
         try:
-            # Validate indices
-            valid_indices = [
-                i for i in candidate_indices if 0 <= i < len(self.candidates)
-            ]
+            # Validate IDs
+            valid_ids = [i for i in candidate_ids if self.get_candidate(i) is not None]
 
-            if not valid_indices:
-                print("No valid candidate indices provided")
+            if not valid_ids:
+                print("No valid candidate IDs provided")
                 return False
 
-            self.shortlists[name] = valid_indices
-
-            # Save to file
-            shortlists_path = os.path.join(self.data_dir, "shortlists.json")
-            with open(shortlists_path, "w", encoding="utf-8") as f:
-                json.dump(self.shortlists, f, indent=2, ensure_ascii=False)
+            with self._write_lock:
+                self._store_shortlist(name, valid_ids)
+            self._touch()
 
-            print(f"Shortlist '{name}' saved with {len(valid_indices)} candidates")
+            print(f"Shortlist '{name}' saved with {len(valid_ids)} candidates")
             return True
 
         except Exception as e:
             print(f"Error saving shortlist: {e}")
             return False
 
+    def _store_shortlist(self, name: str, candidate_ids: List[int]):
+        """Set a shortlist's ordered IDs and bitmap and persist it (under the write lock)."""
+        self.shortlists[name] = candidate_ids
+        self.shortlist_bitmaps[name] = Bitmap.from_ids(candidate_ids)
+        self.storage.save_shortlist(name, candidate_ids, self.shortlists)
+        self.changes.publish("shortlist", {"name": name, "ids": candidate_ids})
+
+    def shortlist_members(self, name: str) -> Bitmap:
+        """A shortlist's members; raises ValueError if there is no such shortlist."""
+        members = self.shortlist_bitmaps.get(name)
+        if members is None:
+            raise ValueError(f"Shortlist not found: {name}")
+        return members
+
+    def combine_shortlists(
+        self, operation: str, names: List[str], save_as: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Union, intersection, difference (the first minus the others) or
+        symmetric difference of shortlists, optionally saved as a new one.
+        Raises ValueError for an unknown operation or no names.
+        Returns: {operation, shortlists, count, ids, candidates, saved?}, or
+        None if a shortlist is not found
+        """
+        if not names:
+            raise ValueError("shortlists must name at least one shortlist")
+        with self._write_lock:
+            if any(name not in self.shortlist_bitmaps for name in names):
+                return None
+            members = combine(operation, [self.shortlist_bitmaps[name] for name in names])
+            ids = members.to_list()
+            result = {
+                "operation": operation,
+                "shortlists": names,
+                "count": len(ids),
+                "ids": ids,
+                "candidates": [c for c in map(self.get_candidate, ids) if c is not None],
+            }
+        if save_as:
+            result["saved"] = self.save_shortlist(save_as, ids)
+        return result
+
     def draft_email(
         self,
         recipients: List[Dict],
@@ -599,39 +1974,39 @@ P.S. Feel free to connect with me on LinkedIn if you'd like to stay in touch abo
 
         return html_template
 
-    def analytics_summary(self) -> Dict[str, Any]:
+    def analytics_summary(
+        self,
+        location: Optional[str] = None,
+        stage: Optional[str] = None,
+        skill: Optional[str] = None,
+        experience: Optional[Any] = None,
+    ) -> Dict[str, Any]:
         """
         Generate analytics summary of candidates and jobs.
+        With any filter (location, stage, skill, experience band or years),
+        the slice is read off the analytics cube instead (see cube.py);
+        raises ValueError on an unknown experience band. Stage counts and
+        slices include archived candidates (the cube holds both tiers).
         Returns: {countByStage, topSkills, jobStats, skillDemand}
         """
-        # Count candidates by recruitment stage
-        stages = [candidate.get("stage", "Unknown") for candidate in self.candidates]
-        count_by_stage = dict(Counter(stages))
-
-        # Count all skills across candidates
-        all_candidate_skills = []
-        for candidate in self.candidates:
-            skills = candidate.get("skills", [])
-            all_candidate_skills.extend(skills)
-
-        # Get top skills with counts
-        skill_counter = Counter(all_candidate_skills)
-        top_skills = skill_counter.most_common(10)
-
-        # Job analytics
-        job_locations = [job.get("location", "Unknown") for job in self.jobs]
-        job_location_counts = dict(Counter(job_locations))
-
-        # Skills demand from jobs
-        job_skills_demand = []
-        for job in self.jobs:
-            job_skills_demand.extend(job.get("skillsRequired", []))
-
-        skills_demand = dict(Counter(job_skills_demand).most_common(10))
+        if any(value not in (None, "") for value in (location, stage, skill, experience)):
+            with self._write_lock:
+                return self.cube.slice(location, stage, skill and self._normalize_skill(skill), experience)
+
+        # Maintained incrementally on every write (see _index_candidate, _index_job);
+        # copied under the lock since writers delete keys, summarized outside it
+        with self._write_lock:
+            count_by_stage = self._stage_counts()
+            candidate_skill_counts = Counter(self.candidate_skill_counts)
+            job_skill_counts = Counter(self.job_skill_counts)
+            job_location_counts = dict(self.job_location_counts)
+            total_jobs = len(self.jobs)
+        top_skills = candidate_skill_counts.most_common(10)
+        skills_demand = dict(job_skill_counts.most_common(10))
 
         # Skills gap analysis (skills in demand vs candidate skills)
-        candidate_skill_set = set(all_candidate_skills)
-        demand_skill_set = set(job_skills_demand)
+        candidate_skill_set = set(candidate_skill_counts)
+        demand_skill_set = set(job_skill_counts)
 
         skills_gap = list(demand_skill_set - candidate_skill_set)
         skills_surplus = list(candidate_skill_set - demand_skill_set)
@@ -640,7 +2015,7 @@ P.S. Feel free to connect with me on LinkedIn if you'd like to stay in touch abo
             "countByStage": count_by_stage,
             "topSkills": top_skills,
             "jobStats": {
-                "totalJobs": len(self.jobs),
+                "totalJobs": total_jobs,
                 "locationBreakdown": job_location_counts,
                 "skillsDemand": skills_demand,
             },
@@ -660,49 +2035,60 @@ P.S. Feel free to connect with me on LinkedIn if you'd like to stay in touch abo
         if shortlist_name not in self.shortlists:
             return []
 
-        indices = self.shortlists[shortlist_name]
-        return [self.candidates[i] for i in indices if 0 <= i < len(self.candidates)]
+        candidate_ids = self.shortlists[shortlist_name]
+        return [c for c in map(self.get_candidate, candidate_ids) if c is not None]
 
-    def _find_matching_jobs(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def iter_shortlist_candidates(self, shortlist_name: str) -> Iterator[Dict[str, Any]]:
         """
-        Find jobs that match the search criteria.
-        Returns: list of matching job objects
+        Yield a shortlist's candidates one at a time (exports), skipping any
+        deleted meanwhile. The ID list is copied first, so later edits to the
+        shortlist do not affect a running export.
         """
-        matching_jobs = []
+        for candidate_id in list(self.shortlists.get(shortlist_name, [])):
+            candidate = self.get_candidate(candidate_id)
+            if candidate is not None:
+                yield candidate
 
-        for job in self.jobs:
-            job_matches = True
-
-            # Check location match
-            if "location" in filters:
-                job_location = job.get("location", "").lower()
-                filter_location = filters["location"].lower()
-                if job_location != filter_location:
-                    job_matches = False
-
-            # Check skills overlap
-            if "skills" in filters and filters["skills"]:
-                job_skills = [skill.lower() for skill in job.get("skillsRequired", [])]
-                filter_skills = [skill.lower() for skill in filters["skills"]]
-
-                # At least one skill should match
-                skill_overlap = any(
-                    any(
-                        filter_skill == job_skill
-                        or filter_skill in job_skill
-                        or job_skill in filter_skill
-                        for job_skill in job_skills
-                    )
-                    for filter_skill in filter_skills
-                )
-
-                if not skill_overlap:
-                    job_matches = False
-
-            if job_matches:
-                matching_jobs.append(job)
+    def _find_matching_jobs(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Jobs in the filters' location (or within radiusKm of it) requiring at
+        least one filter skill, read from the job index postings.
+        Returns: list of matching job objects, in catalogue order
+        """
+        with self._write_lock:
+            job_ids = self.job_index.matching_ids(filters)
+            if job_ids is None:
+                return list(self.jobs)
+            positions = self._job_positions
+            return [self.jobs[positions[job_id]] for job_id in sorted(job_ids, key=positions.__getitem__)]
+
+    def search_jobs(
+        self, filters: Dict[str, Any], offset: Any = 0, limit: Any = None
+    ) -> Dict[str, Any]:
+        """
+        Search the job catalogue with parsed query filters (skills,
+        location/radiusKm, role and free text), ranked best first.
+        limit defaults to the filters' limit; ValueError for a bad page.
+        Returns: {total, offset, limit, results: [{job, score, reason}]}
+        """
+        if limit is None:
+            limit = filters.get("limit", DEFAULT_PAGE_SIZE)
+        offset, limit = page_bounds(offset, limit)
+        with self._write_lock:
+            return self.job_index.search(filters, self.jobs_by_id, offset, limit)
 
-        return matching_jobs
+    def _cached_job_recommendations(self, candidate: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Job recommendations for an indexed candidate, cached until the
+        candidate or any job changes (job writes just bump _jobs_version).
+        """
+        jobs_version = self._jobs_version
+        cached = self._recommendations.get(candidate["id"])
+        if cached is not None and cached[0] == jobs_version and cached[1] is candidate:
+            return cached[2]
+        recommendations = self._get_job_recommendations(candidate)
+        self._recommendations[candidate["id"]] = (jobs_version, candidate, recommendations)
+        return recommendations
 
     def _get_job_recommendations(
         self, candidate: Dict[str, Any]
@@ -744,14 +2130,15 @@ P.S. Feel free to connect with me on LinkedIn if you'd like to stay in touch abo
                 recommendations.append(
                     {
                         "job": job,
+                        "jobId": job["id"],
                         "matchScore": match_score,
                         "matchedSkills": matched_skills,
                         "locationMatch": job_location == candidate_location,
                     }
                 )
 
-        # Sort by match score descending
-        recommendations.sort(key=lambda x: -x["matchScore"])
+        # Sort by match score descending (ties by job ID)
+        recommendations.sort(key=lambda x: (-x["matchScore"], x["jobId"]))
         return recommendations[:3]  # Top 3 recommendations
 
 
@@ -760,10 +2147,10 @@ _backend = None
 
 
 def get_backend() -> HRBackend:
-    """Get singleton backend instance."""
+    """Get singleton backend instance (engine from HR_AGENT_STORAGE, default json)."""
     global _backend
     if _backend is None:
-        _backend = HRBackend()
+        _backend = HRBackend(storage=os.environ.get("HR_AGENT_STORAGE", "json"))
     return _backend
 
 
@@ -772,12 +2159,14 @@ def parse_query(text: str) -> Dict[str, Any]:
     return get_backend().parse_query(text)
 
 
-def search_candidates(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-    return get_backend().search_candidates(filters)
+def search_candidates(
+    filters: Dict[str, Any], should_cancel: Optional[Callable[[], bool]] = None
+) -> List[Dict[str, Any]]:
+    return get_backend().search_candidates(filters, should_cancel)
 
 
-def save_shortlist(name: str, candidate_indices: List[int]) -> bool:
-    return get_backend().save_shortlist(name, candidate_indices)
+def save_shortlist(name: str, candidate_ids: List[int]) -> bool:
+    return get_backend().save_shortlist(name, candidate_ids)
 
 
 def draft_email(
@@ -792,8 +2181,8 @@ def html_template(email: Dict[str, str]) -> str:
     return get_backend().html_template(email)
 
 
-def analytics_summary() -> Dict[str, Any]:
-    return get_backend().analytics_summary()
+def analytics_summary(**filters) -> Dict[str, Any]:
+    return get_backend().analytics_summary(**filters)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Response Benchmark - Bytes and time for read endpoints: plain jsonify vs
+compressed vs 304 revalidation. Uses a synthetic pool built from data/.
+Usage: python bench_responses.py [candidate_count]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import backend
+from api_server import app
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+RUNS = 20
+
+
+def build_dataset(target_dir, count):
+    """Write a synthetic data dir with count candidates cloned from data/."""
+    with open(os.path.join(DATA_DIR, "candidates.json"), encoding="utf-8") as f:
+        base = json.load(f)
+    with open(os.path.join(DATA_DIR, "jobs.json"), encoding="utf-8") as f:
+        jobs = json.load(f)
+
+    candidates = []
+    for i in range(count):
+        candidate = dict(base[i % len(base)])
+        candidate["email"] = f"{i}.{candidate['email']}"
+        candidates.append(candidate)
+    shortlists = {f"List {n}": list(range(n, count, 7))[:200] for n in range(20)}
+
+    for name, payload in (
+        ("candidates.json", candidates),
+        ("jobs.json", jobs),
+        ("shortlists.json", shortlists),
+    ):
+        with open(os.path.join(target_dir, name), "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+
+
+def measure(client, method, url, body=None, headers=None):
+    """Return (median seconds, response bytes, status) over RUNS requests."""
+    timings = []
+    response = None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        if method == "GET":
+            response = client.get(url, headers=headers or {})
+        else:
+            response = client.post(url, json=body, headers=headers or {})
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2], len(response.data), response.status_code
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    client = app.test_client()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_dataset(tmp, count)
+        backend._backend = backend.HRBackend(tmp)
+
+        cases = [
+            ("GET /api/analytics", "GET", "/api/analytics", None),
+            ("GET /api/shortlists", "GET", "/api/shortlists", None),
+            ("POST /api/search", "POST", "/api/search", {"query": "top 50 react developers in casablanca"}),
+        ]
+
+        print(f"Synthetic pool: {count} candidates, median of {RUNS} runs\n")
+        print(f"{'endpoint':<22}{'mode':<12}{'bytes':>10}{'ms':>10}{'status':>8}")
+        for label, method, url, body in cases:
+            plain_time, plain_bytes, status = measure(client, method, url, body)
+            etag = (
+                client.get(url) if method == "GET" else client.post(url, json=body)
+            ).headers["ETag"]
+            modes = [
+                ("identity", plain_time, plain_bytes, status),
+                ("gzip",) + measure(client, method, url, body, {"Accept-Encoding": "gzip"}),
+                ("deflate",) + measure(client, method, url, body, {"Accept-Encoding": "deflate"}),
+                ("304",) + measure(client, method, url, body, {"If-None-Match": etag}),
+            ]
+            for mode, seconds, size, code in modes:
+                print(f"{label:<22}{mode:<12}{size:>10}{seconds * 1000:>10.2f}{code:>8}")
+            print()
+
+
+if __name__ == "__main__":
+    main()
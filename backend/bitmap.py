@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+HR Agent Bitmap - Candidate ID sets as int bitsets
+Candidate IDs are small dense integers, so a set of them fits in one
+arbitrary-precision int with bit i set for ID i: union, intersection and
+difference are single C-level int operations, however large the sets.
+Pure Python 3 standard library implementation
+"""
+
+from typing import Iterable, Iterator, List
+
+SET_OPERATIONS = ("union", "intersection", "difference", "symmetric_difference")
+
+
+class Bitmap:
+    """An immutable set of non-negative ints stored as the bits of an int."""
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int = 0):
+        self.bits = bits
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> "Bitmap":
+        # Set bits in a byte buffer: OR-ing into a growing int would copy it per ID
+        buffer = bytearray()
+        for value in ids:
+            if value < 0:
+                raise ValueError(f"Bitmap members must be >= 0, got {value}")
+            byte = value >> 3
+            if byte >= len(buffer):
+                buffer.extend(bytes(byte + 1 - len(buffer)))
+            buffer[byte] |= 1 << (value & 7)
+        return cls(int.from_bytes(bytes(buffer), "little"))
+
+    def __contains__(self, value: int) -> bool:
+        return value >= 0 and (self.bits >> value) & 1 == 1
+
+    def __len__(self) -> int:
+        return bin(self.bits).count("1")
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __iter__(self) -> Iterator[int]:
+        """Members in ascending order."""
+        # Scan the binary digits lowest first (str.find runs in C)
+        digits = bin(self.bits)[:1:-1]
+        position = digits.find("1")
+        while position != -1:
+            yield position
+            position = digits.find("1", position + 1)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Bitmap) and self.bits == other.bits
+
+    def __hash__(self) -> int:
+        return hash(self.bits)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap(self.bits | other.bits)
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap(self.bits & other.bits)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap(self.bits & ~other.bits)
+
+    def __xor__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap(self.bits ^ other.bits)
+
+    def to_list(self) -> List[int]:
+        return list(self)
+
+    def __repr__(self) -> str:
+        return f"Bitmap({self.to_list()})"
+
+
+def combine(operation: str, bitmaps: List[Bitmap]) -> Bitmap:
+    """
+    Fold bitmaps left to right with a set operation (difference: the first
+    minus all the others). Raises ValueError for an unknown operation.
+    """
+    if operation not in SET_OPERATIONS:
+        raise ValueError(f"Unknown set operation: {operation} (expected one of {', '.join(SET_OPERATIONS)})")
+    if not bitmaps:
+        return Bitmap()
+    result = bitmaps[0]
+    for bitmap in bitmaps[1:]:
+        if operation == "union":
+            result = result | bitmap
+        elif operation == "intersection":
+            result = result & bitmap
+        elif operation == "difference":
+            result = result - bitmap
+        else:
+            result = result ^ bitmap
+    return result
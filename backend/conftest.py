@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Shared test fixtures - Scratch data directory copy, asyncio API server, synthetic planner backend
+"""
+
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+from datetime import datetime, timedelta
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from async_server import AsyncAPIServer
+from backend import HRBackend
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Queries exercising each planner access path, checked against full scans
+PLANNER_QUERIES = [
+    "React developer in Casablanca",
+    "Python Django 3 years",
+    "top 10 SQL developers in Rabat available now",
+    "Full stack Node.js next 2 months",
+    "developer",
+    "first 1 candidates in tangier",
+    "bootcamp",
+    "top 40 go developers 1-2 years",
+]
+
+
+def _synthetic_backend(size=1500, blanks=True):
+    """A backend over size random candidates (sample data jobs, no search cache)."""
+    hr_backend = HRBackend(DATA_DIR, search_cache_size=0)
+    rnd = random.Random(11)
+    # Blank skills and locations partially match every filter
+    blank = [""] if blanks else []
+    skills = sorted({s for c in hr_backend.candidates for s in c["skills"]}) + ["Go", "Rust"] + blank
+    locations = ["Casablanca", "Rabat", "Fez", "Tangier", "Casa"] + blank
+    today = datetime.now().date()
+    hr_backend.candidates = [
+        {
+            "id": i,
+            "firstName": rnd.choice(["Amina", "Omar", "Sara", "Youssef", "Zineb"]),
+            "lastName": "Test",
+            "email": f"candidate{i}@email.com",
+            "location": rnd.choice(locations),
+            "experienceYears": rnd.randint(0, 12),
+            "skills": rnd.sample(skills, rnd.randint(0, 4)),
+            "availabilityDate": rnd.choice(
+                ["", (today + timedelta(days=rnd.randint(-30, 200))).isoformat()]
+            ),
+            "stage": "Applied",
+            "notes": rnd.choice(["completed bootcamp", "cloud experience", ""]),
+        }
+        for i in range(size)
+    ]
+    hr_backend._build_indexes()
+    return hr_backend
+
+
+@pytest.fixture
+def planner_queries():
+    return list(PLANNER_QUERIES)
+
+
+@pytest.fixture
+def synthetic_backend():
+    """Factory: synthetic_backend(size=1500, blanks=True) -> HRBackend."""
+    return _synthetic_backend
+
+
+@pytest.fixture
+def data_dir(tmp_path) -> str:
+    """A copy of data/ (candidates, jobs, shortlists) that the test may write to."""
+    path = tmp_path / "data"
+    path.mkdir()
+    for name in ("candidates.json", "jobs.json", "shortlists.json"):
+        shutil.copy(os.path.join(DATA_DIR, name), path)
+    return str(path)
+
+
+class AsyncAPI:
+    """Runs scenarios against an AsyncAPIServer listening on a free local port."""
+
+    def run(self, backend, scenario, **options):
+        """Serve backend and await scenario(server, port); options go to AsyncAPIServer."""
+        return asyncio.run(self._serve(backend, scenario, **options))
+
+    async def _serve(self, backend, scenario, **options):
+        server = AsyncAPIServer(backend, search_workers=1, **options)
+        listener = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            return await scenario(server, port)
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            server.close()
+
+    async def request(self, port, method, path, body=None, headers=None):
+        """One HTTP/1.1 request; returns (status, lowercase headers, raw body)."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        payload = json.dumps(body).encode() if body is not None else b""
+        head = f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\nContent-Length: {len(payload)}\r\n"
+        for name, value in (headers or {}).items():
+            head += f"{name}: {value}\r\n"
+        writer.write(head.encode() + b"\r\n" + payload)
+        await writer.drain()
+        raw = await reader.read()
+        writer.close()
+        head, _, body = raw.partition(b"\r\n\r\n")
+        lines = head.decode().split("\r\n")
+        status = int(lines[0].split()[1])
+        response_headers = {
+            line.split(":", 1)[0].lower(): line.split(":", 1)[1].strip() for line in lines[1:]
+        }
+        return status, response_headers, body
+
+
+@pytest.fixture
+def api() -> AsyncAPI:
+    return AsyncAPI()
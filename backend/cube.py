@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+HR Agent Cube - Precomputed analytics counts for slice-and-dice queries
+Candidates are counted over every roll-up of (location, stage, experience
+band), each cell also holding its skill counts; jobs over location, each
+with skill counts. A slice is then a few dictionary lookups, whatever the
+pool size, and writes update the cells of one record.
+Pure Python 3 standard library implementation
+"""
+
+import heapq
+import itertools
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Experience bands: (label, lowest years, highest years or None)
+EXPERIENCE_BANDS = [("0-1", 0, 1), ("2-4", 2, 4), ("5-9", 5, 9), ("10+", 10, None)]
+
+# Query parameters of a filtered /api/analytics request
+ANALYTICS_FILTERS = ["location", "stage", "skill", "experience"]
+
+# Skills listed in topSkills / skillsDemand / gap / surplus
+TOP_SKILLS = 10
+TOP_ANALYSIS = 5
+
+
+def experience_band(years: int) -> str:
+    for label, low, high in EXPERIENCE_BANDS:
+        if years >= low and (high is None or years <= high):
+            return label
+    return EXPERIENCE_BANDS[0][0]
+
+
+def resolve_band(value: Any) -> str:
+    """A band label ("2-4") or a number of years; raises ValueError otherwise."""
+    labels = [label for label, _, _ in EXPERIENCE_BANDS]
+    if value in labels:
+        return value
+    try:
+        return experience_band(int(value))
+    except (TypeError, ValueError):
+        raise ValueError(f"experience must be one of {', '.join(labels)} or a number of years")
+
+
+def _top(counts: Counter, n: int) -> List[Tuple[str, int]]:
+    """The n largest counts, ties broken by name so slices are stable."""
+    return heapq.nsmallest(n, counts.items(), key=lambda item: (-item[1], item[0]))
+
+
+class _Cell:
+    __slots__ = ("count", "skills")
+
+    def __init__(self):
+        self.count = 0
+        self.skills = Counter()
+
+
+class AnalyticsCube:
+    """
+    Candidate cells keyed by (location, stage, band), where None stands for
+    "any" (8 cells per candidate), and job cells keyed by location or None.
+    Location and stage keys are lowercase; display spellings are kept apart.
+    """
+
+    def __init__(self):
+        self.candidate_cells = {}
+        self.job_cells = {}
+        # Every value seen per candidate dimension (location, stage, band)
+        self.dimension_values = [set(), set(), set()]
+        # lowercase key -> spelling shown in results
+        self.names = {}
+        # lowercase skill -> spelling stored on records
+        self.skill_names = {}
+
+    def _key(self, value: str) -> str:
+        key = (value or "").strip().lower()
+        self.names.setdefault(key, (value or "").strip())
+        return key
+
+    @staticmethod
+    def _rollups(key: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+        """The key with every subset of its parts replaced by None."""
+        choices = [(part, None) for part in key]
+        return list(itertools.product(*choices))
+
+    @staticmethod
+    def _update(cells: Dict[Any, _Cell], key: Any, skills: List[str], delta: int):
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = _Cell()
+        cell.count += delta
+        for skill in skills:
+            cell.skills[skill] += delta
+            if cell.skills[skill] <= 0:
+                del cell.skills[skill]
+        if cell.count <= 0:
+            del cells[key]
+
+    def _candidate(self, candidate: Dict[str, Any], delta: int):
+        key = (
+            self._key(candidate.get("location", "")),
+            self._key(candidate.get("stage", "Unknown")),
+            experience_band(candidate.get("experienceYears", 0)),
+        )
+        skills = list(dict.fromkeys(candidate.get("skills", [])))
+        for skill in skills:
+            self.skill_names.setdefault(skill.lower(), skill)
+        for values, value in zip(self.dimension_values, key):
+            values.add(value)
+        for rollup in self._rollups(key):
+            self._update(self.candidate_cells, rollup, skills, delta)
+
+    def add_candidate(self, candidate: Dict[str, Any]):
+        self._candidate(candidate, 1)
+
+    def remove_candidate(self, candidate: Dict[str, Any]):
+        self._candidate(candidate, -1)
+
+    def _job(self, job: Dict[str, Any], delta: int):
+        skills = list(dict.fromkeys(job.get("skillsRequired", [])))
+        for key in (self._key(job.get("location", "")), None):
+            self._update(self.job_cells, key, skills, delta)
+
+    def add_job(self, job: Dict[str, Any]):
+        self._job(job, 1)
+
+    def remove_job(self, job: Dict[str, Any]):
+        self._job(job, -1)
+
+    def _values(self, position: int) -> List[Any]:
+        """Distinct values of one candidate dimension, from its one-dimension cells."""
+        values = []
+        for value in self.dimension_values[position]:
+            key = tuple(value if i == position else None for i in range(3))
+            if key in self.candidate_cells:
+                values.append(value)
+        return sorted(values)
+
+    def slice(
+        self,
+        location: Optional[str] = None,
+        stage: Optional[str] = None,
+        skill: Optional[str] = None,
+        experience: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """
+        Counts for the candidates matching every given dimension, with
+        breakdowns by the others, and skill demand / gap / surplus against
+        the jobs in the same location. Raises ValueError on a bad band.
+        """
+        location_key = location.strip().lower() if location else None
+        stage_key = stage.strip().lower() if stage else None
+        band = resolve_band(experience) if experience not in (None, "") else None
+        if skill:
+            skill = self.skill_names.get(skill.strip().lower(), skill.strip())
+        key = (location_key, stage_key, band)
+
+        def count(cell_key: Tuple[Any, ...]) -> int:
+            cell = self.candidate_cells.get(cell_key)
+            if cell is None:
+                return 0
+            return cell.skills.get(skill, 0) if skill else cell.count
+
+        def breakdown(position: int) -> Dict[str, int]:
+            counts = {}
+            values = [key[position]] if key[position] is not None else self._values(position)
+            for value in values:
+                cell_key = key[:position] + (value,) + key[position + 1:]
+                total = count(cell_key)
+                if total:
+                    counts[self.names.get(value, value)] = total
+            return counts
+
+        cell = self.candidate_cells.get(key) or _Cell()
+        supply = Counter({skill: cell.skills[skill]}) if skill and skill in cell.skills else (
+            Counter() if skill else cell.skills
+        )
+        job_cell = self.job_cells.get(location_key) or _Cell()
+        demand = job_cell.skills
+        gap = sorted(
+            (s for s in demand if demand[s] > supply.get(s, 0)),
+            key=lambda s: (supply.get(s, 0) - demand[s], s),
+        )
+        surplus = sorted((s for s in supply if s not in demand), key=lambda s: (-supply[s], s))
+
+        return {
+            "slice": {
+                "location": location,
+                "stage": stage,
+                "skill": skill,
+                "experience": band,
+            },
+            "candidates": count(key),
+            "countByLocation": breakdown(0),
+            "countByStage": breakdown(1),
+            "countByExperience": breakdown(2),
+            "topSkills": _top(supply, TOP_SKILLS),
+            "jobStats": {
+                "totalJobs": job_cell.count,
+                "skillsDemand": dict(_top(demand, TOP_SKILLS)),
+            },
+            "skillsAnalysis": {
+                "inDemand": [s for s, _ in _top(demand, TOP_ANALYSIS)],
+                "gap": [
+                    {"skill": s, "demand": demand[s], "supply": supply.get(s, 0)}
+                    for s in gap[:TOP_ANALYSIS]
+                ],
+                "surplus": [{"skill": s, "supply": supply[s]} for s in surplus[:TOP_ANALYSIS]],
+            },
+        }
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+HR Agent Dedup - Duplicate candidate detection by blocking and MinHash LSH
+Candidates are only compared with others sharing a block: the same
+normalized email or phone, the same name skeleton, or a MinHash LSH band of
+their name, skills and notes. This keeps detection near-linear, where
+comparing every pair would be quadratic.
+Pure Python 3 standard library implementation (NumPy used when installed)
+"""
+
+import copy
+import functools
+import hashlib
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from fulltext import tokenize
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional speedup
+    numpy = None
+
+# MinHash signature layout: BANDS bands of ROWS hashes (LSH on the bands)
+MINHASH_BANDS = 8
+MINHASH_ROWS = 8
+
+# Blocks larger than this (very common names or skill sets) are not
+# compared pairwise; exact email/phone blocks are always compared
+MAX_BLOCK_SIZE = 200
+
+# Pairs scoring at least this are treated as the same person
+DUPLICATE_THRESHOLD = 0.75
+
+_MINHASH_MASKS = [
+    int.from_bytes(hashlib.blake2b(f"minhash-{i}".encode(), digest_size=8).digest(), "big")
+    for i in range(MINHASH_BANDS * MINHASH_ROWS)
+]
+_NUMPY_MASKS = numpy.array(_MINHASH_MASKS, dtype=numpy.uint64) if numpy is not None else None
+
+
+def normalize_email(email: str) -> str:
+    """Lowercase, trim, and drop a +tag from the local part."""
+    email = (email or "").strip().lower()
+    local, _, domain = email.partition("@")
+    if not domain:
+        return email
+    return f"{local.split('+', 1)[0]}@{domain}"
+
+
+def normalize_phone(phone: str) -> str:
+    """Digits only, last 9 (drops country codes and trunk prefixes)."""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-9:] if len(digits) >= 7 else ""
+
+
+def fold_name(name: str) -> str:
+    """Lowercase ASCII letters and spaces only ("El-Amrani" -> "el amrani")."""
+    ascii_name = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode()
+    return " ".join(re.sub(r"[^a-z]+", " ", ascii_name.lower()).split())
+
+
+def name_skeleton(name: str) -> str:
+    """
+    Crude phonetic key: each word keeps its first letter and its consonants,
+    with repeats collapsed, so "Youssef" and "Yousef" share "ysf".
+    """
+    words = []
+    for word in fold_name(name).split():
+        skeleton = word[0] + re.sub(r"[aeiouy]", "", word[1:])
+        words.append(re.sub(r"(.)\1+", r"\1", skeleton))
+    return " ".join(sorted(words))
+
+
+def _grams(text: str, size: int = 3) -> Set[str]:
+    text = f" {text} "
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(tokens: Iterable[str]) -> Tuple[int, ...]:
+    """MinHash signature (one 64-bit hash per token, XOR-permuted per row)."""
+    hashes = [_hash64(token) for token in set(tokens)]
+    if not hashes:
+        return ()
+    if numpy is not None:
+        rows = numpy.bitwise_xor.outer(numpy.array(hashes, dtype=numpy.uint64), _NUMPY_MASKS)
+        return tuple(rows.min(axis=0).tolist())
+    return tuple(min(map(mask.__xor__, hashes)) for mask in _MINHASH_MASKS)
+
+
+def jaccard(a: Set[Any], b: Set[Any]) -> float:
+    if not a and not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class Profile:
+    """The normalized parts of a candidate used for blocking and comparison."""
+
+    __slots__ = ("id", "email", "phone", "name", "name_grams", "skills", "notes", "signature")
+
+    def __init__(self, candidate: Dict[str, Any]):
+        self.id = candidate.get("id")
+        self.email = normalize_email(candidate.get("email", ""))
+        self.phone = normalize_phone(candidate.get("phone", ""))
+        self.name = fold_name(f"{candidate.get('firstName', '')} {candidate.get('lastName', '')}")
+        self.name_grams = _grams(self.name)
+        self.skills = {skill.strip().lower() for skill in candidate.get("skills", []) if skill.strip()}
+        self.notes = set(tokenize(candidate.get("notes", "")))
+        self.signature = minhash(
+            [f"n:{g}" for g in self.name_grams]
+            + [f"s:{s}" for s in self.skills]
+            + [f"t:{t}" for t in self.notes]
+        )
+
+    def block_keys(self) -> List[Tuple[str, Any]]:
+        keys = []
+        if self.email:
+            keys.append(("email", self.email))
+        if self.phone:
+            keys.append(("phone", self.phone))
+        if self.name:
+            keys.append(("name", name_skeleton(self.name)))
+        for band in range(MINHASH_BANDS if self.signature else 0):
+            rows = self.signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]
+            keys.append(("band", (band, hash(rows))))
+        return keys
+
+
+def compare(a: Profile, b: Profile) -> Tuple[float, List[str]]:
+    """
+    Similarity of two profiles in [0, 1] with the reasons behind it.
+    Names weigh most; skills and notes separate namesakes.
+    """
+    if a.email and a.email == b.email:
+        return 1.0, ["same email"]
+    name = jaccard(a.name_grams, b.name_grams)
+    skills = jaccard(a.skills, b.skills)
+    notes = jaccard(a.notes, b.notes)
+    score = 0.6 * name + 0.25 * skills + 0.15 * notes
+    reasons = [f"name {name:.2f}", f"skills {skills:.2f}", f"notes {notes:.2f}"]
+    if a.phone and a.phone == b.phone:
+        score = max(score, 0.5 + 0.5 * name)
+        reasons.insert(0, "same phone")
+    return round(score, 4), reasons
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item: int) -> int:
+        parent = self.parent.setdefault(item, item)
+        if parent != item:
+            parent = self.parent[item] = self.find(parent)
+        return parent
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # Lowest ID becomes the root (and the suggested survivor)
+            if root_b < root_a:
+                root_a, root_b = root_b, root_a
+            self.parent[root_b] = root_a
+
+
+class DuplicateDetector:
+    """Block index over candidate profiles, maintained one record at a time."""
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD, max_block_size: int = MAX_BLOCK_SIZE):
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+        self.profiles = {}
+        self.blocks = {}
+        # The last profile built, so add() after matches() for the same
+        # record (the ingestion check) does not hash it twice
+        self._last = (None, None)
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def _profile(self, candidate: Dict[str, Any]) -> Profile:
+        content = {key: value for key, value in candidate.items() if key != "id"}
+        last_content, profile = self._last
+        if content != last_content:
+            profile = Profile(candidate)
+            self._last = (content, profile)
+        elif profile.id != candidate.get("id"):
+            profile = copy.copy(profile)
+            profile.id = candidate.get("id")
+        return profile
+
+    def add(self, candidate: Dict[str, Any]):
+        self.remove(candidate["id"])
+        profile = self._profile(candidate)
+        self.profiles[profile.id] = profile
+        for key in profile.block_keys():
+            self.blocks.setdefault(key, set()).add(profile.id)
+
+    def remove(self, candidate_id: int):
+        profile = self.profiles.pop(candidate_id, None)
+        if profile is None:
+            return
+        for key in profile.block_keys():
+            block = self.blocks.get(key)
+            if block is not None:
+                block.discard(candidate_id)
+                if not block:
+                    del self.blocks[key]
+
+    def snapshot(self) -> "DuplicateDetector":
+        """
+        A copy that later add()/remove() calls do not change. Profiles are
+        replaced rather than mutated, so only the containers are copied.
+        """
+        copied = DuplicateDetector(self.threshold, self.max_block_size)
+        copied.profiles = dict(self.profiles)
+        copied.blocks = {key: set(block) for key, block in self.blocks.items()}
+        return copied
+
+    def _comparable(self, key: Tuple[str, Any], block: Set[int]) -> bool:
+        return key[0] in ("email", "phone") or len(block) <= self.max_block_size
+
+    def matches(self, candidate: Dict[str, Any], limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Likely duplicates of a candidate (indexed or not), best first.
+        Returns: [{id, score, reasons}]
+        """
+        profile = self._profile(candidate)
+        others = set()
+        for key in profile.block_keys():
+            block = self.blocks.get(key, ())
+            if block and self._comparable(key, block):
+                others.update(block)
+        others.discard(profile.id)
+        found = []
+        for other_id in others:
+            score, reasons = compare(profile, self.profiles[other_id])
+            if score >= self.threshold:
+                found.append({"id": other_id, "score": score, "reasons": reasons})
+        found.sort(key=lambda match: (-match["score"], match["id"]))
+        return found[:limit]
+
+    def clusters(self) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """
+        Group likely duplicates across the whole index, comparing only within
+        blocks. Returns: ([{ids, survivorId, pairs: [{a, b, score, reasons}]}], stats)
+        """
+        union = _UnionFind()
+        pairs = {}
+        stats = {"blocks": 0, "skippedBlocks": 0, "comparisons": 0}
+        for key, block in self.blocks.items():
+            if len(block) < 2:
+                continue
+            if not self._comparable(key, block):
+                stats["skippedBlocks"] += 1
+                continue
+            stats["blocks"] += 1
+            members = sorted(block)
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    if (a, b) in pairs:
+                        continue
+                    stats["comparisons"] += 1
+                    score, reasons = compare(self.profiles[a], self.profiles[b])
+                    pairs[(a, b)] = (score, reasons)
+                    if score >= self.threshold:
+                        union.union(a, b)
+
+        groups = {}
+        for (a, b), (score, reasons) in pairs.items():
+            if score < self.threshold:
+                continue
+            root = union.find(a)
+            group = groups.setdefault(root, {"ids": set(), "pairs": []})
+            group["ids"].update((a, b))
+            group["pairs"].append({"a": a, "b": b, "score": score, "reasons": reasons})
+        clusters = [
+            {"ids": sorted(group["ids"]), "survivorId": root, "pairs": group["pairs"]}
+            for root, group in sorted(groups.items())
+        ]
+        stats["clusters"] = len(clusters)
+        return clusters, stats
+
+
+def find_duplicate_clusters(
+    candidates: Iterable[Dict[str, Any]], threshold: float = DUPLICATE_THRESHOLD
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Cluster likely duplicates in a batch of records (each needs an "id")."""
+    detector = DuplicateDetector(threshold)
+    for candidate in candidates:
+        detector.add(candidate)
+    return detector.clusters()
+
+
+def merge_records(survivor: Dict[str, Any], others: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine duplicate records into the survivor: skills are unioned (order
+    kept), notes concatenated, experience is the maximum, and empty fields
+    are filled from the other records. Identity fields stay the survivor's.
+    """
+    merged = dict(survivor)
+    for other in others:
+        for field, value in other.items():
+            if field == "id":
+                continue
+            if field == "skills":
+                seen = {skill.lower() for skill in merged.get("skills", [])}
+                merged["skills"] = list(merged.get("skills", [])) + [
+                    skill for skill in value if skill.lower() not in seen and not seen.add(skill.lower())
+                ]
+            elif field == "notes":
+                if value and value not in merged.get("notes", ""):
+                    merged["notes"] = "; ".join(filter(None, [merged.get("notes", ""), value]))
+            elif field == "experienceYears":
+                merged[field] = max(merged.get(field, 0), value or 0)
+            elif not merged.get(field) and value:
+                merged[field] = value
+    return merged
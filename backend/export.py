@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+HR Agent Export - Streaming CSV and XLSX export of candidates
+Rows come from a generator and are encoded a few hundred at a time, so an
+export's memory use does not grow with its length. XLSX files are written
+as a zip stream (data descriptors, no seeking) with inline strings.
+Pure Python 3 standard library implementation
+"""
+
+import csv
+import io
+import re
+import zipfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from xml.sax.saxutils import escape
+
+# Columns exported when none are requested
+DEFAULT_COLUMNS = [
+    "id", "firstName", "lastName", "email", "phone", "location",
+    "experienceYears", "skills", "availabilityDate", "stage", "notes",
+]
+
+# Extra columns available for search results
+SEARCH_COLUMNS = ["score", "reason"]
+
+# Rows encoded per yielded chunk
+ROWS_PER_CHUNK = 200
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Characters that are not allowed in XML 1.0 documents
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# A leading =, @, + or - makes spreadsheets evaluate a cell as a formula;
+# phone numbers and negative numbers are left alone
+_FORMULA_START = re.compile(r"^(?:[=@\t\r]|[+-](?![\d\s().-]*$))")
+
+
+def resolve_columns(requested: Optional[Iterable[str]], allowed: List[str]) -> List[str]:
+    """Requested columns (or all allowed); raises ValueError on unknown ones."""
+    if not requested:
+        return list(allowed)
+    if isinstance(requested, str):
+        requested = [column.strip() for column in requested.split(",") if column.strip()]
+    columns = list(requested)
+    unknown = [column for column in columns if column not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    return columns
+
+
+def search_rows(results: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Flatten search results into candidate fields plus score and reason."""
+    for result in results:
+        yield {**result["candidate"], "score": result["score"], "reason": result["reason"]}
+
+
+def _cell_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return "; ".join(str(item) for item in value)
+    if value is None:
+        return ""
+    return value
+
+
+def _safe_text(value: str) -> str:
+    return "'" + value if _FORMULA_START.match(value) else value
+
+
+def iter_csv(rows: Iterable[Dict[str, Any]], columns: List[str]) -> Iterator[bytes]:
+    """CSV (header + rows) as UTF-8 byte chunks."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        values = []
+        for column in columns:
+            value = _cell_value(row.get(column))
+            values.append(_safe_text(value) if isinstance(value, str) else value)
+        writer.writerow(values)
+        count += 1
+        if count % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable file that hands written bytes to the generator."""
+
+    def __init__(self):
+        self.chunks = []
+        self.offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # zipfile records member offsets with tell(); seek() stays unsupported
+        return self.offset
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _column_name(index: int) -> str:
+    name = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(65 + remainder) + name
+    return name
+
+
+def _xlsx_row(number: int, values: List[Any], letters: List[str]) -> str:
+    cells = []
+    for letter, value in zip(letters, values):
+        ref = f"{letter}{number}"
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            # Inline strings are never evaluated as formulas: no escaping needed
+            text = escape(_XML_ILLEGAL.sub("", str(value)))
+            cells.append(f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+        else:
+            cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Candidates" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def iter_xlsx(rows: Iterable[Dict[str, Any]], columns: List[str]) -> Iterator[bytes]:
+    """A one-sheet XLSX workbook (header + rows) as byte chunks."""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_PARTS.items():
+            archive.writestr(name, content)
+        yield sink.drain()
+
+        letters = [_column_name(i) for i in range(len(columns))]
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(1, columns, letters).encode("utf-8"))
+            batch = []
+            for number, row in enumerate(rows, 2):
+                values = [_cell_value(row.get(column)) for column in columns]
+                batch.append(_xlsx_row(number, values, letters))
+                if len(batch) == ROWS_PER_CHUNK:
+                    sheet.write("".join(batch).encode("utf-8"))
+                    batch = []
+                    yield sink.drain()
+            sheet.write("".join(batch).encode("utf-8"))
+            sheet.write(b"</sheetData></worksheet>")
+    yield sink.drain()
+
+
+def export_stream(rows: Iterable[Dict[str, Any]], columns: List[str], file_format: str) -> Iterator[bytes]:
+    """Byte chunks of rows in file_format ("csv" or "xlsx")."""
+    if file_format == "csv":
+        return iter_csv(rows, columns)
+    if file_format == "xlsx":
+        return iter_xlsx(rows, columns)
+    raise ValueError(f"Unknown export format: {file_format}")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+HR Agent Full-Text - Tokenizer, positional inverted index and BM25 ranking
+Used for candidate notes and job descriptions
+Pure Python 3 standard library implementation
+"""
+
+import math
+import re
+from typing import Dict, Iterable, List, Set
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+# Words that carry no meaning in notes or descriptions
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has",
+    "have", "in", "is", "it", "of", "on", "or", "our", "the", "to", "we",
+    "will", "with", "you", "your", "who", "that", "this", "their",
+}
+
+
+def _stem(token: str) -> str:
+    """Very light stemming: drop a plural 's' so 'skills' matches 'skill'."""
+    if len(token) > 3 and token.isalpha() and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split into word tokens, drop stopwords, light stemming."""
+    return [
+        _stem(token)
+        for token in TOKEN_RE.findall((text or "").lower())
+        if token not in STOPWORDS
+    ]
+
+
+class InvertedIndex:
+    """
+    Positional inverted index ranked by Okapi BM25.
+    Documents are added and removed one at a time, so the index can be
+    maintained incrementally as records change.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        # term -> {doc_id: [positions]}
+        self.postings = {}
+        self.doc_lengths = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, doc_id: int, text: str):
+        """Index (or re-index) one document."""
+        if doc_id in self.doc_lengths:
+            self.remove(doc_id)
+        tokens = tokenize(text)
+        for position, term in enumerate(tokens):
+            self.postings.setdefault(term, {}).setdefault(doc_id, []).append(position)
+        self.doc_lengths[doc_id] = len(tokens)
+        self.total_length += len(tokens)
+
+    def remove(self, doc_id: int, text: str = None):
+        """
+        Remove one document. Pass its text to touch only its own posting
+        lists; without it every term is checked.
+        """
+        if doc_id not in self.doc_lengths:
+            return
+        terms = set(tokenize(text)) if text is not None else list(self.postings)
+        for term in terms:
+            docs = self.postings.get(term)
+            if docs and doc_id in docs:
+                del docs[doc_id]
+                if not docs:
+                    del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency (always positive)."""
+        n = len(self.doc_lengths)
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def matching_docs(self, terms: Iterable[str]) -> Set[int]:
+        """IDs of documents containing any of the terms."""
+        docs = set()
+        for term in terms:
+            docs.update(self.postings.get(term, ()))
+        return docs
+
+    def phrase_docs(self, terms: List[str]) -> Set[int]:
+        """IDs of documents containing the terms consecutively (uses positions)."""
+        if not terms:
+            return set()
+        first = self.postings.get(terms[0], {})
+        # Documents containing every term, then verify positions
+        candidates = set(first)
+        for term in terms[1:]:
+            candidates &= set(self.postings.get(term, ()))
+        matches = set()
+        for doc_id in candidates:
+            follow = [set(self.postings[term][doc_id]) for term in terms[1:]]
+            for start in first[doc_id]:
+                if all(start + offset + 1 in positions for offset, positions in enumerate(follow)):
+                    matches.add(doc_id)
+                    break
+        return matches
+
+    def search(self, terms: Iterable[str]) -> Dict[int, float]:
+        """
+        BM25 scores for documents matching any term.
+        Only the posting lists of the query terms are read.
+        """
+        scores = {}
+        if not self.doc_lengths:
+            return scores
+        avg_length = self.total_length / len(self.doc_lengths) or 1.0
+        for term in set(terms):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = self.idf(term)
+            for doc_id, positions in docs.items():
+                tf = len(positions)
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+HR Agent Geo - Offline city gazetteer, distances and a grid index of places
+The bundled data/gazetteer.json maps city names (and aliases) to
+coordinates, region and country. GridIndex buckets points into fixed-size
+latitude/longitude cells so "near this point" reads a few cells instead of
+computing a distance to everything indexed.
+Pure Python 3 standard library implementation
+"""
+
+import json
+import math
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer.json")
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.2
+
+# Radius searched around a filter location when the query gives none
+DEFAULT_RADIUS_KM = 50
+# Location points: same city 1, within half the radius 0.75, within the radius 0.5
+SAME_CITY_POINTS = 1
+NEAR_POINTS = 0.75
+WITHIN_RADIUS_POINTS = 0.5
+
+# Grid cell size in degrees (about 55 km of latitude)
+GRID_CELL_DEGREES = 0.5
+
+
+def haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """Great-circle distance in km between two (lat, lon) points."""
+    lat1, lon1 = map(math.radians, a)
+    lat2, lon2 = map(math.radians, b)
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def distance_points(distance_km: float, radius_km: float = DEFAULT_RADIUS_KM) -> float:
+    """Location points for a candidate distance_km from the filter location (0 beyond radius_km)."""
+    if distance_km < 1:
+        return SAME_CITY_POINTS
+    if distance_km <= radius_km / 2:
+        return NEAR_POINTS
+    if distance_km <= radius_km:
+        return WITHIN_RADIUS_POINTS
+    return 0
+
+
+class Gazetteer:
+    """City name or alias (case-insensitive) -> {name, lat, lon, region, country}."""
+
+    def __init__(self, places: List[Dict[str, Any]]):
+        self.places = places
+        self._by_name = {}
+        for place in places:
+            for name in [place["name"]] + place.get("aliases", []):
+                self._by_name.setdefault(name.strip().lower(), place)
+        # Longest names first, so "new york" wins over a shorter overlapping name
+        names = sorted(self._by_name, key=len, reverse=True)
+        self.pattern = re.compile(r"\b(" + "|".join(re.escape(name) for name in names) + r")\b", re.IGNORECASE)
+
+    @classmethod
+    def load(cls, path: str = GAZETTEER_PATH) -> "Gazetteer":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        return self._by_name.get((name or "").strip().lower())
+
+    def point(self, name: str) -> Optional[Tuple[float, float]]:
+        place = self.lookup(name)
+        return (place["lat"], place["lon"]) if place is not None else None
+
+    def find(self, text: str) -> Optional[Tuple[Dict[str, Any], Tuple[int, int]]]:
+        """The first city named in text and its span, or None."""
+        match = self.pattern.search(text)
+        if match is None:
+            return None
+        return self._by_name[match.group(0).lower()], match.span()
+
+    def distance_km(self, a: str, b: str) -> Optional[float]:
+        """Distance between two named places, or None if either is unknown."""
+        return _cached_distance(self, (a or "").strip().lower(), (b or "").strip().lower())
+
+
+@lru_cache(maxsize=4096)
+def _cached_distance(gazetteer: Gazetteer, a: str, b: str) -> Optional[float]:
+    point_a, point_b = gazetteer.point(a), gazetteer.point(b)
+    if point_a is None or point_b is None:
+        return None
+    return round(haversine_km(point_a, point_b), 1)
+
+
+_gazetteer = None
+
+
+def get_gazetteer() -> Gazetteer:
+    """The bundled gazetteer, loaded once per process."""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer.load()
+    return _gazetteer
+
+
+class GridIndex:
+    """Keys bucketed by (lat, lon) grid cell; near() reads only the cells a radius overlaps."""
+
+    def __init__(self, cell_degrees: float = GRID_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self.cells = {}
+        self.points = {}
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees))
+
+    def _point_cell(self, point: Tuple[float, float]) -> Tuple[int, int]:
+        lat, lon = point
+        return self._cell(lat, (lon + 180.0) % 360.0 - 180.0)
+
+    def add(self, key: Hashable, point: Tuple[float, float]):
+        self.remove(key)
+        self.points[key] = point
+        self.cells.setdefault(self._point_cell(point), set()).add(key)
+
+    def remove(self, key: Hashable):
+        point = self.points.pop(key, None)
+        if point is None:
+            return
+        cell = self._point_cell(point)
+        keys = self.cells[cell]
+        keys.discard(key)
+        if not keys:
+            del self.cells[cell]
+
+    def near(self, point: Tuple[float, float], radius_km: float) -> List[Tuple[Hashable, float]]:
+        """(key, km) for keys within radius_km of point, nearest first."""
+        lat, lon = point
+        lat_span = radius_km / KM_PER_DEGREE
+        # Longitude degrees shrink towards the poles: size the span at the poleward edge
+        edge = min(90.0, abs(lat) + lat_span)
+        lon_span = min(180.0, radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(edge)), 0.01)))
+        low = self._cell(lat - lat_span, lon - lon_span)
+        high = self._cell(lat + lat_span, lon + lon_span)
+        # Columns wrap around the antimeridian
+        columns_around = round(360 / self.cell_degrees)
+        first_column = self._cell(0, -180.0)[1]
+        if high[1] - low[1] + 1 >= columns_around:
+            columns = range(first_column, first_column + columns_around)
+        else:
+            columns = [first_column + (c - first_column) % columns_around for c in range(low[1], high[1] + 1)]
+        found = []
+        for row in range(low[0], high[0] + 1):
+            for column in columns:
+                for key in self.cells.get((row, column), ()):
+                    distance = haversine_km(point, self.points[key])
+                    if distance <= radius_km:
+                        found.append((key, round(distance, 1)))
+        found.sort(key=lambda item: (item[1], str(item[0])))
+        return found
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+HR Agent Importer - Streaming bulk import of candidate CSV/NDJSON files
+Rows are read lazily, normalized and validated in parallel chunks (worker
+processes), and applied to the live HRBackend one batch at a time, so
+memory stays bounded and searches keep running between batches. Progress
+is checkpointed after every batch; an interrupted import resumes there.
+Pure Python 3 standard library implementation
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from backend import CANDIDATE_FIELDS, DuplicateCandidate, HRBackend, normalize_skill, validate_record
+from storage import write_json
+
+# Rows per validation chunk, which is also the batch applied under the write lock
+BATCH_SIZE = 500
+
+# Per-row errors kept in a report (the count is always exact)
+MAX_REPORTED_ERRORS = 1000
+
+# Date layouts accepted in files; all are stored as %Y-%m-%d
+DATE_FORMATS = ["%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%Y-%m-%dT%H:%M:%S"]
+
+# Column names as sourcing tools export them (lowercase, letters only) -> field
+COLUMN_ALIASES = {
+    "firstname": "firstName",
+    "givenname": "firstName",
+    "lastname": "lastName",
+    "surname": "lastName",
+    "familyname": "lastName",
+    "email": "email",
+    "emailaddress": "email",
+    "mail": "email",
+    "phone": "phone",
+    "phonenumber": "phone",
+    "mobile": "phone",
+    "location": "location",
+    "city": "location",
+    "experienceyears": "experienceYears",
+    "experience": "experienceYears",
+    "yearsofexperience": "experienceYears",
+    "years": "experienceYears",
+    "skills": "skills",
+    "availabilitydate": "availabilityDate",
+    "availability": "availabilityDate",
+    "availablefrom": "availabilityDate",
+    "stage": "stage",
+    "status": "stage",
+    "notes": "notes",
+    "comments": "notes",
+}
+
+
+def detect_format(path: str) -> str:
+    """"csv" or "ndjson", from the file extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".ndjson", ".jsonl", ".json"):
+        return "ndjson"
+    if extension in (".csv", ".tsv", ".txt"):
+        return "csv"
+    raise ValueError(f"Cannot tell the format of {path}; pass csv or ndjson")
+
+
+def iter_rows(path: str, file_format: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (row_number, raw_row) one at a time; row numbers start at 1 and
+    skip the CSV header. An unparsable NDJSON line is yielded as the
+    ValueError describing it.
+    """
+    if file_format == "csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            sample = f.read(4096)
+            f.seek(0)
+            delimiter = "\t" if sample.count("\t") > sample.count(",") else ","
+            for number, row in enumerate(csv.DictReader(f, delimiter=delimiter), 1):
+                yield number, row
+    elif file_format == "ndjson":
+        with open(path, "r", encoding="utf-8") as f:
+            number = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                number += 1
+                try:
+                    yield number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield number, ValueError(f"Invalid JSON: {e.msg}")
+    else:
+        raise ValueError(f"Unknown import format: {file_format}")
+
+
+def normalize_date(value: str) -> str:
+    value = value.strip()
+    for layout in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, layout).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date: {value}")
+
+
+def normalize_row(raw: Dict[str, Any], canonical_skills: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Map a raw row onto candidate fields: known column aliases, numbers and
+    lists from strings, dates as YYYY-MM-DD, skills through normalize_skill
+    (spelled as the pool already spells them, e.g. "aws" -> "AWS").
+    Raises ValueError; returns a record accepted by validate_record.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("Row must be an object")
+    record = {}
+    for column, value in raw.items():
+        field = COLUMN_ALIASES.get(re.sub(r"[^a-z]", "", str(column).lower()))
+        if field is None or value is None or value == "":
+            continue
+        if field == "skills":
+            if isinstance(value, str):
+                value = re.split(r"[;,|]", value)
+            skills = []
+            for skill in value:
+                if isinstance(skill, str) and skill.strip():
+                    normalized = normalize_skill(skill)
+                    skill = canonical_skills.get(normalized, normalized)
+                    if skill not in skills:
+                        skills.append(skill)
+            value = skills
+        elif field == "experienceYears" and isinstance(value, str):
+            try:
+                value = int(float(value.strip()))
+            except ValueError:
+                raise ValueError(f"experienceYears is not a number: {value}")
+        elif field == "availabilityDate" and isinstance(value, str):
+            value = normalize_date(value)
+        record[field] = value
+    return validate_record(record, CANDIDATE_FIELDS)
+
+
+def normalize_chunk(
+    rows: List[Tuple[int, Any]], canonical_skills: Dict[str, str]
+) -> List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Worker entry point: [(row_number, record or None, error or None)]."""
+    results = []
+    for number, raw in rows:
+        try:
+            if isinstance(raw, Exception):
+                raise raw
+            results.append((number, normalize_row(raw, canonical_skills), None))
+        except ValueError as e:
+            results.append((number, None, str(e)))
+    return results
+
+
+class CandidateImport:
+    """
+    One import run of a file into a backend. progress() may be called from
+    other threads while run() works.
+    """
+
+    def __init__(
+        self,
+        backend: HRBackend,
+        path: str,
+        file_format: Optional[str] = None,
+        batch_size: int = BATCH_SIZE,
+        workers: Optional[int] = None,
+        allow_duplicates: bool = False,
+        resume: bool = True,
+    ):
+        """workers: validation processes (0 validates in this thread)."""
+        self.backend = backend
+        self.path = path
+        self.file_format = file_format or detect_format(path)
+        self.batch_size = batch_size
+        if workers is None:
+            # Leave a core for the server; on one core validate in-thread
+            workers = min((os.cpu_count() or 1) - 1, 4)
+        self.workers = workers
+        self.allow_duplicates = allow_duplicates
+        self.resume = resume
+        self.checkpoint_path = path + ".checkpoint.json"
+        self.status = "pending"
+        self.counts = {"rows": 0, "imported": 0, "duplicates": 0, "errors": 0}
+        self.errors = []
+        self.resumed_from = 0
+        self.started = None
+        self.finished = None
+        self.failure = None
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def _source_signature(self) -> Dict[str, Any]:
+        stat = os.stat(self.path)
+        return {"source": os.path.abspath(self.path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+    def _load_checkpoint(self):
+        """Continue after the last applied batch if the file has not changed since."""
+        if not self.resume or not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if all(checkpoint.get(key) == value for key, value in self._source_signature().items()):
+            self.counts = checkpoint["counts"]
+            self.resumed_from = self.counts["rows"]
+            print(f"Resuming import of {self.path} after row {self.resumed_from}")
+
+    def _save_checkpoint(self):
+        write_json(self.checkpoint_path, {**self._source_signature(), "counts": self.counts})
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+
+    def _chunks(self) -> Iterator[List[Tuple[int, Any]]]:
+        rows = itertools.islice(iter_rows(self.path, self.file_format), self.resumed_from, None)
+        while True:
+            chunk = list(itertools.islice(rows, self.batch_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _validated_chunks(self, canonical_skills: Dict[str, str]) -> Iterator[List[Tuple[int, Any, Any]]]:
+        """Validated chunks in file order, at most 2 per worker in flight."""
+        if self.workers <= 0:
+            for chunk in self._chunks():
+                yield normalize_chunk(chunk, canonical_skills)
+            return
+        # spawn: forking a process that runs server threads is not safe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            pending = deque()
+            for chunk in self._chunks():
+                pending.append(pool.submit(normalize_chunk, chunk, canonical_skills))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _error(self, number: int, message: str):
+        self.counts["errors"] += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": number, "error": message})
+
+    def _apply(self, chunk: List[Tuple[int, Any, Any]]):
+        valid = [(number, record) for number, record, error in chunk if record is not None]
+        for number, _, error in chunk:
+            if error is not None:
+                self._error(number, error)
+        results = self.backend.create_candidates(
+            [record for _, record in valid], allow_duplicates=self.allow_duplicates
+        )
+        for (number, _), result in zip(valid, results):
+            if isinstance(result, DuplicateCandidate):
+                self.counts["duplicates"] += 1
+                self._error(number, f"{result} (score {result.duplicates[0]['score']})")
+            elif isinstance(result, Exception):
+                self._error(number, str(result))
+            else:
+                self.counts["imported"] += 1
+        self.counts["rows"] += len(chunk)
+
+    def run(self) -> Dict[str, Any]:
+        """Import the file; returns the final progress report."""
+        self.status = "running"
+        self.started = time.time()
+        try:
+            self._load_checkpoint()
+            canonical_skills = {
+                normalize_skill(skill): skill for skill in self.backend.candidate_skill_counts
+            }
+            for chunk in self._validated_chunks(canonical_skills):
+                self._apply(chunk)
+                self._save_checkpoint()
+            self.backend.compact_storage()
+            if os.path.exists(self.checkpoint_path):
+                os.remove(self.checkpoint_path)
+            self.status = "done"
+        except Exception as e:
+            self.status = "failed"
+            self.failure = str(e)
+            raise
+        finally:
+            self.finished = time.time()
+        report = self.progress()
+        print(
+            f"Imported {report['imported']} of {report['rows']} rows from {self.path} "
+            f"({report['rowsPerSecond']} rows/s, {report['errors']} errors)"
+        )
+        return report
+
+    def progress(self) -> Dict[str, Any]:
+        elapsed = ((self.finished or time.time()) - self.started) if self.started else 0.0
+        processed = self.counts["rows"] - self.resumed_from
+        report = {
+            "status": self.status,
+            "source": self.path,
+            "format": self.file_format,
+            **self.counts,
+            "resumedFrom": self.resumed_from,
+            "elapsedSeconds": round(elapsed, 2),
+            "rowsPerSecond": round(processed / elapsed, 1) if elapsed > 0 else 0.0,
+            "rowErrors": list(self.errors),
+        }
+        if self.failure is not None:
+            report["failure"] = self.failure
+        return report
+
+
+class ImportManager:
+    """Runs imports in background threads and keeps their progress by ID."""
+
+    def __init__(self, backend: HRBackend, import_dir: Optional[str] = None):
+        self.backend = backend
+        # Files are only imported from here (API callers name them relatively)
+        self.import_dir = import_dir or os.path.join(backend.data_dir, "imports")
+        self.imports = {}
+
+    def resolve(self, name: str) -> str:
+        """Path of an import file; raises ValueError outside import_dir or missing."""
+        root = os.path.realpath(self.import_dir)
+        path = os.path.realpath(os.path.join(root, name or ""))
+        if os.path.commonpath([root, path]) != root or path == root:
+            raise ValueError(f"Import files must be inside {self.import_dir}")
+        if not os.path.isfile(path):
+            raise ValueError(f"Import file not found: {name}")
+        return path
+
+    def start(self, name: str, **options) -> Dict[str, Any]:
+        """Start importing import_dir/name. Returns: {id, **progress}"""
+        job = CandidateImport(self.backend, self.resolve(name), **options)
+        import_id = uuid.uuid4().hex[:12]
+        self.imports[import_id] = job
+
+        def run():
+            try:
+                job.run()
+            except Exception as e:
+                print(f"Import {import_id} failed: {e}")
+
+        threading.Thread(target=run, name=f"import-{import_id}", daemon=True).start()
+        return {"id": import_id, **job.progress()}
+
+    def running(self) -> bool:
+        """True while any import has not finished (the backend must stay loaded)."""
+        return any(job.status in ("pending", "running") for job in self.imports.values())
+
+    def get(self, import_id: str) -> Optional[Dict[str, Any]]:
+        job = self.imports.get(import_id)
+        if job is None:
+            return None
+        return {"id": import_id, **job.progress()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import candidates from a CSV or NDJSON file")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None)
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--storage", choices=["json", "sqlite"], default=os.environ.get("HR_AGENT_STORAGE", "json"))
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--allow-duplicates", action="store_true")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    backend = HRBackend(args.data_dir, storage=args.storage)
+    job = CandidateImport(
+        backend,
+        args.path,
+        file_format=args.format,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        allow_duplicates=args.allow_duplicates,
+        resume=not args.restart,
+    )
+    report = job.run()
+    for error in report["rowErrors"][:20]:
+        print(f"  row {error['row']}: {error['error']}")
+    backend.storage.close()
+
+
+if __name__ == "__main__":
+    main()
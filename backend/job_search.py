@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+HR Agent Job Search - Index and top-K ranking over the job catalogue
+Jobs are indexed by required skill, location (exact name and gazetteer
+coordinates) and title terms, so parsed search filters select matching jobs
+from posting lists instead of scanning the catalogue; matches are ranked
+by skills, distance and title relevance and returned a page at a time.
+Pure Python 3 standard library implementation
+"""
+
+import heapq
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from fulltext import InvertedIndex, tokenize
+from geo import DEFAULT_RADIUS_KM, GridIndex, distance_points
+
+# Points per filter skill a job requires, and for the best title match
+SKILL_POINTS = 2
+TITLE_MATCH_POINTS = 2
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+# Query words that ask for jobs rather than describe them
+JOB_QUERY_FILLER_WORDS = {"job", "role", "position", "opening", "vacancy", "req", "offer", "hiring"}
+
+
+class JobIndex:
+    """
+    Posting lists over jobs: lowercase required skill / lowercase location
+    -> job IDs, a grid of the locations the gazetteer knows, and a BM25
+    index of titles. Maintained one job at a time by HRBackend.
+    """
+
+    def __init__(self, gazetteer):
+        self.gazetteer = gazetteer
+        self.ids_by_skill = {}
+        self.ids_by_location = {}
+        self.location_grid = GridIndex()
+        self.title_index = InvertedIndex()
+
+    def add(self, job: Dict[str, Any]):
+        job_id = job["id"]
+        for skill in job.get("skillsRequired", []):
+            self.ids_by_skill.setdefault(skill.lower(), set()).add(job_id)
+        location = job.get("location", "").lower()
+        self.ids_by_location.setdefault(location, set()).add(job_id)
+        if location not in self.location_grid.points:
+            point = self.gazetteer.point(location)
+            if point is not None:
+                self.location_grid.add(location, point)
+        self.title_index.add(job_id, job.get("title", ""))
+
+    def remove(self, job: Dict[str, Any]):
+        job_id = job["id"]
+        for skill in job.get("skillsRequired", []):
+            _discard(self.ids_by_skill, skill.lower(), job_id)
+        location = job.get("location", "").lower()
+        _discard(self.ids_by_location, location, job_id)
+        if location not in self.ids_by_location:
+            self.location_grid.remove(location)
+        self.title_index.remove(job_id, job.get("title", ""))
+
+    def skill_keys(self, filter_skill: str) -> Set[str]:
+        """Indexed skills matching filter_skill (equal, or one contains the other)."""
+        filter_skill = filter_skill.lower()
+        return {key for key in self.ids_by_skill if filter_skill in key or key in filter_skill}
+
+    def location_distances(self, filters: Dict[str, Any]) -> Dict[str, float]:
+        """Indexed locations within the filters' radius -> km (0 for the exact name)."""
+        filter_location = filters["location"].lower()
+        found = {}
+        point = self.gazetteer.point(filter_location)
+        if point is not None:
+            radius = filters.get("radiusKm", DEFAULT_RADIUS_KM)
+            found.update(self.location_grid.near(point, radius))
+        if filter_location in self.ids_by_location:
+            found[filter_location] = 0
+        return found
+
+    def matching_ids(self, filters: Dict[str, Any]) -> Optional[Set[int]]:
+        """
+        IDs of jobs in the filters' location (or within radiusKm of it) that
+        require at least one filter skill; None when neither is filtered on.
+        """
+        matched = None
+        if "location" in filters:
+            matched = set()
+            for location in self.location_distances(filters):
+                matched |= self.ids_by_location[location]
+        if filters.get("skills"):
+            by_skill = set()
+            for filter_skill in filters["skills"]:
+                for key in self.skill_keys(filter_skill):
+                    by_skill |= self.ids_by_skill[key]
+            matched = by_skill if matched is None else matched & by_skill
+        return matched
+
+    def title_terms(self, filters: Dict[str, Any]) -> List[str]:
+        terms = tokenize(filters.get("role", "")) + list(filters.get("text", []))
+        return [term for term in dict.fromkeys(terms) if term not in JOB_QUERY_FILLER_WORDS]
+
+    def search(
+        self,
+        filters: Dict[str, Any],
+        jobs_by_id: Dict[int, Dict[str, Any]],
+        offset: int = 0,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Rank the jobs matching filters. Location and skills select jobs (as
+        for candidate search); title terms (role and free text) select jobs
+        when nothing else does and otherwise only rank them.
+        Returns: {total, offset, limit, results: [{job, score, reason}]}
+        """
+        ids = self.matching_ids(filters)
+        titles = self.title_index.search(self.title_terms(filters))
+        if ids is None:
+            ids = set(titles) if titles else set(jobs_by_id)
+        best_title = max(titles.values(), default=0)
+        distances = self.location_distances(filters) if "location" in filters else {}
+        skill_keys = [
+            (skill, self.skill_keys(skill)) for skill in filters.get("skills", [])
+        ]
+        radius = filters.get("radiusKm", DEFAULT_RADIUS_KM)
+
+        def rank(job_id: int):
+            job = jobs_by_id[job_id]
+            score = 0
+            reasons = []
+            required = {skill.lower() for skill in job.get("skillsRequired", [])}
+            matched = [skill for skill, keys in skill_keys if keys & required]
+            if matched:
+                score += SKILL_POINTS * len(matched)
+                reasons.append(f"{'+'.join(matched)} required (+{SKILL_POINTS * len(matched)})")
+            distance = distances.get(job.get("location", "").lower())
+            if distance is not None:
+                points = distance_points(distance, radius)
+                score += points
+                if distance:
+                    reasons.append(f"Location: {job.get('location')}, {distance:g} km away (+{points})")
+                else:
+                    reasons.append(f"Location: {job.get('location')} (+{points})")
+            if job_id in titles:
+                points = round(TITLE_MATCH_POINTS * titles[job_id] / best_title, 2)
+                score += points
+                reasons.append(f"Title match (+{points})")
+            return (-score, job.get("title", ""), job_id), score, reasons
+
+        ranked = heapq.nsmallest(offset + limit, (rank(job_id) for job_id in ids if job_id in jobs_by_id))
+        results = [
+            {
+                "job": jobs_by_id[key[2]],
+                "score": score,
+                "reason": (", ".join(reasons) or "Open position") + f" → score {score}",
+            }
+            for key, score, reasons in ranked[offset:]
+        ]
+        return {"total": len(ids), "offset": offset, "limit": limit, "results": results}
+
+
+def _discard(index: Dict[Any, Set[int]], key: Any, job_id: int):
+    ids = index.get(key)
+    if ids is not None:
+        ids.discard(job_id)
+        if not ids:
+            del index[key]
+
+
+def page_bounds(offset: Any, limit: Any) -> Tuple[int, int]:
+    """(offset, limit) from request values; raises ValueError if not valid."""
+    offset = int(offset)
+    limit = int(limit)
+    if offset < 0 or limit < 1:
+        raise ValueError("offset must be >= 0 and limit >= 1")
+    return offset, min(limit, MAX_PAGE_SIZE)
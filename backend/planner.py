@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+HR Agent Planner - Cost-based access paths and top-K pruning for candidate search
+Every scoring rule of a scoring profile is additive and only rewards
+candidates found in one posting list (skills, location, experience,
+availability, notes), so a query can be answered from the most selective
+postings, skipping candidates whose score upper bound cannot reach the top K.
+Pure Python 3 standard library implementation
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from geo import DEFAULT_RADIUS_KM
+from scoring import DEFAULT_WEIGHTS
+
+# Read postings only while they cover less than this share of the pool;
+# past it a full scan (with the same pruning) is cheaper
+FULL_SCAN_FRACTION = 0.5
+
+# Slack for float rounding when comparing a bound with an actual score
+BOUND_EPSILON = 1e-9
+
+
+def parse_date(value: str) -> Optional[date]:
+    """Parse a YYYY-MM-DD availability date; None if empty or invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+class Rule:
+    """
+    One scoring rule of a query: the candidates it can reward (read from
+    posting lists) and the most points it can add to one candidate.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        max_points: float,
+        postings: List[Set[int]],
+        admits: Callable[[Dict[str, Any]], bool],
+        points: Optional[Dict[int, float]] = None,
+    ):
+        """points: exact points per candidate ID, when the rule knows them."""
+        self.name = name
+        self.path = path
+        self.max_points = max_points
+        self.admits = admits
+        self.points = points
+        # Copied now: the live posting sets change with every write
+        self.ids = set().union(*postings)
+        # Cardinality: rows read through this access path
+        self.estimate = len(self.ids)
+
+    def restrict(self, scope: Set[int]):
+        """Keep only candidates in scope (a shortlist-scoped search)."""
+        self.ids &= scope
+        self.estimate = len(self.ids)
+
+    def bound(self, candidate: Dict[str, Any]) -> float:
+        """Upper bound of the points this rule gives candidate."""
+        if self.points is not None:
+            return self.points.get(candidate["id"], 0)
+        return self.max_points if self.admits(candidate) else 0
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "rule": self.name,
+            "path": self.path,
+            "maxPoints": self.max_points,
+            "estimatedRows": self.estimate,
+        }
+
+
+class QueryPlan:
+    """Rules ordered most selective first, the chosen access path and run statistics."""
+
+    def __init__(self, rules: List[Rule], pool_size: int, limit: int, scope: Optional[Set[int]] = None):
+        """scope: the only candidate IDs the search may return (None: everyone)."""
+        self.scope = scope
+        if scope is not None:
+            for rule in rules:
+                rule.restrict(scope)
+            pool_size = len(scope)
+        # Cheapest rows per point first, so the top-K threshold rises early
+        self.rules = sorted(rules, key=lambda r: (r.estimate / r.max_points, r.name))
+        self.pool_size = pool_size
+        self.limit = limit
+        self.estimate = sum(rule.estimate for rule in self.rules)
+        if not self.rules:
+            self.path = "name-order"
+        elif limit <= 0 or self.estimate >= FULL_SCAN_FRACTION * pool_size:
+            self.path = "full-scan"
+        else:
+            self.path = self.rules[0].path
+        # Filled in while the plan runs
+        self.stats = {"scored": 0, "pruned": 0, "rulesSkipped": [], "filled": 0}
+
+    @property
+    def max_score(self) -> float:
+        return sum(rule.max_points for rule in self.rules)
+
+    def bound(self, candidate: Dict[str, Any]) -> float:
+        """Score upper bound for candidate: sum of the rules it can satisfy."""
+        return sum(rule.bound(candidate) for rule in self.rules)
+
+    def bounds_by_id(self) -> Dict[int, float]:
+        """
+        Score upper bounds for every candidate some rule can reward, by
+        accumulating over the posting lists (cheaper than per-candidate checks
+        when most of the pool is involved). Absent candidates are bounded by 0.
+        """
+        bounds = {}
+        for rule in self.rules:
+            for candidate_id in rule.ids:
+                if rule.points is not None:
+                    points = rule.points.get(candidate_id, 0)
+                else:
+                    points = rule.max_points
+                bounds[candidate_id] = bounds.get(candidate_id, 0) + points
+        return bounds
+
+    def remaining_bounds(self) -> List[float]:
+        """remaining_bounds()[i]: the most a candidate outside rules[:i] can score."""
+        bounds = [0.0] * (len(self.rules) + 1)
+        for i in range(len(self.rules) - 1, -1, -1):
+            bounds[i] = bounds[i + 1] + self.rules[i].max_points
+        return bounds
+
+    def explain(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "poolSize": self.pool_size,
+            "scoped": self.scope is not None,
+            "limit": self.limit,
+            "estimatedRows": self.estimate,
+            "maxScore": self.max_score,
+            "rules": [rule.describe() for rule in self.rules],
+            "execution": dict(self.stats),
+        }
+
+
+class QueryPlanner:
+    """
+    Builds a QueryPlan for parsed filters from the backend's posting lists
+    (their sizes are the cardinality statistics) and fuzzy skill rules
+    resolved against the skill vocabulary.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        # Raw (lowercase) skill -> HRBackend._normalize_skill(raw)
+        self._normalized = {}
+
+    def _normalize(self, raw_skill: str) -> str:
+        normalized = self._normalized.get(raw_skill)
+        if normalized is None:
+            normalized = self.backend._normalize_skill(raw_skill)
+            self._normalized[raw_skill] = normalized
+        return normalized
+
+    def _skill_rule(self, name: str, max_points: float, keys: Set[str]) -> Rule:
+        by_skill = self.backend.candidate_ids_by_skill
+        return Rule(
+            name,
+            "skill-postings",
+            max_points,
+            [by_skill[key] for key in keys],
+            lambda c: any(skill.lower() in keys for skill in c.get("skills", [])),
+        )
+
+    def plan(
+        self,
+        filters: Dict[str, Any],
+        matching_jobs: List[Dict[str, Any]],
+        today: date,
+        text_scores: Dict[int, float],
+        weights: Dict[str, Any] = DEFAULT_WEIGHTS,
+        scope: Optional[Set[int]] = None,
+    ) -> QueryPlan:
+        """
+        weights: the scoring profile's; rules worth no points get no rule.
+        scope: candidate IDs to restrict the search to (a shortlist's members).
+        """
+        backend = self.backend
+        vocabulary = list(backend.candidate_ids_by_skill)
+        rules = []
+
+        # Filter skills: "skill" points (exact or fuzzy) or "fuzzySkill" (same 3-letter prefix) each
+        skill_points = max(weights["skill"], weights["fuzzySkill"])
+        for position, raw in enumerate(filters.get("skills", []) if skill_points else []):
+            filter_skill = backend._normalize_skill(raw)
+            keys = {
+                key for key in vocabulary
+                if backend._fuzzy_match(filter_skill, self._normalize(key))
+                or filter_skill[:3] == self._normalize(key)[:3]
+            }
+            rules.append(self._skill_rule(f"skill[{position}]:{filter_skill}", skill_points, keys))
+
+        # Skills of matching jobs: "jobSkill" points per occurrence that any candidate skill covers
+        occurrences = {}
+        for job in matching_jobs if weights["jobSkill"] else []:
+            for skill in job.get("skillsRequired", []):
+                occurrences[skill.lower()] = occurrences.get(skill.lower(), 0) + 1
+        for job_skill, count in occurrences.items():
+            keys = {
+                key for key in vocabulary
+                if job_skill in self._normalize(key) or self._normalize(key) in job_skill
+            }
+            rules.append(self._skill_rule(f"jobSkill:{job_skill}", count * weights["jobSkill"], keys))
+
+        # Location: exact, gazetteer cities within the radius (read off the
+        # grid index), substring either way
+        filter_location = filters.get("location", "").lower()
+        location_points = max(weights["location"].values())
+        if filter_location and location_points:
+            locations = {
+                location for location in backend.candidate_ids_by_location
+                if filter_location in location or location in filter_location
+            }
+            point = backend.gazetteer.point(filter_location)
+            if point is not None:
+                radius = filters.get("radiusKm", DEFAULT_RADIUS_KM)
+                locations.update(location for location, _ in backend.location_grid.near(point, radius))
+            rules.append(Rule(
+                f"location:{filter_location}",
+                "location-postings",
+                location_points,
+                [backend.candidate_ids_by_location[location] for location in locations],
+                lambda c: c.get("location", "").lower() in locations,
+            ))
+
+        # Experience: within the range widened by the rewarded slacks
+        experience = weights["experience"]
+        slacks = [
+            slack for points, slack in (
+                (experience["inRange"], experience["rangeSlack"]),
+                (experience["nearRange"], experience["nearSlack"]),
+            ) if points
+        ]
+        if "minExp" in filters and "maxExp" in filters and slacks:
+            low, high = filters["minExp"] - max(slacks), filters["maxExp"] + max(slacks)
+            rules.append(Rule(
+                f"experience:{low}-{high}",
+                "experience-range",
+                max(experience["inRange"], experience["nearRange"]),
+                [ids for years, ids in backend.candidate_ids_by_experience.items() if low <= years <= high],
+                lambda c: low <= c.get("experienceYears", 0) <= high,
+            ))
+
+        # Availability: within the query's window, or within soonDays
+        availability = weights["availability"]
+        horizons = [
+            days for points, days in (
+                (availability["inWindow"], filters.get("availabilityWindowDays")),
+                (availability["soon"], availability["soonDays"]),
+            ) if points
+        ]
+        if "availabilityWindowDays" in filters and horizons:
+            last_day = today + timedelta(days=max(horizons))
+            availability_rule = Rule(
+                f"availability:{today.isoformat()}..{last_day.isoformat()}",
+                "availability-range",
+                max(availability["inWindow"], availability["soon"]),
+                self._date_postings(today, last_day),
+                # Membership by ID: cheaper than re-parsing every candidate's date
+                lambda c: c["id"] in availability_rule.ids,
+            )
+            rules.append(availability_rule)
+
+        # Free text: exact BM25 points are already known per candidate
+        if text_scores:
+            rules.append(Rule(
+                "notes",
+                "notes-postings",
+                max(text_scores.values()),
+                [set(text_scores)],
+                lambda c: c["id"] in text_scores,
+                points=text_scores,
+            ))
+
+        return QueryPlan(rules, len(backend.candidates), filters.get("limit", 5), scope)
+
+    def _date_postings(self, first_day: date, last_day: date) -> List[Set[int]]:
+        by_date = self.backend.candidate_ids_by_availability
+        days = (last_day - first_day).days + 1
+        if days > len(by_date):
+            return [ids for day, ids in by_date.items() if first_day <= day <= last_day]
+        postings = []
+        for offset in range(days):
+            ids = by_date.get(first_day + timedelta(days=offset))
+            if ids:
+                postings.append(ids)
+        return postings
+
+    def statistics(self) -> Dict[str, Any]:
+        """Cardinality statistics the planner costs plans with."""
+        backend = self.backend
+
+        def sizes(index: Dict[Any, Set[int]], top: int = 10) -> List[List[Any]]:
+            ranked = sorted(index.items(), key=lambda item: (-len(item[1]), str(item[0])))
+            return [[str(key), len(ids)] for key, ids in ranked[:top]]
+
+        return {
+            "candidates": len(backend.candidates),
+            "distinctSkills": len(backend.candidate_ids_by_skill),
+            "distinctLocations": len(backend.candidate_ids_by_location),
+            "distinctExperience": len(backend.candidate_ids_by_experience),
+            "distinctAvailabilityDates": len(backend.candidate_ids_by_availability),
+            "commonSkills": sizes(backend.candidate_ids_by_skill),
+            "commonLocations": sizes(backend.candidate_ids_by_location),
+        }
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+HR Agent Pub/Sub - Change feed behind the /api/events server-sent events stream
+Writes mark the analytics summary stale and shortlist saves publish the new
+list. The summary is recomputed once per data change by whichever
+subscriber polls first and only its changed sections are published, so
+any number of open dashboards share one computation. Events carry
+increasing IDs; a client reconnecting with Last-Event-ID gets what it
+missed, or a fresh snapshot if that has left the history.
+Pure Python 3 standard library implementation
+"""
+
+import json
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+# Events kept for clients resuming with Last-Event-ID
+EVENT_HISTORY = 256
+
+# Seconds between keep-alive comments on an idle stream
+KEEPALIVE_SECONDS = 15
+
+# Milliseconds browsers wait before reconnecting a dropped stream
+RETRY_MS = 3000
+
+KEEPALIVE = b": keepalive\n\n"
+
+
+class ChangeFeed:
+    """
+    Ordered analytics and shortlist events of one backend.
+
+    analytics: returns the full analytics summary (a dict of sections)
+    shortlists: returns {name: [candidate IDs]}
+    """
+
+    def __init__(
+        self,
+        analytics: Callable[[], Dict[str, Any]],
+        shortlists: Callable[[], Dict[str, List[int]]],
+        history: int = EVENT_HISTORY,
+    ):
+        self._analytics = analytics
+        self._shortlists = shortlists
+        self._condition = threading.Condition()
+        # Serializes summary recomputation (never held with the condition)
+        self._compute_lock = threading.Lock()
+        self.events = deque(maxlen=history)
+        self.sequence = 0
+        self.summaries_computed = 0
+        # Open /api/events streams
+        self.subscribers = 0
+        self._listeners = []
+        # Data version the summary is due for vs the one it was computed at
+        self._pending_version = 0
+        self._summary_version = None
+        self._summary = None
+
+    # ------------------------------------------------------------------
+    # Publishing (writer side)
+    # ------------------------------------------------------------------
+
+    def changed(self, version: int):
+        """Data changed: an analytics delta is due (computed on the next poll)."""
+        with self._condition:
+            self._pending_version = version
+            self._condition.notify_all()
+        self._notify()
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self._condition:
+            event = self._append(event_type, data)
+            self._condition.notify_all()
+        self._notify()
+        return event
+
+    def _append(self, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        self.sequence += 1
+        event = {"id": self.sequence, "event": event_type, "data": data}
+        self.events.append(event)
+        return event
+
+    def listen(self, callback: Callable[[], None]):
+        """Call callback (from the writing thread) whenever there is news."""
+        with self._condition:
+            self._listeners.append(callback)
+
+    def unlisten(self, callback: Callable[[], None]):
+        with self._condition:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def opened(self):
+        with self._condition:
+            self.subscribers += 1
+
+    def closed(self):
+        with self._condition:
+            self.subscribers -= 1
+
+    def _notify(self):
+        with self._condition:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            callback()
+
+    # ------------------------------------------------------------------
+    # Reading (subscriber side)
+    # ------------------------------------------------------------------
+
+    def _refresh_summary(self):
+        """Recompute the summary if data changed since; publish the changed sections."""
+        with self._compute_lock:
+            with self._condition:
+                version = self._pending_version
+                if version == self._summary_version:
+                    return
+            summary = self._analytics()
+            self.summaries_computed += 1
+            with self._condition:
+                if self._summary is not None:
+                    delta = {
+                        section: value
+                        for section, value in summary.items()
+                        if self._summary.get(section) != value
+                    }
+                    if delta:
+                        self._append("analytics", {"version": version, "changed": delta})
+                self._summary = summary
+                self._summary_version = version
+
+    def poll(self, last_id: Optional[int]) -> List[Dict[str, Any]]:
+        """
+        Events after last_id. A snapshot event (full analytics and shortlists)
+        stands in for the history when last_id is None or no longer held.
+        """
+        self._refresh_summary()
+        with self._condition:
+            oldest = self.events[0]["id"] if self.events else self.sequence + 1
+            if last_id is None or last_id > self.sequence or last_id < oldest - 1:
+                data = {
+                    "version": self._summary_version,
+                    "analytics": self._summary,
+                    "shortlists": self._shortlists(),
+                }
+                return [{"id": self.sequence, "event": "snapshot", "data": data}]
+            return [event for event in self.events if event["id"] > last_id]
+
+    def _has_news(self, last_id: Optional[int]) -> bool:
+        return (
+            last_id is None
+            or last_id != self.sequence
+            or self._pending_version != self._summary_version
+        )
+
+    def wait(self, last_id: Optional[int], timeout: float = KEEPALIVE_SECONDS) -> List[Dict[str, Any]]:
+        """Block until there is news after last_id (or timeout), then poll."""
+        with self._condition:
+            if not self._has_news(last_id):
+                self._condition.wait(timeout)
+        return self.poll(last_id)
+
+
+def format_event(event: Dict[str, Any]) -> bytes:
+    """One event in text/event-stream framing."""
+    data = json.dumps(event["data"], separators=(",", ":"))
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {data}\n\n".encode("utf-8")
+
+
+def stream_preamble() -> bytes:
+    return f"retry: {RETRY_MS}\n\n".encode("utf-8")
+
+
+def last_event_id(value: Optional[str]) -> Optional[int]:
+    """The Last-Event-ID header (or ?lastEventId=) as an int; None if absent or invalid."""
+    try:
+        return int(value) if value not in (None, "") else None
+    except ValueError:
+        return None
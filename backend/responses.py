@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+HR Agent Responses - Compact search payloads, fast JSON encoding, compression
+and conditional GET helpers
+Pure Python 3 standard library implementation (orjson/ujson used when installed)
+"""
+
+import gzip
+import hashlib
+import json
+import zlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional speedup
+    ujson = None
+
+
+# Fields sent for side-loaded jobs unless the client asks for more.
+# jdSnippet is by far the largest field, so it is opt-in.
+DEFAULT_JOB_FIELDS = ["title", "location", "skillsRequired"]
+
+# Bodies smaller than this are not worth the gzip header and CPU time
+GZIP_MIN_BYTES = 1024
+
+# Response encodings we can produce, in order of preference
+SUPPORTED_ENCODINGS = ("gzip", "deflate")
+
+
+def json_encoder_name() -> str:
+    """Return the name of the JSON encoder in use."""
+    if orjson is not None:
+        return "orjson"
+    if ujson is not None:
+        return "ujson"
+    return "json"
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes with the fastest available encoder."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    if ujson is not None:
+        return ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _pick(record: Dict[str, Any], fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """Return a copy of record restricted to fields (all fields if None)."""
+    if fields is None:
+        return dict(record)
+    return {field: record[field] for field in fields if field in record}
+
+
+def compact_search_results(
+    results: List[Dict[str, Any]],
+    fields: Optional[List[str]] = None,
+    job_fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Convert verbose search results into the compact, deduplicated format.
+    Candidates and jobs are referenced by ID and side-loaded once per response.
+    Returns: {format, count, results[], candidates{}, jobs{}}
+    """
+    if job_fields is None:
+        job_fields = DEFAULT_JOB_FIELDS
+
+    compact_results = []
+    candidates = {}
+    jobs = {}
+
+    for result in results:
+        candidate = result["candidate"]
+        candidate_id = candidate["id"]
+        if candidate_id not in candidates:
+            candidates[candidate_id] = _pick(candidate, fields)
+
+        job_refs = []
+        for rec in result.get("recommendedJobs", []):
+            job = rec["job"]
+            job_id = job["id"]
+            if job_id not in jobs:
+                jobs[job_id] = _pick(job, job_fields)
+            job_refs.append(
+                {
+                    "jobId": job_id,
+                    "matchScore": rec["matchScore"],
+                    "matchedSkills": rec["matchedSkills"],
+                    "locationMatch": rec["locationMatch"],
+                }
+            )
+
+        compact_results.append(
+            {
+                "candidateId": candidate_id,
+                "score": result["score"],
+                "reason": result["reason"],
+                "recommendedJobs": job_refs,
+            }
+        )
+
+    return {
+        "format": "compact",
+        "count": len(compact_results),
+        "results": compact_results,
+        "candidates": candidates,
+        "jobs": jobs,
+    }
+
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """Return True if an Accept-Encoding header value allows the given coding."""
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() not in (coding, "*"):
+            continue
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def encode_body(
+    obj: Any, use_gzip: bool = False, min_size: int = GZIP_MIN_BYTES
+) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Encode obj as JSON, gzip-compressing it if requested and large enough.
+    Returns: (body bytes, extra response headers)
+    """
+    body = dumps(obj)
+    headers = {}
+    if use_gzip and len(body) >= min_size:
+        body = compress(body, "gzip")
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return body, headers
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred supported content coding for an Accept-Encoding value."""
+    for coding in SUPPORTED_ENCODINGS:
+        if accepts_encoding(accept_encoding, coding):
+            return coding
+    return None
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    """Compress body with the given content coding (gzip or deflate)."""
+    if coding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    if coding == "deflate":
+        return zlib.compress(body, 6)
+    raise ValueError(f"Unsupported content coding: {coding}")
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from the parts identifying a representation.
+    Weak because the same data may be sent gzip, deflate or identity encoded.
+    """
+    digest = hashlib.sha1(
+        "|".join(str(part) for part in parts).encode("utf-8")
+    ).hexdigest()[:16]
+    return f'W/"{digest}"'
+
+
+def http_date(timestamp: float) -> str:
+    """Format a POSIX timestamp as an HTTP date (for Last-Modified)."""
+    return formatdate(timestamp, usegmt=True)
+
+
+def is_not_modified(
+    etag: str,
+    last_modified: float,
+    if_none_match: Optional[str] = None,
+    if_modified_since: Optional[str] = None,
+) -> bool:
+    """
+    Evaluate conditional request headers against the current representation.
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+    """
+    if if_none_match:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: ignore W/ prefixes on both sides
+        current = etag[2:] if etag.startswith("W/") else etag
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag == current:
+                return True
+        return False
+
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return int(last_modified) <= int(since)
+
+    return False
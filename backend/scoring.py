@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+HR Agent Scoring - Named scoring profiles compiled into scorer functions
+A profile sets the points of every search rule (skills, job skills,
+location bands, experience and availability windows, notes). Profiles are
+read from data/scoring_profiles.json as overrides of the default weights and
+compiled once: rules worth 0 points are left out and the weights become
+closure constants, so a custom profile scores a candidate as cheaply as the
+default one.
+Pure Python 3 standard library implementation
+"""
+
+import copy
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from geo import DEFAULT_RADIUS_KM, NEAR_POINTS, SAME_CITY_POINTS, WITHIN_RADIUS_POINTS
+
+PROFILES_FILE = "scoring_profiles.json"
+DEFAULT_PROFILE = "default"
+
+# The built-in weights; profiles override any of them
+DEFAULT_WEIGHTS = {
+    # Per filter skill: exact or fuzzy match / same 3-letter prefix
+    "skill": 2,
+    "fuzzySkill": 1,
+    # Per required skill of a matching job that the candidate has
+    "jobSkill": 1,
+    # Same city (or under 1 km), within half the radius, within the radius,
+    # partial name match for places the gazetteer does not know
+    "location": {
+        "exact": SAME_CITY_POINTS,
+        "near": NEAR_POINTS,
+        "withinRadius": WITHIN_RADIUS_POINTS,
+        "partial": 0.5,
+    },
+    # Within minExp/maxExp widened by rangeSlack years, or by nearSlack years
+    "experience": {"inRange": 1, "nearRange": 0.5, "rangeSlack": 1, "nearSlack": 2},
+    # Available within the query's window, or within soonDays
+    "availability": {"inWindow": 1, "soon": 0.5, "soonDays": 90},
+    # Best free-text (BM25) match on notes; others scale down
+    "notes": 2,
+}
+
+# Candidate -> (score, reasons)
+Scorer = Callable[[Dict[str, Any]], Tuple[float, List[str]]]
+
+
+def _merge_weights(overrides: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """DEFAULT_WEIGHTS with overrides applied; raises ValueError for unknown keys or bad values."""
+    weights = copy.deepcopy(DEFAULT_WEIGHTS)
+    if not isinstance(overrides, dict):
+        raise ValueError(f"Scoring profile {name} must be an object")
+    for key, value in overrides.items():
+        if key not in weights:
+            raise ValueError(f"Scoring profile {name}: unknown weight {key}")
+        if isinstance(weights[key], dict):
+            if not isinstance(value, dict):
+                raise ValueError(f"Scoring profile {name}: {key} must be an object")
+            for sub_key, sub_value in value.items():
+                if sub_key not in weights[key]:
+                    raise ValueError(f"Scoring profile {name}: unknown weight {key}.{sub_key}")
+                weights[key][sub_key] = _check_weight(sub_value, f"{name}: {key}.{sub_key}")
+        else:
+            weights[key] = _check_weight(value, f"{name}: {key}")
+    return weights
+
+
+def _check_weight(value: Any, label: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ValueError(f"Scoring profile {label} must be a number >= 0")
+    return value
+
+
+class ScoringProfile:
+    """
+    A named set of weights compiled into rule binders. bind() resolves a
+    query's filters once and returns the per-candidate scorer.
+    """
+
+    def __init__(self, name: str, overrides: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.weights = _merge_weights(overrides or {}, name)
+        self._binders = self._compile()
+
+    def _compile(self) -> List[Callable]:
+        """One binder per rule that can award points, in reason order."""
+        w = self.weights
+        binders = []
+        if w["skill"] or w["fuzzySkill"]:
+            binders.append(_skill_rule(w["skill"], w["fuzzySkill"]))
+        if w["jobSkill"]:
+            binders.append(_job_skill_rule(w["jobSkill"]))
+        if any(w["location"].values()):
+            binders.append(_location_rule(**w["location"]))
+        if w["experience"]["inRange"] or w["experience"]["nearRange"]:
+            binders.append(_experience_rule(**w["experience"]))
+        if w["availability"]["inWindow"] or w["availability"]["soon"]:
+            binders.append(_availability_rule(**w["availability"]))
+        if w["notes"]:
+            binders.append(_notes_rule())
+        return binders
+
+    def bind(
+        self,
+        backend,
+        filters: Dict[str, Any],
+        matching_jobs: List[Dict[str, Any]],
+        today,
+        text_scores: Dict[int, float],
+    ) -> Scorer:
+        """The scorer for one query; rules the filters do not use are dropped."""
+        rules = []
+        for binder in self._binders:
+            rule = binder(backend, filters, matching_jobs, today, text_scores)
+            if rule is not None:
+                rules.append(rule)
+        rules = tuple(rules)
+
+        def score(candidate: Dict[str, Any]) -> Tuple[float, List[str]]:
+            total = 0
+            reasons = []
+            for rule in rules:
+                total += rule(candidate, reasons)
+            return total, reasons
+
+        return score
+
+    def describe(self) -> Dict[str, Any]:
+        return {"name": self.name, "weights": copy.deepcopy(self.weights)}
+
+
+# Rule binders: (backend, filters, matching_jobs, today, text_scores) ->
+# rule(candidate, reasons) -> points, or None when the query does not use it
+
+
+def _skill_rule(skill_points: float, fuzzy_points: float):
+    def bind(backend, filters, matching_jobs, today, text_scores):
+        normalize = backend._normalize_skill
+        fuzzy_match = backend._fuzzy_match
+        filter_skills = [normalize(skill) for skill in filters.get("skills", [])]
+        if not filter_skills:
+            return None
+
+        def rule(candidate, reasons):
+            candidate_skills = [normalize(skill) for skill in candidate.get("skills", [])]
+            matched = []
+            fuzzy = []
+            for filter_skill in filter_skills:
+                for candidate_skill in candidate_skills:
+                    if fuzzy_match(filter_skill, candidate_skill):
+                        matched.append(filter_skill)
+                        break
+                    elif filter_skill[:3] == candidate_skill[:3]:
+                        fuzzy.append(filter_skill)
+                        break
+            points = 0
+            if matched and skill_points:
+                points += len(matched) * skill_points
+                reasons.append(f"{'+'.join(s.title() for s in matched)} match (+{len(matched) * skill_points})")
+            if fuzzy and fuzzy_points:
+                points += len(fuzzy) * fuzzy_points
+                reasons.append(f"Fuzzy skill match: {'+'.join(s.title() for s in fuzzy)} (+{len(fuzzy) * fuzzy_points})")
+            return points
+
+        return rule
+
+    return bind
+
+
+def _job_skill_rule(job_skill_points: float):
+    def bind(backend, filters, matching_jobs, today, text_scores):
+        normalize = backend._normalize_skill
+        job_skills = [
+            [skill.lower() for skill in job.get("skillsRequired", [])]
+            for job in matching_jobs
+        ]
+        job_skills = [skills for skills in job_skills if skills]
+        if not job_skills:
+            return None
+
+        def rule(candidate, reasons):
+            candidate_skills = [normalize(skill) for skill in candidate.get("skills", [])]
+            matches = 0
+            for skills in job_skills:
+                for job_skill in skills:
+                    for candidate_skill in candidate_skills:
+                        if job_skill in candidate_skill or candidate_skill in job_skill:
+                            matches += 1
+                            break
+            if not matches:
+                return 0
+            points = matches * job_skill_points
+            reasons.append(f"Job skills match (+{points})")
+            return points
+
+        return rule
+
+    return bind
+
+
+def _location_rule(exact: float, near: float, withinRadius: float, partial: float):
+    def bind(backend, filters, matching_jobs, today, text_scores):
+        display = filters.get("location", "")
+        filter_location = display.lower()
+        if not filter_location:
+            return None
+        distance_km = backend.gazetteer.distance_km
+        radius = filters.get("radiusKm", DEFAULT_RADIUS_KM)
+        half_radius = radius / 2
+
+        def rule(candidate, reasons):
+            candidate_location = candidate.get("location", "").lower()
+            if candidate_location == filter_location:
+                if exact:
+                    reasons.append(f"Location: {display} (exact match, +{exact})")
+                    return exact
+                reasons.append("Location: not matched")
+                return 0
+            distance = distance_km(filter_location, candidate_location)
+            if distance is not None:
+                if distance < 1:
+                    points = exact
+                elif distance <= half_radius:
+                    points = near
+                elif distance <= radius:
+                    points = withinRadius
+                else:
+                    points = 0
+                if points:
+                    reasons.append(
+                        f"Location: {candidate.get('location')}, {distance:g} km from {display} (+{points})"
+                    )
+                else:
+                    reasons.append(f"Location: {distance:g} km away")
+                return points
+            if partial and (filter_location in candidate_location or candidate_location in filter_location):
+                reasons.append(f"Location: partial match (+{partial})")
+                return partial
+            reasons.append("Location: not matched")
+            return 0
+
+        return rule
+
+    return bind
+
+
+def _experience_rule(inRange: float, nearRange: float, rangeSlack: float, nearSlack: float):
+    def bind(backend, filters, matching_jobs, today, text_scores):
+        if "minExp" not in filters or "maxExp" not in filters:
+            return None
+        bands = []
+        if inRange:
+            bands.append((filters["minExp"] - rangeSlack, filters["maxExp"] + rangeSlack, inRange, "in range"))
+        if nearRange:
+            bands.append((filters["minExp"] - nearSlack, filters["maxExp"] + nearSlack, nearRange, "near range"))
+        bands = tuple(bands)
+
+        def rule(candidate, reasons):
+            years = candidate.get("experienceYears", 0)
+            for low, high, points, label in bands:
+                if low <= years <= high:
+                    reasons.append(f"Experience: {years}y ({label}, +{points})")
+                    return points
+            reasons.append(f"Experience: {years}y (not matched)")
+            return 0
+
+        return rule
+
+    return bind
+
+
+def _availability_rule(inWindow: float, soon: float, soonDays: float):
+    soon_label = "Available within 3 months" if soonDays == 90 else f"Available within {soonDays:g} days"
+
+    def bind(backend, filters, matching_jobs, today, text_scores):
+        if "availabilityWindowDays" not in filters:
+            return None
+        window = filters["availabilityWindowDays"] if inWindow else -1
+        soon_days = soonDays if soon else -1
+
+        def rule(candidate, reasons):
+            value = candidate.get("availabilityDate", "")
+            if not value:
+                return 0
+            try:
+                days = (datetime.strptime(value, "%Y-%m-%d").date() - today).days
+            except ValueError:
+                return 0
+            if 0 <= days <= window:
+                if days <= 7:
+                    reasons.append(f"Available immediately (+{inWindow})")
+                elif days <= 30:
+                    reasons.append(f"Available this month (+{inWindow})")
+                else:
+                    reasons.append(f"Available soon (+{inWindow})")
+                return inWindow
+            if 0 <= days <= soon_days:
+                reasons.append(f"{soon_label} (+{soon})")
+                return soon
+            reasons.append("Availability not matched")
+            return 0
+
+        return rule
+
+    return bind
+
+
+def _notes_rule():
+    def bind(backend, filters, matching_jobs, today, text_scores):
+        if not text_scores:
+            return None
+
+        def rule(candidate, reasons):
+            points = text_scores.get(candidate["id"])
+            if not points:
+                return 0
+            reasons.append(f"Notes match (+{points})")
+            return points
+
+        return rule
+
+    return bind
+
+
+def load_profiles(data_dir: str) -> Dict[str, ScoringProfile]:
+    """
+    Profiles from data_dir/scoring_profiles.json ({name: weight overrides}),
+    plus "default" (the built-in weights unless the file overrides it).
+    Raises ValueError for invalid profiles.
+    """
+    overrides = {}
+    path = os.path.join(data_dir, PROFILES_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            overrides = json.load(f)
+        if not isinstance(overrides, dict):
+            raise ValueError(f"{PROFILES_FILE} must map profile names to weights")
+    profiles = {DEFAULT_PROFILE: ScoringProfile(DEFAULT_PROFILE)}
+    for name, weights in overrides.items():
+        profiles[name] = ScoringProfile(name, weights)
+    return profiles
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+HR Agent Similar - "More like this" candidate lookups
+Candidates are bucketed by MinHash LSH bands of their normalized skill set,
+so the candidates compared with a given one are those sharing a band
+rather than the whole pool. Those are ranked by weighted Jaccard similarity
+of skills (rare skills weigh more), then experience and location.
+Pure Python 3 standard library implementation
+"""
+
+import heapq
+import itertools
+import math
+from collections import Counter
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from dedup import minhash
+from geo import SAME_CITY_POINTS, distance_points
+
+# The 64 MinHash values are banded 2 rows at a time (32 bands): skill sets
+# sharing a fifth of their skills usually land in a common bucket
+SIMILAR_ROWS = 2
+
+# Most candidates compared per lookup, read from the smallest buckets first
+MAX_COMPARISONS = 2000
+
+# Share of the similarity from skills, experience and location
+SKILL_WEIGHT = 0.7
+EXPERIENCE_WEIGHT = 0.15
+LOCATION_WEIGHT = 0.15
+
+# Experience similarity falls to 0 at this many years apart
+EXPERIENCE_SPAN_YEARS = 5
+
+
+class SimilarityIndex:
+    """LSH buckets of candidate skill sets, maintained one record at a time."""
+
+    def __init__(self, normalize_skill: Callable[[str], str], gazetteer):
+        self.normalize_skill = normalize_skill
+        self.gazetteer = gazetteer
+        # candidate_id -> (skill set, experience years, lowercase location)
+        self.profiles = {}
+        self.buckets = {}
+        # Candidates per normalized skill, for the skill weights
+        self.skill_counts = Counter()
+        # Skill set -> band keys (and how many candidates have it); pools
+        # repeat the same skill sets a lot
+        self._bands = {}
+        self._skill_sets = Counter()
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def _skills(self, candidate: Dict[str, Any]) -> FrozenSet[str]:
+        return frozenset(
+            self.normalize_skill(skill).lower() for skill in candidate.get("skills", []) if skill.strip()
+        )
+
+    def _band_keys(self, skills: FrozenSet[str]) -> List[Tuple[int, int]]:
+        keys = self._bands.get(skills)
+        if keys is None:
+            signature = minhash(skills)
+            keys = [
+                (band, hash(signature[start:start + SIMILAR_ROWS]))
+                for band, start in enumerate(range(0, len(signature), SIMILAR_ROWS))
+            ]
+            self._bands[skills] = keys
+        return keys
+
+    def add(self, candidate: Dict[str, Any]):
+        self.remove(candidate["id"])
+        skills = self._skills(candidate)
+        location = candidate.get("location", "").lower()
+        self.profiles[candidate["id"]] = (skills, candidate.get("experienceYears", 0), location)
+        self.skill_counts.update(skills)
+        self._skill_sets[skills] += 1
+        for key in self._band_keys(skills):
+            self.buckets.setdefault(key, set()).add(candidate["id"])
+
+    def remove(self, candidate_id: int):
+        profile = self.profiles.pop(candidate_id, None)
+        if profile is None:
+            return
+        skills = profile[0]
+        for skill in skills:
+            self.skill_counts[skill] -= 1
+            if self.skill_counts[skill] <= 0:
+                del self.skill_counts[skill]
+        for key in self._band_keys(skills):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(candidate_id)
+                if not bucket:
+                    del self.buckets[key]
+        self._skill_sets[skills] -= 1
+        if self._skill_sets[skills] <= 0:
+            del self._skill_sets[skills]
+            self._bands.pop(skills, None)
+
+    def weight(self, skill: str) -> float:
+        """Inverse document frequency of a skill across the pool."""
+        return math.log(1 + len(self.profiles) / max(self.skill_counts.get(skill, 0), 1))
+
+    def weighted_jaccard(
+        self, a: FrozenSet[str], b: FrozenSet[str], weights: Optional[Dict[str, float]] = None
+    ) -> float:
+        """Shared skill weight over the union's; weights memoizes weight() across calls."""
+        weights = {} if weights is None else weights
+        union = shared = 0.0
+        for skill in a | b:
+            value = weights.get(skill)
+            if value is None:
+                value = weights[skill] = self.weight(skill)
+            union += value
+            if skill in a and skill in b:
+                shared += value
+        return shared / union if union else 0.0
+
+    def _location_similarity(self, a: str, b: str) -> float:
+        if a and a == b:
+            return 1.0
+        distance = self.gazetteer.distance_km(a, b)
+        if distance is None:
+            return 0.0
+        return distance_points(distance) / SAME_CITY_POINTS
+
+    def similar(self, candidate_id: int, k: int = 5) -> Optional[List[Dict[str, Any]]]:
+        """
+        The k candidates most like candidate_id, best first (None if not indexed).
+        Returns: [{id, similarity, sharedSkills, reasons}]
+        """
+        profile = self.profiles.get(candidate_id)
+        if profile is None:
+            return None
+        skills, years, location = profile
+        buckets = sorted(
+            (self.buckets[key] for key in self._band_keys(skills) if key in self.buckets), key=len
+        )
+        others = set()
+        for bucket in buckets:
+            others.update(itertools.islice(bucket, MAX_COMPARISONS - len(others)))
+        others.discard(candidate_id)
+
+        scored = []
+        weights = {}
+        for other_id in others:
+            other_skills, other_years, other_location = self.profiles[other_id]
+            skill_similarity = self.weighted_jaccard(skills, other_skills, weights)
+            experience_similarity = max(0.0, 1 - abs(years - other_years) / EXPERIENCE_SPAN_YEARS)
+            location_similarity = self._location_similarity(location, other_location)
+            similarity = round(
+                SKILL_WEIGHT * skill_similarity
+                + EXPERIENCE_WEIGHT * experience_similarity
+                + LOCATION_WEIGHT * location_similarity,
+                4,
+            )
+            scored.append((-similarity, other_id, skill_similarity, experience_similarity, location_similarity))
+        return [
+            {
+                "id": other_id,
+                "similarity": -negated,
+                "sharedSkills": sorted(skills & self.profiles[other_id][0]),
+                "reasons": [
+                    f"skills {skill_similarity:.2f}",
+                    f"experience {experience_similarity:.2f}",
+                    f"location {location_similarity:.2f}",
+                ],
+            }
+            for negated, other_id, skill_similarity, experience_similarity, location_similarity
+            in heapq.nsmallest(k, scored)
+        ]
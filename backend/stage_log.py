@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+HR Agent Stage Log - Timestamped pipeline stage transitions with daily rollups
+Every stage change is appended to stage_events.jsonl as a compact
+[timestamp, candidate id, from stage, to stage] line. Daily rollups
+(transitions into each stage, time spent in the stage left) are updated as
+events arrive and snapshotted to stage_rollups.json with the log offset they
+cover, so loading replays only the events written after the last snapshot.
+Pure Python 3 standard library implementation
+"""
+
+import bisect
+import heapq
+import json
+import os
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# Events appended between two rollup snapshots
+SNAPSHOT_EVERY = 1000
+
+SECONDS_PER_DAY = 86400
+
+
+def _day(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).date().isoformat()
+
+
+def _median(values: List[int]) -> Optional[float]:
+    """Median of an already sorted list, or None if it is empty."""
+    if not values:
+        return None
+    middle = len(values) // 2
+    if len(values) % 2:
+        return float(values[middle])
+    return (values[middle - 1] + values[middle]) / 2
+
+
+def _days(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds / SECONDS_PER_DAY, 2)
+
+
+class DailyRollup:
+    """One UTC day: transitions into each stage, exits and sorted time-in-stage per stage left."""
+
+    __slots__ = ("entered", "exited", "durations")
+
+    def __init__(self):
+        self.entered = Counter()
+        self.exited = Counter()
+        # stage -> sorted seconds spent in it by candidates who left it this day
+        self.durations = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"entered": self.entered, "exited": self.exited, "durations": self.durations}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DailyRollup":
+        rollup = cls()
+        rollup.entered.update(data.get("entered", {}))
+        rollup.exited.update(data.get("exited", {}))
+        rollup.durations = {stage: list(values) for stage, values in data.get("durations", {}).items()}
+        return rollup
+
+
+class StageLog:
+    """
+    Append-only stage transition log for the candidates in data_dir.
+    Rollups never need the log itself: record() updates them in place and
+    funnel() reads them, in time proportional to the days asked for.
+    """
+
+    def __init__(self, data_dir: str = "data", snapshot_every: int = SNAPSHOT_EVERY):
+        self.path = os.path.join(data_dir, "stage_events.jsonl")
+        self.snapshot_path = os.path.join(data_dir, "stage_rollups.json")
+        self.snapshot_every = snapshot_every
+        # candidate_id -> [stage, timestamp entered]
+        self.entered = {}
+        self.days = {}
+        self.events = 0
+        self._offset = 0
+        self._unsnapshotted = 0
+        self._file = None
+        self._lock = threading.Lock()
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self.entered = {int(cid): entry for cid, entry in snapshot["entered"].items()}
+            self.days = {day: DailyRollup.from_dict(data) for day, data in snapshot["days"].items()}
+            self.events = snapshot["events"]
+            self._offset = snapshot["offset"]
+        if not os.path.exists(self.path):
+            return
+        replayed = 0
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn final write: dropped, overwritten by the next append
+                self._apply(*json.loads(line))
+                self._offset += len(line)
+                replayed += 1
+        if os.path.getsize(self.path) > self._offset:
+            with open(self.path, "r+b") as f:
+                f.truncate(self._offset)
+        self._unsnapshotted = replayed
+        if replayed:
+            print(f"Replayed {replayed} stage events")
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _apply(self, timestamp: float, candidate_id: int, from_stage: Optional[str], to_stage: Optional[str]):
+        rollup = self.days.get(_day(timestamp))
+        if rollup is None:
+            rollup = self.days[_day(timestamp)] = DailyRollup()
+        previous = self.entered.pop(candidate_id, None)
+        if from_stage is not None:
+            rollup.exited[from_stage] += 1
+            if previous is not None and previous[0] == from_stage:
+                seconds = max(0, int(timestamp - previous[1]))
+                bisect.insort(rollup.durations.setdefault(from_stage, []), seconds)
+        if to_stage is not None:
+            rollup.entered[to_stage] += 1
+            self.entered[candidate_id] = [to_stage, timestamp]
+        self.events += 1
+
+    def record_many(self, events: List[List[Any]]):
+        """
+        Append [timestamp, candidate_id, from_stage, to_stage] events (a None
+        from_stage is a new candidate, a None to_stage a deleted one) with one
+        fsync, and fold them into the rollups.
+        """
+        if not events:
+            return
+        lines = "".join(json.dumps(event, separators=(",", ":"), ensure_ascii=False) + "\n" for event in events)
+        data = lines.encode("utf-8")
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "ab")
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._offset += len(data)
+            for event in events:
+                self._apply(*event)
+            self._unsnapshotted += len(events)
+            if self._unsnapshotted >= self.snapshot_every:
+                self._snapshot()
+
+    def record(
+        self,
+        candidate_id: int,
+        from_stage: Optional[str],
+        to_stage: Optional[str],
+        timestamp: Optional[float] = None,
+    ):
+        if timestamp is None:
+            timestamp = time.time()
+        self.record_many([[round(timestamp, 3), candidate_id, from_stage, to_stage]])
+
+    def _snapshot(self):
+        payload = {
+            "offset": self._offset,
+            "events": self.events,
+            "entered": self.entered,
+            "days": {day: rollup.to_dict() for day, rollup in self.days.items()},
+        }
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp_path, self.snapshot_path)
+        self._unsnapshotted = 0
+
+    def close(self):
+        with self._lock:
+            if self._unsnapshotted:
+                self._snapshot()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def time_in_stage(self, candidate_id: int, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """The candidate's current stage and days spent in it so far (None if never logged)."""
+        entry = self.entered.get(candidate_id)
+        if entry is None:
+            return None
+        now = time.time() if now is None else now
+        return {"stage": entry[0], "since": _day(entry[1]), "days": _days(now - entry[1])}
+
+    def funnel(self, start: Optional[date] = None, end: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Daily rollups between start and end (inclusive, UTC days), and their
+        totals: transitions into each stage, exits, and the median days
+        candidates spent in a stage before leaving it.
+        """
+        with self._lock:
+            days = sorted(
+                day for day in self.days
+                if (start is None or day >= start.isoformat()) and (end is None or day <= end.isoformat())
+            )
+            series = []
+            entered, exited = Counter(), Counter()
+            durations = {}
+            for day in days:
+                rollup = self.days[day]
+                entered.update(rollup.entered)
+                exited.update(rollup.exited)
+                for stage, values in rollup.durations.items():
+                    durations.setdefault(stage, []).append(values)
+                series.append({
+                    "date": day,
+                    "entered": dict(rollup.entered),
+                    "exited": dict(rollup.exited),
+                    "medianDaysInStage": {
+                        stage: _days(_median(values)) for stage, values in rollup.durations.items()
+                    },
+                })
+            medians = {
+                stage: _days(_median(list(heapq.merge(*lists)))) for stage, lists in durations.items()
+            }
+        return {
+            "days": series,
+            "totals": {
+                "entered": dict(entered),
+                "exited": dict(exited),
+                "medianDaysInStage": medians,
+            },
+        }
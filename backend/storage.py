@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+HR Agent Storage - Pluggable storage engines for candidates, jobs and shortlists
+JSONStorage (default) keeps the data/*.json files; SQLiteStorage uses sqlite3
+Pure Python 3 standard library implementation
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# shortlists.json layout version; version 1 was a bare {name: [list positions]}
+SHORTLISTS_SCHEMA_VERSION = 2
+
+# Journal entries replayed at load before the JSON files are rewritten
+JOURNAL_COMPACT_THRESHOLD = 1000
+
+
+def assign_ids(records: List[Dict[str, Any]]) -> bool:
+    """
+    Give every record without one a stable integer "id" (max existing + 1).
+    Returns: True if any IDs were assigned and the source needs rewriting
+    """
+    next_id = max((r["id"] for r in records if "id" in r), default=-1) + 1
+    assigned = False
+    for record in records:
+        if "id" not in record:
+            record["id"] = next_id
+            next_id += 1
+            assigned = True
+    return assigned
+
+
+def migrate_shortlists(
+    legacy: Dict[str, List[int]], candidates: List[Dict[str, Any]]
+) -> Dict[str, List[int]]:
+    """Convert version 1 shortlists (list positions) to candidate IDs."""
+    migrated = {}
+    for name, indices in legacy.items():
+        migrated[name] = [
+            candidates[i]["id"]
+            for i in indices
+            if isinstance(i, int) and 0 <= i < len(candidates)
+        ]
+    print(f"Migrated {len(migrated)} shortlists from list positions to candidate IDs")
+    return migrated
+
+
+def write_json(path: str, payload: Any):
+    """Write JSON atomically (temp file + rename) so readers never see half a file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class JSONStorage:
+    """
+    Default engine: candidates.json, jobs.json and shortlists.json in data_dir.
+    Single-record writes are appended (and fsynced) to journal.jsonl instead
+    of rewriting the JSON files; the journal is replayed on load and folded
+    into the files by compact().
+    """
+
+    name = "json"
+    FILES = {"candidate": "candidates.json", "job": "jobs.json"}
+
+    def __init__(self, data_dir: str = "data"):
+        self.data_dir = data_dir
+        self.journal_entries = 0
+        self._journal = None
+        self._journal_lock = threading.Lock()
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.data_dir, filename)
+
+    def _load_records(self, kind: str) -> List[Dict[str, Any]]:
+        path = self._path(self.FILES[kind])
+        with open(path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        if assign_ids(records):
+            write_json(path, records)
+        return self._replay(kind, records)
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        path = self._path("journal.jsonl")
+        if not os.path.exists(path):
+            return []
+        entries = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append; later lines are lost too
+                    print(f"Ignoring corrupt journal entry in {path}")
+                    break
+        return entries
+
+    def _replay(self, kind: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Apply journalled upserts and deletes of one kind to the loaded records."""
+        entries = [entry for entry in self._read_journal() if entry["kind"] == kind]
+        self.journal_entries += len(entries)
+        if not entries:
+            return records
+        by_id = {record["id"]: record for record in records}
+        for entry in entries:
+            if entry["op"] == "upsert":
+                by_id[entry["record"]["id"]] = entry["record"]
+            elif entry["op"] == "delete":
+                by_id.pop(entry["id"], None)
+        return list(by_id.values())
+
+    def _append(self, entry: Dict[str, Any]):
+        """Durably append one journal entry."""
+        self._append_many([entry])
+
+    def _append_many(self, entries: List[Dict[str, Any]]):
+        """Durably append journal entries with a single fsync."""
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        with self._journal_lock:
+            if self._journal is None:
+                self._journal = open(self._path("journal.jsonl"), "a", encoding="utf-8")
+            self._journal.write(lines)
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self.journal_entries += len(entries)
+
+    def load_candidates(self) -> List[Dict[str, Any]]:
+        return self._load_records("candidate")
+
+    def load_jobs(self) -> List[Dict[str, Any]]:
+        return self._load_records("job")
+
+    def upsert_candidate(self, candidate: Dict[str, Any]):
+        self._append({"op": "upsert", "kind": "candidate", "record": candidate})
+
+    def upsert_candidates(self, candidates: List[Dict[str, Any]]):
+        self._append_many([{"op": "upsert", "kind": "candidate", "record": c} for c in candidates])
+
+    def delete_candidate(self, candidate_id: int):
+        self._append({"op": "delete", "kind": "candidate", "id": candidate_id})
+
+    def delete_candidates(self, candidate_ids: List[int]):
+        self._append_many([{"op": "delete", "kind": "candidate", "id": i} for i in candidate_ids])
+
+    def upsert_job(self, job: Dict[str, Any]):
+        self._append({"op": "upsert", "kind": "job", "record": job})
+
+    def delete_job(self, job_id: int):
+        self._append({"op": "delete", "kind": "job", "id": job_id})
+
+    def needs_compaction(self) -> bool:
+        return self.journal_entries >= JOURNAL_COMPACT_THRESHOLD
+
+    def journal_mark(self) -> Tuple[int, int]:
+        """(bytes, entries) journalled so far; compact() drops only what the mark covers."""
+        with self._journal_lock:
+            journal_path = self._path("journal.jsonl")
+            size = os.path.getsize(journal_path) if os.path.exists(journal_path) else 0
+            return size, self.journal_entries
+
+    def compact(
+        self,
+        candidates: List[Dict[str, Any]],
+        jobs: List[Dict[str, Any]],
+        mark: Optional[Tuple[int, int]] = None,
+    ):
+        """
+        Rewrite the JSON files from the given records, then drop the journal
+        entries they include: all of them, or those up to mark (taken when
+        the records were). Writes journalled meanwhile stay in the journal;
+        replaying them over the new files is harmless.
+        """
+        write_json(self._path("candidates.json"), candidates)
+        write_json(self._path("jobs.json"), jobs)
+        with self._journal_lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            journal_path = self._path("journal.jsonl")
+            size, entries = mark if mark is not None else (None, self.journal_entries)
+            tail = b""
+            if size is not None and os.path.exists(journal_path):
+                with open(journal_path, "rb") as f:
+                    f.seek(size)
+                    tail = f.read()
+            if tail:
+                tmp_path = journal_path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(tail)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, journal_path)
+            elif os.path.exists(journal_path):
+                os.remove(journal_path)
+            self.journal_entries -= entries
+
+    def load_shortlists(self, candidates: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+        """Load shortlists (optional file), migrating version 1 files in place."""
+        path = self._path("shortlists.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        if stored.get("version") == SHORTLISTS_SCHEMA_VERSION:
+            return stored["shortlists"]
+        shortlists = migrate_shortlists(stored, candidates)
+        self.save_shortlists(shortlists)
+        return shortlists
+
+    def save_shortlists(self, shortlists: Dict[str, List[int]]):
+        write_json(
+            self._path("shortlists.json"),
+            {"version": SHORTLISTS_SCHEMA_VERSION, "shortlists": shortlists},
+        )
+
+    def save_shortlist(
+        self, name: str, candidate_ids: List[int], shortlists: Dict[str, List[int]]
+    ):
+        """Persist one shortlist; the JSON file has to be rewritten whole."""
+        self.save_shortlists(shortlists)
+
+    def close(self):
+        with self._journal_lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+
+class SQLiteStorage:
+    """
+    sqlite3 engine: one database file holding each record as a JSON document
+    keyed by ID; searches run on the in-memory indexes. Runs in WAL mode so
+    loads read concurrently with shortlist writes.
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS candidates (
+            id INTEGER PRIMARY KEY,
+            doc TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY,
+            doc TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS shortlists (
+            name TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            candidate_id INTEGER NOT NULL,
+            PRIMARY KEY (name, position)
+        ) WITHOUT ROWID;
+
+        -- Column indexes and skill tables of earlier versions; nothing queried them
+        DROP INDEX IF EXISTS idx_candidates_location;
+        DROP INDEX IF EXISTS idx_candidates_experience;
+        DROP INDEX IF EXISTS idx_candidates_availability;
+        DROP INDEX IF EXISTS idx_candidates_email;
+        DROP INDEX IF EXISTS idx_candidates_first_name;
+        DROP TABLE IF EXISTS candidate_skills;
+        DROP TABLE IF EXISTS job_skills;
+    """
+
+    def __init__(self, path: str, import_from: Optional[str] = None):
+        """
+        Open (and create) the database at path. If it is empty and import_from
+        names a data directory, candidates, jobs and shortlists are imported
+        from its JSON files.
+        """
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        # Every thread's connection, so close() can close them all
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+        conn = self._conn()
+        conn.executescript(self.SCHEMA)
+        if import_from and self._is_empty():
+            self.import_json(JSONStorage(import_from))
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets readers run alongside a writer."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Only its own thread uses it; close() may come from another one
+            conn = sqlite3.connect(self.path, cached_statements=256, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _is_empty(self) -> bool:
+        return self._conn().execute("SELECT 1 FROM candidates LIMIT 1").fetchone() is None
+
+    def import_json(self, source: JSONStorage):
+        """Copy all records from a JSON engine into this database."""
+        candidates = source.load_candidates()
+        jobs = source.load_jobs()
+        shortlists = source.load_shortlists(candidates)
+        with self._write_lock, self._conn() as conn:
+            for candidate in candidates:
+                self._upsert_candidate(conn, candidate)
+            for job in jobs:
+                self._upsert_job(conn, job)
+            for name, candidate_ids in shortlists.items():
+                self._write_shortlist(conn, name, candidate_ids)
+        print(f"Imported {len(candidates)} candidates and {len(jobs)} jobs into {self.path}")
+
+    def _upsert_candidate(self, conn: sqlite3.Connection, candidate: Dict[str, Any]):
+        conn.execute(
+            "INSERT OR REPLACE INTO candidates (id, doc) VALUES (?, ?)",
+            (candidate["id"], json.dumps(candidate, ensure_ascii=False)),
+        )
+
+    def _upsert_job(self, conn: sqlite3.Connection, job: Dict[str, Any]):
+        conn.execute(
+            "INSERT OR REPLACE INTO jobs (id, doc) VALUES (?, ?)",
+            (job["id"], json.dumps(job, ensure_ascii=False)),
+        )
+
+    def _write_shortlist(self, conn: sqlite3.Connection, name: str, candidate_ids: List[int]):
+        conn.execute("DELETE FROM shortlists WHERE name = ?", (name,))
+        conn.executemany(
+            "INSERT INTO shortlists (name, position, candidate_id) VALUES (?, ?, ?)",
+            [(name, position, cid) for position, cid in enumerate(candidate_ids)],
+        )
+
+    def load_candidates(self) -> List[Dict[str, Any]]:
+        rows = self._conn().execute("SELECT doc FROM candidates ORDER BY id")
+        return [json.loads(doc) for (doc,) in rows]
+
+    def load_jobs(self) -> List[Dict[str, Any]]:
+        rows = self._conn().execute("SELECT doc FROM jobs ORDER BY id")
+        return [json.loads(doc) for (doc,) in rows]
+
+    def load_shortlists(self, candidates: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+        shortlists = {}
+        rows = self._conn().execute(
+            "SELECT name, candidate_id FROM shortlists ORDER BY name, position"
+        )
+        for name, candidate_id in rows:
+            shortlists.setdefault(name, []).append(candidate_id)
+        return shortlists
+
+    def save_shortlist(
+        self, name: str, candidate_ids: List[int], shortlists: Dict[str, List[int]]
+    ):
+        """Persist one shortlist in its own transaction (other rows untouched)."""
+        with self._write_lock, self._conn() as conn:
+            self._write_shortlist(conn, name, candidate_ids)
+
+    def upsert_candidate(self, candidate: Dict[str, Any]):
+        self.upsert_candidates([candidate])
+
+    def upsert_candidates(self, candidates: List[Dict[str, Any]]):
+        """Write a batch of candidates in one transaction."""
+        with self._write_lock, self._conn() as conn:
+            for candidate in candidates:
+                self._upsert_candidate(conn, candidate)
+
+    def delete_candidate(self, candidate_id: int):
+        self.delete_candidates([candidate_id])
+
+    def delete_candidates(self, candidate_ids: List[int]):
+        """Delete a batch of candidates in one transaction."""
+        with self._write_lock, self._conn() as conn:
+            conn.executemany("DELETE FROM candidates WHERE id = ?", [(i,) for i in candidate_ids])
+
+    def upsert_job(self, job: Dict[str, Any]):
+        with self._write_lock, self._conn() as conn:
+            self._upsert_job(conn, job)
+
+    def delete_job(self, job_id: int):
+        with self._write_lock, self._conn() as conn:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def needs_compaction(self) -> bool:
+        return False
+
+    def journal_mark(self) -> None:
+        return None
+
+    def compact(
+        self,
+        candidates: List[Dict[str, Any]],
+        jobs: List[Dict[str, Any]],
+        mark: Optional[Tuple[int, int]] = None,
+    ):
+        pass
+
+    def close(self):
+        """Close the connection of every thread that opened one."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local.conn = None
+
+
+def open_storage(engine: str = "json", data_dir: str = "data"):
+    """
+    Create a storage engine by name. The sqlite engine keeps hr_agent.sqlite3
+    in data_dir and imports the JSON files on first use.
+    """
+    if engine == "json":
+        return JSONStorage(data_dir)
+    if engine == "sqlite":
+        return SQLiteStorage(os.path.join(data_dir, "hr_agent.sqlite3"), import_from=data_dir)
+    raise ValueError(f"Unknown storage engine: {engine}")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+HR Agent Suggest - Typeahead over the words search understands
+Skills (with their synonym keys), gazetteer cities (with aliases) and job
+titles are kept as one sorted array of lowercase keys, so a prefix is two
+bisections away from its matches; matches are ranked by how many
+candidates (or jobs, for titles) they cover.
+Pure Python 3 standard library implementation
+"""
+
+import bisect
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple
+
+DEFAULT_SUGGESTIONS = 8
+MAX_SUGGESTIONS = 25
+
+# Results for prefixes up to this long are memoized (they match the most keys)
+MEMO_PREFIX_LENGTH = 2
+
+# (key, kind, text, count, understood)
+Entry = Tuple[str, str, str, int, bool]
+
+
+class SuggestIndex:
+    """
+    Immutable sorted key array; rebuilt when the data changes (the
+    vocabulary is small next to the candidate pool).
+    """
+
+    def __init__(self, entries: Iterable[Entry]):
+        self.entries = sorted(set(entries))
+        self.keys = [entry[0] for entry in self.entries]
+        self._memo = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _matches(self, prefix: str) -> List[Entry]:
+        start = bisect.bisect_left(self.keys, prefix)
+        end = bisect.bisect_left(self.keys, prefix + "\uffff", start)
+        return self.entries[start:end]
+
+    def _ranked(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        memo_key = (prefix, limit)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+        # One suggestion per (kind, text), reached through its own name if it can be
+        best = {}
+        for key, kind, text, count, understood in self._matches(prefix):
+            current = best.get((kind, text))
+            if current is None or (key == text.lower(), -len(key)) > (
+                current["matched"] == text.lower(), -len(current["matched"])
+            ):
+                best[(kind, text)] = {
+                    "text": text, "kind": kind, "count": count, "understood": understood, "matched": key,
+                }
+        ranked = sorted(best.values(), key=lambda s: (-s["count"], len(s["text"]), s["text"]))[:limit]
+        if len(prefix) <= MEMO_PREFIX_LENGTH:
+            self._memo[memo_key] = ranked
+        return ranked
+
+    def suggest(self, text: str, limit: int = DEFAULT_SUGGESTIONS) -> Dict[str, Any]:
+        """
+        Complete the end of a query: the longest run of trailing words that
+        prefixes some key ("new yo" -> "New York", "react developers in ra"
+        -> "Rabat").
+        Returns: {completes, suggestions: [{text, kind, count, understood, matched}]}
+        """
+        words = text.lower().split()
+        if not words or text[-1:].isspace():
+            return {"completes": "", "suggestions": []}
+        for start in range(len(words)):
+            prefix = " ".join(words[start:])
+            suggestions = self._ranked(prefix, limit)
+            if suggestions:
+                return {"completes": prefix, "suggestions": suggestions}
+        return {"completes": "", "suggestions": []}
+
+
+def build_suggestions(
+    skill_counts: Mapping[str, int],
+    extra_skills: Iterable[str],
+    synonyms: Mapping[str, str],
+    normalize: Callable[[str], str],
+    understood: Callable[[str], bool],
+    location_counts: Mapping[str, int],
+    places: Iterable[Dict[str, Any]],
+    titles: Iterable[str],
+) -> SuggestIndex:
+    """
+    skill_counts: raw candidate skill -> candidates having it
+    extra_skills: other skill names to offer (job requirements)
+    synonyms: synonym key -> canonical skill (see SKILL_SYNONYMS)
+    understood: whether parse_query reads a skill key as a skill filter
+    location_counts: lowercase candidate location -> candidates there
+    places: gazetteer places ({name, aliases?})
+    titles: job titles (one per job)
+    """
+    entries = []
+
+    # Skills: spellings grouped by normalized skill, shown as the commonest one
+    spellings = {}
+    for raw in dict.fromkeys([*skill_counts, *extra_skills]):
+        if raw.strip():
+            spellings.setdefault(normalize(raw).lower(), Counter())[raw.strip()] += skill_counts.get(raw, 0)
+    canonical = {value.lower(): value for value in synonyms.values()}
+    for normalized, counts in spellings.items():
+        text = canonical.get(normalized) or max(sorted(counts), key=counts.get)
+        total = sum(counts.values())
+        for key in {normalized, text.lower(), *(raw.lower() for raw in counts)}:
+            entries.append((key, "skill", text, total, understood(key)))
+    for key, value in synonyms.items():
+        counts = spellings.get(value.lower(), {})
+        entries.append((key, "skill", value, sum(counts.values()) if counts else 0, understood(key)))
+
+    # Cities (and aliases) parse_query finds through the gazetteer
+    for place in places:
+        names = [place["name"]] + place.get("aliases", [])
+        total = sum(location_counts.get(name.lower(), 0) for name in names)
+        for name in names:
+            entries.append((name.lower(), "location", place["name"], total, True))
+
+    for title, count in Counter(t.strip() for t in titles if t.strip()).items():
+        entries.append((title.lower(), "title", title, count, False))
+    return SuggestIndex(entries)
+
+
+def suggestion_limit(value: Any) -> int:
+    """?limit= as an int in [1, MAX_SUGGESTIONS]; raises ValueError if not a number."""
+    return max(1, min(int(value), MAX_SUGGESTIONS))
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+HR Agent Tenants - One HRBackend per client company, loaded on demand
+Each tenant has its own data directory under the tenants root. Tenants are
+picked per request (X-Tenant header or a /t/<tenant>/ path prefix), loaded
+on first use and kept in an LRU bounded by count and by an estimate of
+their memory; tenants idle for too long are unloaded (journal folded into
+the data files first, so reloading does not replay it).
+Pure Python 3 standard library implementation
+"""
+
+import hmac
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from backend import HRBackend
+
+TENANT_HEADER = "X-Tenant"
+# Requests without a tenant use the process-wide backend (data/)
+DEFAULT_TENANT = "default"
+# WSGI environ key holding the tenant taken from the path prefix
+TENANT_ENVIRON = "hr_agent.tenant"
+# Operators listing every tenant send the HR_AGENT_ADMIN_TOKEN value here
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+TENANT_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+TENANT_PATH = re.compile(r"^/t/(?P<tenant>[^/]+)(?P<path>/.*)$")
+
+MAX_TENANTS = 16
+MEMORY_BUDGET_BYTES = 1024 * 1024 * 1024
+IDLE_SECONDS = 15 * 60
+# In-memory records and indexes take several times their size on disk
+MEMORY_PER_DISK_BYTE = 8
+
+_DATA_FILES = ("candidates.json", "jobs.json", "journal.jsonl", "hr_agent.sqlite3", "stage_events.jsonl")
+
+
+class UnknownTenant(LookupError):
+    pass
+
+
+def split_tenant_path(path: str) -> Tuple[Optional[str], str]:
+    """("acme", "/api/search") for "/t/acme/api/search"; (None, path) without a prefix."""
+    match = TENANT_PATH.match(path)
+    if match is None:
+        return None, path
+    return match.group("tenant"), match.group("path")
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """True if token is the configured admin token (no token configured: nobody is admin)."""
+    expected = os.environ.get("HR_AGENT_ADMIN_TOKEN")
+    return bool(expected) and token is not None and hmac.compare_digest(token, expected)
+
+
+def dataset_bytes(data_dir: str) -> int:
+    """Size on disk of a tenant's data files."""
+    total = 0
+    for name in _DATA_FILES:
+        path = os.path.join(data_dir, name)
+        if os.path.exists(path):
+            total += os.path.getsize(path)
+    return total
+
+
+class TenantPathMiddleware:
+    """WSGI middleware: strips a /t/<tenant> prefix and records the tenant in the environ."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        tenant, path = split_tenant_path(environ.get("PATH_INFO", ""))
+        if tenant is not None:
+            environ[TENANT_ENVIRON] = tenant
+            environ["SCRIPT_NAME"] = environ.get("SCRIPT_NAME", "") + f"/t/{tenant}"
+            environ["PATH_INFO"] = path
+        return self.app(environ, start_response)
+
+
+class _Tenant:
+    __slots__ = ("name", "backend", "services", "active", "last_used", "estimated_bytes")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.backend = None
+        # service name -> (backend it was built for, service)
+        self.services = {}
+        self.active = 0
+        self.last_used = time.monotonic()
+        self.estimated_bytes = 0
+
+    def busy(self) -> bool:
+        if self.active:
+            return True
+        imports = self.services.get("imports")
+        return imports is not None and imports[1].running()
+
+
+class TenantRegistry:
+    """
+    Tenant name -> loaded HRBackend. acquire() / release() bracket each
+    request; tenants with requests in flight or imports running are never
+    unloaded. The default tenant comes from default() and is never unloaded.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        default: Optional[Callable[[], HRBackend]] = None,
+        max_tenants: int = MAX_TENANTS,
+        memory_budget: int = MEMORY_BUDGET_BYTES,
+        idle_seconds: float = IDLE_SECONDS,
+        storage: Optional[str] = None,
+    ):
+        self.root = root or os.environ.get("HR_AGENT_TENANTS_DIR", os.path.join("data", "tenants"))
+        self.default = default
+        self.max_tenants = max_tenants
+        self.memory_budget = memory_budget
+        self.idle_seconds = idle_seconds
+        self.storage = storage or os.environ.get("HR_AGENT_STORAGE", "json")
+        self._tenants = OrderedDict()
+        self._default = _Tenant(DEFAULT_TENANT)
+        # Per-tenant counters, kept across unloads
+        self.stats = {}
+        self._lock = threading.Lock()
+        # Loading and unloading of one tenant are serialized by its own lock
+        self._name_locks = {}
+
+    def data_dir(self, name: str) -> str:
+        """A tenant's data directory; raises UnknownTenant for bad or missing tenants."""
+        if not TENANT_NAME.match(name or ""):
+            raise UnknownTenant(f"Invalid tenant: {name}")
+        path = os.path.join(self.root, name)
+        if not os.path.isdir(path):
+            raise UnknownTenant(f"Unknown tenant: {name}")
+        return path
+
+    def _stats(self, name: str) -> Dict[str, Any]:
+        return self.stats.setdefault(
+            name, {"requests": 0, "loads": 0, "evictions": 0, "lastLoadSeconds": None}
+        )
+
+    def is_loaded(self, name: str) -> bool:
+        tenant = self._default if name == DEFAULT_TENANT else self._tenants.get(name)
+        return tenant is not None and (tenant.backend is not None or name == DEFAULT_TENANT)
+
+    def acquire(self, name: Optional[str], evict: bool = True) -> HRBackend:
+        """
+        The tenant's backend, loading it if needed. Pair with release(name).
+        Raises UnknownTenant. evict=False skips unloading other tenants
+        (callers on an event loop do that elsewhere).
+        """
+        name = name or DEFAULT_TENANT
+        if name == DEFAULT_TENANT:
+            with self._lock:
+                self._default.active += 1
+                self._default.backend = self.default()
+                self._stats(name)["requests"] += 1
+            return self._default.backend
+        data_dir = self.data_dir(name)
+        with self._lock:
+            tenant = self._tenants.get(name)
+            if tenant is None:
+                tenant = self._tenants[name] = _Tenant(name)
+            self._tenants.move_to_end(name)
+            tenant.active += 1
+            tenant.last_used = time.monotonic()
+            self._stats(name)["requests"] += 1
+            name_lock = self._name_locks.setdefault(name, threading.Lock())
+        try:
+            with name_lock:
+                if tenant.backend is None:
+                    started = time.perf_counter()
+                    tenant.backend = HRBackend(data_dir, storage=self.storage)
+                    tenant.estimated_bytes = dataset_bytes(data_dir) * MEMORY_PER_DISK_BYTE
+                    with self._lock:
+                        stats = self._stats(name)
+                        stats["loads"] += 1
+                        stats["lastLoadSeconds"] = round(time.perf_counter() - started, 3)
+        except Exception:
+            self.release(name)
+            raise
+        if evict:
+            self.evict()
+        return tenant.backend
+
+    def release(self, name: Optional[str]):
+        name = name or DEFAULT_TENANT
+        with self._lock:
+            tenant = self._default if name == DEFAULT_TENANT else self._tenants.get(name)
+            if tenant is not None and tenant.active:
+                tenant.active -= 1
+                tenant.last_used = time.monotonic()
+
+    def service(self, name: Optional[str], key: str, factory: Callable[[HRBackend], Any]) -> Any:
+        """A per-tenant helper (e.g. its ImportManager), built on first use for the loaded backend."""
+        name = name or DEFAULT_TENANT
+        with self._lock:
+            tenant = self._default if name == DEFAULT_TENANT else self._tenants.get(name)
+            if tenant is None or tenant.backend is None:
+                raise UnknownTenant(f"Tenant not loaded: {name}")
+            built = tenant.services.get(key)
+            if built is None or built[0] is not tenant.backend:
+                built = tenant.services[key] = (tenant.backend, factory(tenant.backend))
+            return built[1]
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """
+        Unload idle tenants, then least recently used ones while over the
+        count or memory budget. Returns: the number unloaded
+        """
+        now = time.monotonic() if now is None else now
+        victims = []
+        with self._lock:
+            loaded = [t for t in self._tenants.values() if t.backend is not None]
+            total = sum(t.estimated_bytes for t in loaded)
+            for tenant in loaded:  # least recently used first
+                over = len(loaded) - len(victims) > self.max_tenants or total > self.memory_budget
+                idle = now - tenant.last_used > self.idle_seconds
+                if (over or idle) and not tenant.busy():
+                    victims.append(tenant)
+                    total -= tenant.estimated_bytes
+                    del self._tenants[tenant.name]
+                    self._stats(tenant.name)["evictions"] += 1
+        for tenant in victims:
+            with self._name_locks[tenant.name]:
+                tenant.backend.close()
+            print(f"Unloaded tenant {tenant.name}")
+        return len(victims)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Per-tenant request/load/eviction counters, memory estimates and search stats."""
+        now = time.monotonic()
+        with self._lock:
+            result = {}
+            for name, stats in self.stats.items():
+                tenant = self._default if name == DEFAULT_TENANT else self._tenants.get(name)
+                backend = tenant.backend if tenant is not None else None
+                result[name] = {
+                    **stats,
+                    "loaded": backend is not None,
+                    "activeRequests": tenant.active if tenant is not None else 0,
+                    "estimatedBytes": tenant.estimated_bytes if tenant is not None else 0,
+                    "idleSeconds": round(now - tenant.last_used, 1) if tenant is not None else None,
+                    "search": dict(backend.search_stats) if backend is not None else None,
+                }
+            return result
+
+    def listing(self, name: Optional[str], admin: bool = False) -> Dict[str, Any]:
+        """
+        What /api/tenants shows: every tenant's metrics to an admin, otherwise
+        only the calling tenant's own.
+        """
+        metrics = self.metrics()
+        if admin:
+            return metrics
+        name = name or DEFAULT_TENANT
+        return {name: metrics[name]} if name in metrics else {}
+
+    def close(self):
+        """Unload every tenant (server shutdown)."""
+        with self._lock:
+            tenants = list(self._tenants.values())
+            self._tenants.clear()
+        for tenant in tenants:
+            if tenant.backend is not None:
+                tenant.backend.close()
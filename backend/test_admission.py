@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Admission Test - Search deadlines (partial results), admission control, 503 load shedding
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import backend as backend_module
+from admission import AdmissionController, Deadline, Overloaded, parse_deadline_ms
+from backend import DEADLINE_CHECK_INTERVAL, HRBackend
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+SKILLS = ["React", "Python", "Django", "Node.js", "Docker", "AWS", "SQL"]
+LOCATIONS = ["Casablanca", "Rabat", "Sale", "Fez"]
+
+
+def _large_backend(tmp, size=2000):
+    hr_backend = HRBackend(tmp, search_cache_size=16)
+    rnd = random.Random(50)
+    hr_backend.create_candidates([
+        {
+            "firstName": f"Cand{i:04d}",
+            "lastName": "Test",
+            "email": f"cand{i}@example.com",
+            "skills": rnd.sample(SKILLS, rnd.randint(1, 4)),
+            "location": rnd.choice(LOCATIONS),
+            "experienceYears": rnd.randint(0, 10),
+        }
+        for i in range(size)
+    ])
+    return hr_backend
+
+
+def test_deadline_and_parsing():
+    deadline = Deadline(60)
+    assert not deadline.expired() and not deadline.reached and deadline.remaining() > 59
+    deadline.cap(0)
+    assert deadline.expired() and deadline.reached
+    assert parse_deadline_ms(None, 500) == 500 and parse_deadline_ms(10 ** 9) == 30000
+    for invalid in (0, -5, "soon", True):
+        with pytest.raises(ValueError):
+            parse_deadline_ms(invalid)
+
+
+def test_expired_deadline_returns_best_so_far(data_dir):
+    hr_backend = _large_backend(data_dir)
+    # Too many results wanted for the bounds to prune the scan
+    filters = hr_backend.parse_query("top 100 Python Django developers in Rabat")
+    deadline = Deadline(0)
+    partial = hr_backend.search_candidates(filters, deadline=deadline)
+    assert deadline.reached and DEADLINE_CHECK_INTERVAL <= len(partial) < 100
+    assert hr_backend.search_stats["partial"] == 1
+
+    # The partial answer was not cached; a search with time to spare is complete
+    deadline = Deadline(60)
+    full = hr_backend.search_candidates(filters, deadline=deadline)
+    assert not deadline.reached and hr_backend.search_stats["executed"] == 2
+    assert full == hr_backend.search_candidates(filters)
+    # The most promising candidates were scored first
+    assert partial[0]["score"] == full[0]["score"] and len(full) == 100
+    assert [r["score"] for r in partial] == sorted((r["score"] for r in partial), reverse=True)
+
+
+def test_admission_degrades_then_rejects():
+    controller = AdmissionController(degrade_after_ms=20, reject_after_ms=80, degraded_deadline_ms=5)
+    first = controller.admit(1000)
+    assert not first.degraded
+    time.sleep(0.04)
+    second = controller.admit(1000)
+    assert second.degraded
+    time.sleep(0.06)
+    with pytest.raises(Overloaded):
+        controller.admit(1000)
+
+    # Degraded searches get a short budget once they start
+    controller.started(first)
+    controller.started(second)
+    assert second.deadline.remaining() <= 0.005 and first.deadline.remaining() > 0.5
+    assert not controller.admit(1000).degraded
+    controller.finished(first)
+    metrics = controller.metrics()
+    assert metrics["admitted"] == 3 and metrics["degraded"] == 1 and metrics["rejected"] == 1
+    assert metrics["queued"] == 1 and metrics["lastWaitMs"] >= 50
+
+
+def test_search_endpoint_deadline_and_shedding(data_dir, api):
+    async def scenario(server, port):
+        body = {"query": "top 100 Python Django developers in Rabat", "deadlineMs": 0.001}
+        status, headers, data = await api.request(port, "POST", "/api/search", body)
+        assert status == 200 and headers["x-search-partial"] == "true" and "etag" not in headers
+        assert len(json.loads(data)) > 0
+        status, _, data = await api.request(port, "POST", "/api/search", dict(body, format="compact"))
+        assert status == 200 and json.loads(data)["partial"] is True
+        status, headers, _ = await api.request(port, "POST", "/api/search/export", body)
+        assert status == 200 and headers["x-search-partial"] == "true"
+
+        status, headers, _ = await api.request(port, "POST", "/api/search", dict(body, deadlineMs=60000))
+        assert status == 200 and "x-search-partial" not in headers and "etag" in headers
+        status, _, _ = await api.request(port, "POST", "/api/search", dict(body, deadlineMs="fast"))
+        assert status == 400
+
+        # A search stuck in the queue past the limit sheds new ones
+        stuck = server.admission.admit(1000)
+        await asyncio.sleep(0.06)
+        status, headers, _ = await api.request(port, "POST", "/api/search", {"query": "React"})
+        assert status == 503 and headers["retry-after"] == "1"
+        status, _, _ = await api.request(port, "POST", "/api/search/export", {"query": "React"})
+        assert status == 503
+        server.admission.finished(stuck)
+        status, _, _ = await api.request(port, "POST", "/api/search", {"query": "React"})
+        assert status == 200
+
+        status, _, data = await api.request(port, "GET", "/api/metrics")
+        admission = json.loads(data)["admission"]
+        assert admission["rejected"] == 2 and admission["partial"] == 3 and admission["queued"] == 0
+
+    controller = AdmissionController(degrade_after_ms=10, reject_after_ms=40)
+    api.run(_large_backend(data_dir), scenario, admission=controller)
+
+
+def test_flask_export_is_admitted(data_dir):
+    import api_server
+
+    previous = (backend_module._backend, api_server.admission)
+    backend_module._backend = _large_backend(data_dir)
+    api_server.admission = AdmissionController(reject_after_ms=20)
+    try:
+        client = api_server.app.test_client()
+        body = {"query": "top 100 Python Django developers in Rabat", "deadlineMs": 0.001}
+        response = client.post("/api/search/export", json=body)
+        assert response.status_code == 200 and response.headers["X-Search-Partial"] == "true"
+        assert api_server.admission.metrics()["partial"] == 1
+
+        stuck = api_server.admission.admit(1000)
+        time.sleep(0.04)
+        response = client.post("/api/search/export", json={"query": "React"})
+        assert response.status_code == 503 and response.headers["Retry-After"] == "1"
+        api_server.admission.finished(stuck)
+    finally:
+        backend_module._backend, api_server.admission = previous
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
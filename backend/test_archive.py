@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Archive Test - Hot/cold candidate tiers: migration, demotion/promotion, includeArchived search
+"""
+
+import json
+import os
+import random
+import shutil
+import sys
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import storage
+from backend import HRBackend
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+SKILLS = ["React", "Python", "Django", "Node.js", "Docker", "AWS", "SQL"]
+LOCATIONS = ["Casablanca", "Rabat", "Sale", "Fez"]
+STAGES = ["Applied", "Screening", "Interview", "Hired", "Rejected", "Withdrawn"]
+
+
+def _synthetic(size):
+    rnd = random.Random(8)
+    return [
+        {
+            "firstName": f"Cand{i:03d}",
+            "lastName": "Test",
+            "email": f"cand{i}@example.com",
+            "skills": rnd.sample(SKILLS, rnd.randint(0, 3)),
+            "location": rnd.choice(LOCATIONS),
+            "experienceYears": rnd.randint(0, 10),
+            "stage": rnd.choice(STAGES),
+        }
+        for i in range(size)
+    ]
+
+
+def test_load_moves_archived_stages_to_cold_tier(data_dir):
+    fsync = storage.os.fsync
+    syncs = []
+    try:
+        # The moved candidates leave the main storage in one durable append
+        storage.os.fsync = lambda fd: syncs.append(fd)
+        hr_backend = HRBackend(data_dir, archive=True)
+        storage.os.fsync = fsync
+        assert len(syncs) == 1
+        stages = {c["stage"] for c in hr_backend.candidates}
+        assert len(hr_backend.candidates) == 13 and not stages & {"Hired", "Rejected"}
+        assert len(hr_backend.archive) == 2 and 4 not in hr_backend.candidates_by_id
+        assert hr_backend.get_candidate(4)["stage"] == "Hired"
+        assert hr_backend.analytics_summary()["countByStage"]["Hired"] == 1
+        assert [c["id"] for c in hr_backend.candidates_in_stage("rejected")] == [7]
+        hr_backend.close()
+
+        # The main storage no longer holds them; reloading leaves the tiers as they were
+        reloaded = HRBackend(data_dir, archive=True)
+        assert len(reloaded.candidates) == 13 and len(reloaded.archive) == 2
+        assert len(HRBackend(data_dir).candidates) == 13
+    finally:
+        storage.os.fsync = fsync
+
+
+def test_stage_changes_demote_and_promote(data_dir):
+    hr_backend = HRBackend(data_dir, archive=True)
+    hr_backend.save_shortlist("Keep", [0, 4])
+    moved = hr_backend.move_candidate(0, "Withdrawn")
+    assert moved["stage"] == "Withdrawn" and 0 not in hr_backend.candidates_by_id
+    assert 0 not in {i for ids in hr_backend.candidate_ids_by_skill.values() for i in ids}
+    assert [c["id"] for c in hr_backend.get_shortlist_candidates("Keep")] == [0, 4]
+    assert all(r["id"] != 0 for r in hr_backend.search_candidates({"limit": 20}))
+
+    # Archived emails stay taken and IDs are not reused
+    with pytest.raises(ValueError):
+        hr_backend.create_candidate({"firstName": "X", "lastName": "Y", "email": hr_backend.get_candidate(4)["email"]})
+    created = hr_backend.create_candidate({"firstName": "New", "lastName": "Hire", "email": "new@x.com", "stage": "Hired"})
+    assert created["id"] == 15 and created["id"] in hr_backend.archive.ids()
+
+    promoted = hr_backend.move_candidate(0, "Interview")
+    assert promoted["stage"] == "Interview" and hr_backend.candidates_by_id[0] == hr_backend.get_candidate(0)
+    assert 0 not in hr_backend.archive.ids()
+    assert hr_backend.delete_candidate(4) and hr_backend.get_candidate(4) is None
+    assert hr_backend.shortlists["Keep"] == [0]
+
+    reloaded = HRBackend(data_dir, archive=True)
+    assert sorted(c["id"] for c in reloaded.candidates) == sorted(c["id"] for c in hr_backend.candidates)
+    assert reloaded.archive.ids() == {7, 15}
+
+
+def test_analytics_count_both_tiers(data_dir):
+    hr_backend = HRBackend(data_dir, archive=True)
+    hr_backend.move_candidate(0, "Hired")
+    assert hr_backend.analytics_summary()["countByStage"]["Hired"] == 2
+    assert hr_backend.analytics_summary(stage="Hired")["candidates"] == 2
+    current = hr_backend.stage_funnel()["current"]
+    assert current["Hired"] == 2 and current["Rejected"] == 1
+
+    # Moves within the archive, promotions and deletes keep the slices in step
+    hr_backend.move_candidate(0, "Rejected")
+    assert hr_backend.analytics_summary(stage="Rejected")["candidates"] == 2
+    hr_backend.move_candidate(0, "Interview")
+    hr_backend.delete_candidate(7)
+    assert hr_backend.analytics_summary(stage="Rejected")["candidates"] == 0
+    assert hr_backend.analytics_summary(stage="Hired")["candidates"] == 1
+
+    reloaded = HRBackend(data_dir, archive=True)
+    assert reloaded.analytics_summary(stage="Hired")["candidates"] == 1
+    assert reloaded.stage_funnel()["current"] == hr_backend.stage_funnel()["current"]
+
+
+def test_include_archived_equals_untiered_search(data_dir, tmp_path):
+    plain_dir = shutil.copytree(data_dir, tmp_path / "plain")
+    tiered = HRBackend(data_dir, archive=True)
+    plain = HRBackend(plain_dir)
+    records = _synthetic(300)
+    tiered.create_candidates(records)
+    plain.create_candidates(records)
+    assert len(tiered.candidates) + len(tiered.archive) == len(plain.candidates)
+    for query in ["React developers in Rabat", "Python Django 5 years", "Docker AWS", "anyone"]:
+        filters = dict(tiered.parse_query(query), limit=10)
+        expected = [(r["id"], r["score"]) for r in plain.search_candidates(filters)]
+        found = tiered.search_candidates(dict(filters, includeArchived=True))
+        assert [(r["id"], r["score"]) for r in found] == expected, query
+        hot_only = tiered.search_candidates(filters)
+        assert all(r["id"] in tiered.candidates_by_id for r in hot_only)
+    explained = tiered.explain_search(dict(tiered.parse_query("Docker"), includeArchived=True))
+    assert explained["plan"]["execution"]["archiveScanned"] == len(tiered.archive)
+
+    # Notes are matched within the archive too
+    tiered.create_candidate({
+        "firstName": "Zed", "lastName": "Old", "email": "zed@x.com", "stage": "Rejected",
+        "notes": "Maintains a quantum compiler",
+    })
+    filters = dict(tiered.parse_query("quantum compiler"), includeArchived=True)
+    assert tiered.search_candidates(filters)[0]["candidate"]["firstName"] == "Zed"
+
+
+def test_search_endpoint_include_archived(data_dir, api):
+    async def scenario(server, port):
+        body = {"filters": {"skills": ["Python"], "limit": 15}}
+        status, _, hot = await api.request(port, "POST", "/api/search", body)
+        assert status == 200 and len(json.loads(hot)) == 13
+        status, _, everyone = await api.request(port, "POST", "/api/search", dict(body, includeArchived=True))
+        assert status == 200 and {r["id"] for r in json.loads(everyone)} >= {4, 7}
+        status, _, candidate = await api.request(port, "GET", "/api/candidates/7")
+        assert status == 200 and json.loads(candidate)["stage"] == "Rejected"
+
+    api.run(HRBackend(data_dir, archive=True), scenario)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
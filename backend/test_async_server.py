@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Async Server Test - Routes, conditional GET and search cancellation on disconnect
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+class SlowBackend(HRBackend):
+    """Backend whose scoring is slow enough to observe cancellation."""
+
+    def _score_candidate(self, *args, **kwargs):
+        time.sleep(0.002)
+        return super()._score_candidate(*args, **kwargs)
+
+
+def test_routes_and_conditional_get(api):
+    async def scenario(server, port):
+        status, headers, body = await api.request(port, "POST", "/api/search", {"query": "React developer"})
+        assert status == 200
+        assert json.loads(body)[0]["score"] > 0
+
+        status, headers, _ = await api.request(port, "GET", "/api/analytics")
+        assert status == 200
+        status, _, _ = await api.request(port, "GET", "/api/analytics", headers={"If-None-Match": headers["etag"]})
+        assert status == 304
+
+        status, _, body = await api.request(port, "GET", "/api/candidates/0")
+        assert json.loads(body)["id"] == 0
+        status, _, _ = await api.request(port, "GET", "/api/nope")
+        assert status == 404
+
+    api.run(HRBackend(DATA_DIR), scenario)
+
+
+def test_search_cancelled_on_disconnect_and_reads_not_blocked(api):
+    backend = SlowBackend(DATA_DIR, search_cache_size=0)
+    # ~6s of scoring: 3000 distinct candidates, and a limit the planner cannot prune below
+    backend.candidates = [dict(c, id=i) for i, c in enumerate(backend.candidates * 200)]
+    backend._build_indexes()
+
+    async def scenario(server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        payload = json.dumps({"query": "top 5000 React developers"}).encode()
+        writer.write(
+            f"POST /api/search HTTP/1.1\r\nContent-Length: {len(payload)}\r\n\r\n".encode() + payload
+        )
+        await writer.drain()
+        await asyncio.sleep(0.1)
+
+        # Cheap reads are answered while the search is running
+        started = time.perf_counter()
+        status, _, _ = await api.request(port, "GET", "/api/shortlists")
+        assert status == 200
+        assert time.perf_counter() - started < 1.0
+
+        writer.close()
+        for _ in range(50):
+            if server.searches_cancelled:
+                break
+            await asyncio.sleep(0.05)
+        assert server.searches_cancelled == 1
+
+        # The single search worker was released well before the scan would end
+        started = time.perf_counter()
+        backend.candidates = backend.candidates[:15]
+        backend._build_indexes()
+        status, _, _ = await api.request(port, "POST", "/api/search", {"query": "React"})
+        assert status == 200
+        assert time.perf_counter() - started < 3.0
+
+    api.run(backend, scenario)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Bitmap Test - Bitset algebra vs Python sets, shortlist set operations, scoped search
+"""
+
+import json
+import os
+import random
+import sys
+from datetime import datetime
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend
+from bitmap import SET_OPERATIONS, Bitmap, combine
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+SKILLS = ["React", "Python", "Django", "Node.js", "Docker", "AWS", "SQL"]
+LOCATIONS = ["Casablanca", "Rabat", "Sale", "Fez"]
+
+
+def test_bitmap_matches_python_sets():
+    rnd = random.Random(11)
+    reference = {
+        "union": set.union,
+        "intersection": set.intersection,
+        "difference": set.difference,
+        "symmetric_difference": lambda *sets: set(
+            [i for s in sets for i in s if sum(i in t for t in sets) % 2]
+        ),
+    }
+    for _ in range(50):
+        sets = [set(rnd.sample(range(5000), rnd.randint(0, 300))) for _ in range(rnd.randint(1, 4))]
+        bitmaps = [Bitmap.from_ids(s) for s in sets]
+        for bitmap, members in zip(bitmaps, sets):
+            assert list(bitmap) == sorted(members) and len(bitmap) == len(members)
+            assert all(i in bitmap for i in members) and -1 not in bitmap
+        for operation in SET_OPERATIONS:
+            assert set(combine(operation, bitmaps)) == reference[operation](*sets), operation
+    assert not Bitmap.from_ids([]) and combine("union", []) == Bitmap()
+    with pytest.raises(ValueError):
+        combine("complement", [Bitmap()])
+    with pytest.raises(ValueError):
+        Bitmap.from_ids([3, -1])
+
+
+def test_combine_shortlists_and_upkeep(data_dir):
+    hr_backend = HRBackend(data_dir)
+    ids = [c["id"] for c in hr_backend.candidates]
+    hr_backend.save_shortlist("A", ids[:4])
+    hr_backend.save_shortlist("B", ids[2:6])
+    both = hr_backend.combine_shortlists("intersection", ["A", "B"], save_as="A and B")
+    assert both["ids"] == sorted(ids[2:4]) and both["count"] == 2 and both["saved"]
+    assert hr_backend.shortlists["A and B"] == sorted(ids[2:4])
+    assert hr_backend.combine_shortlists("difference", ["A", "B"])["ids"] == sorted(ids[:2])
+    assert hr_backend.combine_shortlists("union", ["A", "Missing"]) is None
+    with pytest.raises(ValueError):
+        hr_backend.combine_shortlists("union", [])
+
+    # Deletes and merges keep the bitmaps in step with the ordered lists
+    hr_backend.delete_candidate(ids[2])
+    hr_backend.merge_candidates(ids[0], [ids[5]])
+    for name, members in hr_backend.shortlists.items():
+        assert list(hr_backend.shortlist_bitmaps[name]) == sorted(members)
+    assert ids[2] not in hr_backend.shortlist_members("A")
+    assert ids[0] in hr_backend.shortlist_members("B")
+
+    fresh = HRBackend(data_dir)
+    assert fresh.shortlist_bitmaps == hr_backend.shortlist_bitmaps
+
+
+def test_scoped_search_equals_filtered_full_scan(data_dir):
+    hr_backend = HRBackend(data_dir)
+    hr_backend.search_cache_size = 0
+    rnd = random.Random(4)
+    for i in range(400):
+        hr_backend.create_candidate({
+            "firstName": f"Cand{i:03d}",
+            "lastName": "Test",
+            "email": f"cand{i}@example.com",
+            "skills": rnd.sample(SKILLS, rnd.randint(0, 3)),
+            "location": rnd.choice(LOCATIONS),
+            "experienceYears": rnd.randint(0, 10),
+        })
+    members = rnd.sample([c["id"] for c in hr_backend.candidates], 60)
+    hr_backend.save_shortlist("Pool", members)
+    for query in ["React developers in Rabat", "Python 5 years", "anyone"]:
+        filters = dict(hr_backend.parse_query(query), limit=8)
+        scoped = hr_backend.search_candidates(dict(filters, shortlist="Pool"))
+        assert len(scoped) == 8 and {r["id"] for r in scoped} <= set(members)
+        # Reference: score every member and keep the top 8
+        matching_jobs = hr_backend._find_matching_jobs(filters)
+        text_scores = hr_backend._text_scores(filters)
+        today = datetime.now().date()
+        reference = sorted(
+            (
+                hr_backend._score_candidate(
+                    hr_backend.candidates_by_id[i], filters, matching_jobs, today, text_scores
+                )
+                for i in members
+            ),
+            key=lambda r: (-r["score"], r["candidate"].get("firstName", ""), r["id"]),
+        )[:8]
+        assert [(r["id"], r["score"]) for r in scoped] == [(r["id"], r["score"]) for r in reference], query
+    with pytest.raises(ValueError):
+        hr_backend.search_candidates({"skills": ["React"], "shortlist": "Nope"})
+
+
+def test_shortlist_combine_endpoint(api):
+    async def scenario(server, port):
+        status, _, body = await api.request(
+            port, "POST", "/api/shortlists/combine",
+            {"operation": "union", "shortlists": ["Test Shortlist"]},
+        )
+        assert status == 200 and json.loads(body)["ids"] == [0, 1, 2]
+        status, _, _ = await api.request(
+            port, "POST", "/api/shortlists/combine", {"operation": "union", "shortlists": ["Nope"]}
+        )
+        assert status == 404
+        status, _, _ = await api.request(
+            port, "POST", "/api/shortlists/combine", {"operation": "xor", "shortlists": ["Test Shortlist"]}
+        )
+        assert status == 400
+        status, _, body = await api.request(
+            port, "POST", "/api/search", {"query": "React developers", "shortlist": "Test Shortlist"}
+        )
+        assert status == 200 and {r["id"] for r in json.loads(body)} <= {0, 1, 2}
+
+    api.run(HRBackend(DATA_DIR), scenario)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Candidate ID Test - Stable IDs, hash indexes and shortlist migration
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend
+from storage import SHORTLISTS_SCHEMA_VERSION
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def _legacy_data_dir():
+    """Copy data/ without IDs and with a position-based shortlist."""
+    tmp = tempfile.mkdtemp()
+    for name in ("candidates.json", "jobs.json"):
+        with open(os.path.join(DATA_DIR, name), encoding="utf-8") as f:
+            records = json.load(f)
+        for record in records:
+            record.pop("id", None)
+        with open(os.path.join(tmp, name), "w", encoding="utf-8") as f:
+            json.dump(records, f)
+    with open(os.path.join(tmp, "shortlists.json"), "w", encoding="utf-8") as f:
+        json.dump({"Legacy": [2, 0, 99]}, f)
+    return tmp
+
+
+def test_legacy_data_is_migrated():
+    """IDs are assigned once, persisted, and old shortlists map to them"""
+    tmp = _legacy_data_dir()
+    try:
+        hr_backend = HRBackend(tmp)
+        third = hr_backend.candidates[2]
+        assert hr_backend.shortlists["Legacy"] == [third["id"], hr_backend.candidates[0]["id"]]
+
+        with open(os.path.join(tmp, "shortlists.json"), encoding="utf-8") as f:
+            stored = json.load(f)
+        assert stored["version"] == SHORTLISTS_SCHEMA_VERSION
+
+        # Reloading keeps the same IDs and does not migrate again
+        reloaded = HRBackend(tmp)
+        assert [c["id"] for c in reloaded.candidates] == [c["id"] for c in hr_backend.candidates]
+        assert reloaded.shortlists == hr_backend.shortlists
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_lookups_by_id_and_email():
+    hr_backend = HRBackend(DATA_DIR)
+    candidate = hr_backend.candidates[4]
+    assert hr_backend.get_candidate(candidate["id"]) is candidate
+    assert hr_backend.find_candidate_by_email(candidate["email"].upper()) is candidate
+    assert hr_backend.get_candidate(-1) is None
+    assert hr_backend.get_job(hr_backend.jobs[0]["id"]) is hr_backend.jobs[0]
+
+
+def test_shortlists_survive_reordering():
+    """Shortlists reference IDs, so reordering candidates does not corrupt them"""
+    tmp = tempfile.mkdtemp()
+    try:
+        for name in ("candidates.json", "jobs.json"):
+            shutil.copy(os.path.join(DATA_DIR, name), tmp)
+        hr_backend = HRBackend(tmp)
+        target = hr_backend.candidates[3]
+        assert hr_backend.save_shortlist("Pick", [target["id"]])
+
+        path = os.path.join(tmp, "candidates.json")
+        with open(path, encoding="utf-8") as f:
+            candidates = json.load(f)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(list(reversed(candidates)), f)
+
+        reloaded = HRBackend(tmp)
+        assert reloaded.get_shortlist_candidates("Pick")[0]["email"] == target["email"]
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
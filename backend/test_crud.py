@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+CRUD Test - Candidate and job writes, incremental indexes and journal durability
+"""
+
+import json
+import os
+import sys
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import storage
+from backend import HRBackend
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+NEW_CANDIDATE = {
+    "firstName": "Salma",
+    "lastName": "Idrissi",
+    "email": "salma.idrissi@email.com",
+    "location": "Casablanca",
+    "experienceYears": 2,
+    "skills": ["React", "Elixir"],
+    "availabilityDate": "2025-11-01",
+    "notes": "Maintains an open source charting library",
+}
+
+
+def _assert_matches_rebuild(hr_backend):
+    """Incrementally maintained state equals a from-scratch rebuild."""
+    fresh = HRBackend.__new__(HRBackend)
+    fresh.candidates = list(hr_backend.candidates)
+    fresh.jobs = list(hr_backend.jobs)
+    fresh._build_indexes()
+    assert hr_backend.stage_counts == fresh.stage_counts
+    assert hr_backend.candidate_skill_counts == fresh.candidate_skill_counts
+    assert hr_backend.job_location_counts == fresh.job_location_counts
+    assert hr_backend.job_skill_counts == fresh.job_skill_counts
+    assert hr_backend.candidate_ids_by_skill == fresh.candidate_ids_by_skill
+    assert hr_backend.candidate_ids_by_email == fresh.candidate_ids_by_email
+    assert hr_backend.notes_index.postings == fresh.notes_index.postings
+    assert hr_backend.job_text_index.postings == fresh.job_text_index.postings
+    for position, candidate in enumerate(hr_backend.candidates):
+        assert hr_backend._candidate_positions[candidate["id"]] == position
+
+
+def test_candidate_writes_update_indexes(data_dir):
+    hr_backend = HRBackend(data_dir)
+    created = hr_backend.create_candidate(NEW_CANDIDATE)
+    assert created["id"] == max(c["id"] for c in hr_backend.candidates)
+    assert created["stage"] == "Applied"
+    assert hr_backend.find_candidate_by_email("SALMA.IDRISSI@email.com") is created
+    assert created["id"] in hr_backend.candidate_ids_by_skill["elixir"]
+    assert hr_backend.analytics_summary()["countByStage"]["Applied"] == sum(
+        1 for c in hr_backend.candidates if c["stage"] == "Applied"
+    )
+    _assert_matches_rebuild(hr_backend)
+
+    results = hr_backend.search_candidates(hr_backend.parse_query("charting"))
+    assert results[0]["id"] == created["id"]
+
+    updated = hr_backend.update_candidate(created["id"], {"stage": "Interview", "skills": ["Go"]})
+    assert updated["stage"] == "Interview" and updated["firstName"] == "Salma"
+    assert "elixir" not in hr_backend.candidate_ids_by_skill
+    _assert_matches_rebuild(hr_backend)
+
+    hr_backend.save_shortlist("Picks", [0, created["id"]])
+    first = hr_backend.candidates[0]
+    assert hr_backend.delete_candidate(first["id"])
+    assert not hr_backend.delete_candidate(first["id"])
+    assert hr_backend.get_candidate(first["id"]) is None
+    assert hr_backend.shortlists["Picks"] == [created["id"]]
+    _assert_matches_rebuild(hr_backend)
+
+
+def test_invalid_payloads_are_rejected(data_dir):
+    hr_backend = HRBackend(data_dir)
+    existing = hr_backend.candidates[0]
+    bad_payloads = [
+        {**NEW_CANDIDATE, "email": existing["email"]},
+        {**NEW_CANDIDATE, "experienceYears": "two"},
+        {**NEW_CANDIDATE, "availabilityDate": "soon"},
+        {**NEW_CANDIDATE, "favouriteColour": "blue"},
+        {"firstName": "NoEmail", "lastName": "X"},
+    ]
+    for payload in bad_payloads:
+        try:
+            hr_backend.create_candidate(payload)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted invalid payload {payload}")
+    assert hr_backend.update_candidate(-1, {"stage": "Hired"}) is None
+    assert len(hr_backend.candidates) == len(HRBackend(data_dir).candidates)
+
+
+def test_job_writes_refresh_recommendations(data_dir):
+    hr_backend = HRBackend(data_dir)
+    candidate = hr_backend.create_candidate({**NEW_CANDIDATE, "skills": ["Elixir"], "location": "Tokyo"})
+    before = hr_backend.search_candidates({"skills": ["Elixir"], "limit": 1})[0]
+    assert before["recommendedJobs"] == []
+
+    job = hr_backend.create_job({
+        "title": "Elixir Engineer",
+        "location": "Casablanca",
+        "skillsRequired": ["Elixir", "Phoenix"],
+    })
+    after = hr_backend.search_candidates({"skills": ["Elixir"], "limit": 1})[0]
+    assert after["id"] == candidate["id"]
+    assert after["recommendedJobs"][0]["jobId"] == job["id"]
+    assert hr_backend.search_jobs_fulltext("elixir")[0]["job"]["id"] == job["id"]
+
+    hr_backend.update_job(job["id"], {"location": "Rabat"})
+    assert hr_backend.analytics_summary()["jobStats"]["locationBreakdown"]["Rabat"] >= 1
+    assert hr_backend.delete_job(job["id"])
+    final = hr_backend.search_candidates({"skills": ["Elixir"], "limit": 1})[0]
+    assert final["recommendedJobs"] == []
+    _assert_matches_rebuild(hr_backend)
+
+
+def test_writes_are_journalled_and_compacted(data_dir):
+    original_threshold = storage.JOURNAL_COMPACT_THRESHOLD
+    try:
+        with open(os.path.join(data_dir, "candidates.json"), "rb") as f:
+            original_bytes = f.read()
+        hr_backend = HRBackend(data_dir)
+        created = hr_backend.create_candidate(NEW_CANDIDATE)
+        hr_backend.update_candidate(created["id"], {"stage": "Offer"})
+        hr_backend.delete_candidate(hr_backend.candidates[1]["id"])
+
+        # The JSON file is untouched; the journal holds the writes
+        with open(os.path.join(data_dir, "candidates.json"), "rb") as f:
+            assert f.read() == original_bytes
+        with open(os.path.join(data_dir, "journal.jsonl")) as f:
+            assert len(f.readlines()) == 3
+
+        reloaded = HRBackend(data_dir)
+        assert reloaded.get_candidate(created["id"])["stage"] == "Offer"
+        assert sorted(reloaded.candidates_by_id) == sorted(hr_backend.candidates_by_id)
+
+        storage.JOURNAL_COMPACT_THRESHOLD = 2
+        reloaded.update_candidate(created["id"], {"notes": "Compacted"})
+        # Compaction runs in the background, off the write lock
+        compaction = reloaded._compaction
+        if compaction is not None:
+            compaction.join()
+        assert not os.path.exists(os.path.join(data_dir, "journal.jsonl"))
+        with open(os.path.join(data_dir, "candidates.json")) as f:
+            on_disk = {c["id"]: c for c in json.load(f)}
+        assert on_disk[created["id"]]["notes"] == "Compacted"
+        assert len(on_disk) == len(reloaded.candidates)
+    finally:
+        storage.JOURNAL_COMPACT_THRESHOLD = original_threshold
+
+
+def test_sqlite_writes_persist(data_dir):
+    hr_backend = HRBackend(data_dir, storage="sqlite")
+    created = hr_backend.create_candidate(NEW_CANDIDATE)
+    job = hr_backend.create_job({"title": "Elixir Engineer", "skillsRequired": ["Elixir"]})
+    hr_backend.delete_candidate(hr_backend.candidates[0]["id"])
+
+    reloaded = HRBackend(data_dir, storage="sqlite")
+    assert reloaded.get_candidate(created["id"]) == created
+    assert reloaded.get_job(job["id"]) == job
+    assert sorted(reloaded.candidates_by_id) == sorted(hr_backend.candidates_by_id)
+    # The pre-filter sees the new skill without a vocabulary rebuild
+    results = reloaded.search_candidates({"skills": ["Elixir"], "limit": 1})
+    assert results[0]["id"] == created["id"]
+
+
+def test_crud_routes(data_dir, api):
+    async def scenario(server, port):
+        status, _, body = await api.request(port, "POST", "/api/candidates", NEW_CANDIDATE)
+        assert status == 201
+        candidate_id = json.loads(body)["id"]
+
+        status, _, body = await api.request(port, "PATCH", f"/api/candidates/{candidate_id}", {"stage": "Hired"})
+        assert status == 200 and json.loads(body)["stage"] == "Hired"
+        status, _, _ = await api.request(port, "PUT", f"/api/candidates/{candidate_id}", {"stage": "Hired"})
+        assert status == 400
+        status, _, _ = await api.request(port, "DELETE", f"/api/candidates/{candidate_id}")
+        assert status == 200
+        status, _, _ = await api.request(port, "GET", f"/api/candidates/{candidate_id}")
+        assert status == 404
+
+        status, _, body = await api.request(port, "POST", "/api/jobs", {"title": "Data Engineer"})
+        assert status == 201
+        job_id = json.loads(body)["id"]
+        status, _, _ = await api.request(port, "DELETE", f"/api/jobs/{job_id}")
+        assert status == 200
+        status, _, _ = await api.request(port, "DELETE", f"/api/jobs/{job_id}")
+        assert status == 404
+
+    api.run(HRBackend(data_dir), scenario)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Cube Test - Analytics slices against brute-force counts, kept up to date by writes
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import Counter
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend
+from cube import AnalyticsCube, experience_band
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def _brute_force(candidates, location=None, stage=None, band=None):
+    matching = [
+        c for c in candidates
+        if (location is None or c["location"].lower() == location.lower())
+        and (stage is None or c["stage"].lower() == stage.lower())
+        and (band is None or experience_band(c["experienceYears"]) == band)
+    ]
+    skills = Counter(skill for c in matching for skill in set(c["skills"]))
+    return matching, skills
+
+
+def test_slices_match_brute_force():
+    with open(os.path.join(DATA_DIR, "candidates.json")) as f:
+        candidates = json.load(f)
+    cube = AnalyticsCube()
+    for candidate in candidates:
+        cube.add_candidate(candidate)
+
+    locations = {c["location"] for c in candidates}
+    stages = {c["stage"] for c in candidates}
+    for location in list(locations)[:3] + [None]:
+        for stage in list(stages)[:3] + [None]:
+            for band in ("2-4", None):
+                matching, skills = _brute_force(candidates, location, stage, band)
+                result = cube.slice(location, stage, experience=band)
+                assert result["candidates"] == len(matching)
+                assert result["topSkills"] == sorted(skills.items(), key=lambda item: (-item[1], item[0]))[:10]
+                assert sum(result["countByStage"].values()) == len(matching)
+                if skills:
+                    skill = next(iter(skills))
+                    assert cube.slice(location, stage, skill.upper(), band)["candidates"] == skills[skill]
+
+
+def test_cube_follows_writes(data_dir):
+    hr_backend = HRBackend(data_dir)
+    before = hr_backend.analytics_summary(location="Tangier", stage="Interview")["candidates"]
+    candidate = hr_backend.create_candidate({
+        "firstName": "Ilyas", "lastName": "Amrani", "email": "ilyas.cube@example.com",
+        "location": "Tangier", "stage": "Interview", "experienceYears": 12, "skills": ["Rust"],
+    })
+    result = hr_backend.analytics_summary(location="tangier", stage="interview", experience="10+")
+    assert result["candidates"] >= 1 and ["Rust", 1] in [list(pair) for pair in result["topSkills"]]
+    assert hr_backend.analytics_summary(location="Tangier", stage="Interview")["candidates"] == before + 1
+
+    hr_backend.update_candidate(candidate["id"], {"stage": "Offer"})
+    assert hr_backend.analytics_summary(location="Tangier", stage="Interview")["candidates"] == before
+    hr_backend.delete_candidate(candidate["id"])
+    assert hr_backend.analytics_summary(skill="rust")["candidates"] == 0
+
+    job = hr_backend.create_job({"title": "Rust Engineer", "location": "Tangier", "skillsRequired": ["Rust"]})
+    gap = hr_backend.analytics_summary(location="Tangier")["skillsAnalysis"]["gap"]
+    assert {"skill": "Rust", "demand": 1, "supply": 0} in gap
+    hr_backend.delete_job(job["id"])
+    with pytest.raises(ValueError):
+        hr_backend.analytics_summary(experience="senior")
+    assert "locationBreakdown" in hr_backend.analytics_summary()["jobStats"]
+
+
+def test_unfiltered_summary_during_writes(data_dir):
+    hr_backend = HRBackend(data_dir)
+    done = threading.Event()
+
+    def churn():
+        # Skills that appear and vanish add and delete Counter keys
+        for i in range(300):
+            candidate = hr_backend.create_candidate({
+                "firstName": "Churn", "lastName": str(i), "email": f"churn{i}@example.com",
+                "skills": [f"Skill{i}-{n}" for n in range(5)],
+            })
+            hr_backend.delete_candidate(candidate["id"])
+        done.set()
+
+    before = hr_backend.analytics_summary()
+    writer = threading.Thread(target=churn)
+    writer.start()
+    while not done.is_set():
+        summary = hr_backend.analytics_summary()
+        assert sum(summary["countByStage"].values()) >= sum(before["countByStage"].values())
+    writer.join()
+    after = hr_backend.analytics_summary()
+    assert after["countByStage"] == before["countByStage"] and after["topSkills"] == before["topSkills"]
+
+
+def test_analytics_route_filters(data_dir, api):
+    async def scenario(server, port):
+        status, headers, body = await api.request(port, "GET", "/api/analytics?stage=Applied")
+        assert status == 200
+        assert set(json.loads(body)["countByStage"]) == {"Applied"}
+        _, plain_headers, _ = await api.request(port, "GET", "/api/analytics")
+        assert plain_headers["etag"] != headers["etag"]
+        status, _, _ = await api.request(port, "GET", "/api/analytics?experience=lots")
+        assert status == 400
+
+    api.run(HRBackend(data_dir), scenario)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
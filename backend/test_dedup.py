@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Dedup Test - Blocking keys, duplicate clusters, ingestion checks and merges
+"""
+
+import json
+import os
+import random
+import sys
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import DuplicateCandidate, HRBackend
+from dedup import DuplicateDetector, find_duplicate_clusters, name_skeleton, normalize_email, normalize_phone
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def test_normalized_keys():
+    assert normalize_email(" Amina.Benali+linkedin@Email.com ") == "amina.benali@email.com"
+    assert normalize_phone("+212 6 12-34-56-78") == normalize_phone("0612345678")
+    assert normalize_phone("123") == ""
+    assert name_skeleton("Youssef El-Amrani") == name_skeleton("yousef el amrani")
+
+
+def test_clusters_compare_only_within_blocks():
+    rnd = random.Random(3)
+    first_names = ["Amina", "Omar", "Sara", "Youssef", "Zineb", "Karim", "Hajar", "Mehdi"]
+    skills = ["React", "Python", "SQL", "Docker", "Java", "Go", "AWS", "Node.js", "Vue", "Django"]
+    syllables = ["ben", "al", "ka", "di", "ri", "ta", "hi", "za", "ou", "ni", "el", "mou", "sa", "ra", "fi"]
+    records = [
+        {
+            "id": i,
+            "firstName": rnd.choice(first_names),
+            "lastName": "".join(rnd.sample(syllables, 4)).title(),
+            "email": f"person{i}@email.com",
+            "skills": rnd.sample(skills, 3),
+            "notes": rnd.choice(["completed bootcamp", "cloud experience", ""]),
+        }
+        for i in range(5000)
+    ]
+    base = len(records)
+    # Re-exported from other sourcing tools: new IDs, slightly different details
+    records.append({**records[10], "id": base, "email": "PERSON10@email.com"})
+    misspelled = records[20]["lastName"] + "e"
+    records.append({**records[20], "id": base + 1, "email": "p20@other.com", "lastName": misspelled})
+    records.append({**records[30], "id": base + 2, "email": "p30@other.com", "phone": "0611111111"})
+    records[30]["phone"] = "+212 611 111 111"
+    # Same name, nothing else in common: a namesake, not a duplicate
+    records.append({
+        "id": base + 3,
+        "firstName": records[40]["firstName"],
+        "lastName": records[40]["lastName"],
+        "email": "other40@email.com",
+        "skills": ["Haskell"],
+        "notes": "quant finance",
+    })
+
+    clusters, stats = find_duplicate_clusters(records)
+    groups = [cluster["ids"] for cluster in clusters]
+    assert [10, base] in groups
+    assert [20, base + 1] in groups
+    assert [30, base + 2] in groups
+    assert not any(base + 3 in ids for ids in groups)
+    # A pairwise scan would need ~12.5 million comparisons
+    assert stats["comparisons"] < 50 * len(records)
+
+
+def test_snapshot_ignores_later_writes():
+    detector = DuplicateDetector()
+    record = {"firstName": "Amina", "lastName": "Alaoui", "skills": ["React", "SQL"], "notes": "bootcamp"}
+    for i in range(3):
+        detector.add({"id": i, **record})
+    snapshot = detector.snapshot()
+    detector.remove(1)
+    detector.add({"id": 3, **record})
+
+    clusters, _ = snapshot.clusters()
+    assert [cluster["ids"] for cluster in clusters] == [[0, 1, 2]]
+    assert [cluster["ids"] for cluster in detector.clusters()[0]] == [[0, 2, 3]]
+
+
+def test_ingestion_check_and_merge(data_dir):
+    hr_backend = HRBackend(data_dir)
+    original = hr_backend.get_candidate(0)
+    hr_backend.save_shortlist("finalists", [0, 1])
+    variant = {
+        "firstName": original["firstName"],
+        "lastName": original["lastName"],
+        "email": original["email"].upper().replace("@", "+github@"),
+        "skills": ["Kubernetes"],
+    }
+    with pytest.raises(DuplicateCandidate) as caught:
+        hr_backend.create_candidate(variant, allow_duplicates=False)
+    assert caught.value.duplicates[0]["id"] == 0
+    assert "same email" in caught.value.duplicates[0]["reasons"]
+
+    # Stored anyway (e.g. an import that reviews duplicates later)
+    variant["email"] = "a.other@email.com"
+    variant["skills"] = original["skills"] + ["Kubernetes"]
+    copy = hr_backend.create_candidate(variant)
+    hr_backend.save_shortlist("later", [copy["id"], 2])
+    assert [0, copy["id"]] in [c["ids"] for c in hr_backend.duplicate_clusters()["clusters"]]
+
+    merged = hr_backend.merge_candidates(0, [copy["id"]])
+    assert merged["email"] == original["email"]
+    assert merged["skills"] == original["skills"] + ["Kubernetes"]
+    assert hr_backend.get_candidate(copy["id"]) is None
+    assert hr_backend.shortlists["later"] == [0, 2]
+    assert hr_backend.find_duplicates(hr_backend.get_candidate(0)) == []
+    with pytest.raises(ValueError):
+        hr_backend.merge_candidates(0, [9999])
+    assert hr_backend.merge_candidates(9999, [1]) is None
+
+
+def test_duplicate_routes(data_dir, api):
+    async def scenario(server, port):
+        original = server.backend.get_candidate(1)
+        payload = {k: original[k] for k in ("firstName", "lastName", "skills", "notes")}
+        payload["email"] = "second.address@email.com"
+        status, _, body = await api.request(port, "POST", "/api/candidates", payload)
+        assert status == 409
+        assert json.loads(body)["duplicates"][0]["id"] == 1
+
+        status, _, body = await api.request(port, "POST", "/api/candidates?allowDuplicates=true", payload)
+        assert status == 201
+        copy_id = json.loads(body)["id"]
+        status, _, body = await api.request(port, "GET", "/api/duplicates")
+        assert [1, copy_id] in [c["ids"] for c in json.loads(body)["clusters"]]
+
+        status, _, body = await api.request(
+            port, "POST", "/api/duplicates/merge", {"survivorId": 1, "duplicateIds": [copy_id]}
+        )
+        assert status == 200 and json.loads(body)["id"] == 1
+        status, _, body = await api.request(port, "POST", "/api/duplicates/check", payload)
+        assert [m["id"] for m in json.loads(body)] == [1]
+
+    api.run(HRBackend(data_dir), scenario)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Export Test - Streaming CSV/XLSX encoding and the export routes
+"""
+
+import csv
+import io
+import os
+import sys
+import zipfile
+from xml.etree import ElementTree
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import backend as backend_module
+from backend import HRBackend
+from export import ROWS_PER_CHUNK, iter_csv, iter_xlsx
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SHEET_NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def _rows(count):
+    for i in range(count):
+        yield {"id": i, "firstName": f"Name <{i}> & co", "skills": ["SQL", "Go"], "notes": "=HYPERLINK(x)"}
+
+
+def _sheet_rows(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        root = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+    rows = []
+    for row in root.iterfind(".//s:row", SHEET_NS):
+        values = []
+        for cell in row:
+            text = cell.find(".//s:t", SHEET_NS)
+            values.append(text.text if text is not None else cell.find("s:v", SHEET_NS).text)
+        rows.append(values)
+    return rows
+
+
+def _unchunk(body):
+    """Decode a chunked transfer-encoded body."""
+    data = b""
+    while True:
+        size_line, _, body = body.partition(b"\r\n")
+        size = int(size_line, 16)
+        if size == 0:
+            return data
+        data += body[:size]
+        body = body[size + 2:]
+
+
+def test_csv_streams_in_chunks():
+    columns = ["id", "firstName", "skills", "notes"]
+    chunks = list(iter_csv(_rows(2000), columns))
+    assert len(chunks) == 2000 // ROWS_PER_CHUNK
+    assert max(len(chunk) for chunk in chunks) < 2 * len(chunks[0])
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert rows[0] == columns
+    assert rows[1] == ["0", "Name <0> & co", "SQL; Go", "'=HYPERLINK(x)"]
+    assert len(rows) == 2001
+
+
+def test_xlsx_is_a_valid_workbook():
+    chunks = list(iter_xlsx(_rows(1000), ["id", "firstName", "skills"]))
+    assert len(chunks) > 1000 // ROWS_PER_CHUNK
+    rows = _sheet_rows(b"".join(chunks))
+    assert rows[0] == ["id", "firstName", "skills"]
+    assert rows[1] == ["0", "Name <0> & co", "SQL; Go"]
+    assert len(rows) == 1001
+
+
+def test_export_routes(data_dir, api):
+    async def scenario(server, port):
+        shortlist = [3, 1, 2]
+        server.backend.save_shortlist("frontend_team", shortlist)
+        path = "/api/shortlists/frontend_team/export?columns=id,firstName,email"
+        status, headers, body = await api.request(port, "GET", path)
+        assert status == 200 and headers["transfer-encoding"] == "chunked"
+        rows = list(csv.reader(io.StringIO(_unchunk(body).decode("utf-8"))))
+        assert rows[0] == ["id", "firstName", "email"]
+        assert [int(row[0]) for row in rows[1:]] == shortlist
+
+        status, headers, body = await api.request(port, "GET", "/api/shortlists/frontend_team/export?format=xlsx")
+        assert headers["content-type"].startswith("application/vnd.openxmlformats")
+        assert len(_sheet_rows(_unchunk(body))) == len(shortlist) + 1
+
+        status, _, body = await api.request(
+            port, "POST", "/api/search/export?columns=id,score", {"query": "React developer"}
+        )
+        rows = list(csv.reader(io.StringIO(_unchunk(body).decode("utf-8"))))
+        assert rows[0] == ["id", "score"] and float(rows[1][1]) > 0
+
+        status, _, _ = await api.request(port, "GET", "/api/shortlists/frontend_team/export?columns=salary")
+        assert status == 400
+        status, _, _ = await api.request(port, "GET", "/api/shortlists/frontend_team/export?format=pdf")
+        assert status == 400
+        status, _, _ = await api.request(port, "GET", "/api/shortlists/nope/export")
+        assert status == 404
+
+    api.run(HRBackend(data_dir), scenario)
+
+
+def test_flask_export_streams(data_dir):
+    from api_server import app
+
+    previous = backend_module._backend
+    backend_module._backend = HRBackend(data_dir)
+    try:
+        backend_module._backend.save_shortlist("frontend_team", [3, 1, 2])
+        response = app.test_client().get(
+            "/api/shortlists/frontend_team/export?format=csv", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.status_code == 200 and response.is_streamed
+        assert "Content-Encoding" not in response.headers
+        assert response.get_data().decode("utf-8").startswith("id,firstName,lastName")
+    finally:
+        backend_module._backend = previous
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
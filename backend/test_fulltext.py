@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Full-Text Test - Tokenizer, positional index, BM25 and notes search
+"""
+
+import os
+import sys
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend
+from fulltext import InvertedIndex, tokenize
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def test_tokenize():
+    assert tokenize("Strong React skills, completed bootcamp recently") == [
+        "strong", "react", "skill", "completed", "bootcamp", "recently"
+    ]
+    assert tokenize("Node.js and C++ with the team") == ["node.js", "c++", "team"]
+
+
+def test_bm25_prefers_rarer_and_denser_terms():
+    index = InvertedIndex()
+    index.add(1, "cloud cloud engineer")
+    index.add(2, "cloud engineer with a long and detailed background in many things")
+    index.add(3, "frontend engineer")
+    scores = index.search(["cloud"])
+    assert set(scores) == {1, 2}
+    assert scores[1] > scores[2]
+    assert index.idf("cloud") > index.idf("engineer")
+
+
+def test_phrase_and_incremental_updates():
+    index = InvertedIndex()
+    index.add(1, "good design sense")
+    index.add(2, "sense of design")
+    assert index.phrase_docs(["design", "sense"]) == {1}
+
+    index.remove(1, "good design sense")
+    assert index.phrase_docs(["design", "sense"]) == set()
+    assert "good" not in index.postings
+    index.add(2, "design sense matters")
+    assert index.phrase_docs(["design", "sense"]) == {2}
+    assert len(index) == 1
+
+
+def test_parse_query_keeps_free_text():
+    hr_backend = HRBackend(DATA_DIR)
+    filters = hr_backend.parse_query('React developer with bootcamp, "design sense"')
+    assert filters["skills"] == ["React"]
+    assert filters["text"] == ["bootcamp"]
+    assert filters["phrases"] == [["design", "sense"]]
+
+    # Fully understood queries parse exactly as before
+    filters = hr_backend.parse_query("Find top 5 React developers in Casablanca, 1-3 years")
+    assert "text" not in filters
+
+    # Common words are not matched against notes
+    filters = hr_backend.parse_query("someone who knows React and has worked with Docker")
+    assert filters["skills"] == ["React", "Docker"] and "text" not in filters
+
+
+def test_structured_text_drops_stop_words_and_filter_words():
+    hr_backend = HRBackend(DATA_DIR)
+    filters = {"skills": ["React"], "location": "Casablanca", "text": ["Knows", "react", "casablanca", "bootcamp"]}
+    assert hr_backend._free_text_terms(filters) == ["bootcamp"]
+    scores = hr_backend._text_scores(filters)
+    assert scores and scores == hr_backend._text_scores({"text": ["bootcamp"]})
+    assert hr_backend._text_scores({"text": ["know", "with"]}) == {}
+
+
+def test_notes_match_blends_into_search():
+    hr_backend = HRBackend(DATA_DIR)
+    results = hr_backend.search_candidates(hr_backend.parse_query("bootcamp"))
+    top = results[0]
+    assert "bootcamp" in top["candidate"]["notes"]
+    assert "Notes match (+2.0)" in top["reason"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Geo Test - Gazetteer lookups, grid index vs brute force, distance-banded search
+"""
+
+import json
+import os
+import random
+import sys
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend
+from geo import GridIndex, distance_points, get_gazetteer, haversine_km
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def test_gazetteer_and_distances():
+    gazetteer = get_gazetteer()
+    assert gazetteer.lookup("Fès")["name"] == "Fez"
+    assert gazetteer.lookup("tanger")["region"].startswith("Tanger")
+    assert 20 < gazetteer.distance_km("Casablanca", "Mohammedia") < 30
+    assert gazetteer.distance_km("Casa", "casablanca") == 0
+    assert gazetteer.distance_km("Casablanca", "Atlantis") is None
+    assert 1700 < haversine_km(gazetteer.point("Rabat"), gazetteer.point("Paris")) < 1900
+    assert [distance_points(d) for d in (0, 20, 40, 80)] == [1, 0.75, 0.5, 0]
+
+
+def test_grid_matches_brute_force():
+    rnd = random.Random(7)
+    grid = GridIndex()
+    points = {i: (rnd.uniform(-60, 70), rnd.uniform(-180, 180)) for i in range(3000)}
+    for key, point in points.items():
+        grid.add(key, point)
+    for key in range(0, 3000, 3):
+        grid.remove(key)
+        del points[key]
+    for _ in range(50):
+        center = (rnd.uniform(-60, 70), rnd.uniform(-180, 180))
+        radius = rnd.choice([50, 300, 1500])
+        expected = {key for key, point in points.items() if haversine_km(center, point) <= radius}
+        assert {key for key, _ in grid.near(center, radius)} == expected
+
+
+def test_search_scores_nearby_cities(data_dir):
+    hr_backend = HRBackend(data_dir, search_cache_size=0)
+    filters = hr_backend.parse_query("React developer within 30 km of Casablanca")
+    assert filters["location"] == "Casablanca" and filters["radiusKm"] == 30
+    assert hr_backend.parse_query("Python devs in Fès")["location"] == "Fez"
+
+    nearby = hr_backend.create_candidate({
+        "firstName": "Yasmine", "lastName": "Tahiri", "email": "yasmine@x.com",
+        "location": "Mohammedia", "skills": ["Haskell"],
+    })
+    results = hr_backend.search_candidates({"skills": ["Haskell"], "location": "Casablanca", "limit": 3})
+    top = results[0]
+    assert top["id"] == nearby["id"] and top["score"] == 2.75
+    assert "km from Casablanca (+0.75)" in top["reason"]
+    far = hr_backend.search_candidates({"skills": ["Haskell"], "location": "Casablanca", "radiusKm": 10, "limit": 1})
+    assert far[0]["score"] == 2
+
+    near = hr_backend.candidates_near("Casablanca", 30)
+    assert [r["candidate"]["location"] for r in near][-1] == "Mohammedia"
+    assert {r["candidate"]["location"] for r in near} == {"Casablanca", "Mohammedia"}
+    hr_backend.delete_candidate(nearby["id"])
+    assert "mohammedia" not in hr_backend.location_grid.points
+
+    # A Rabat job matches a search around Sale (3 km away)
+    jobs = hr_backend._find_matching_jobs({"location": "Sale"})
+    assert jobs and all(job["location"] == "Rabat" for job in jobs)
+
+
+def test_candidates_near_route(api):
+    async def scenario(server, port):
+        status, _, body = await api.request(port, "GET", "/api/candidates/near?location=Rabat&radiusKm=60")
+        assert status == 200
+        assert {r["candidate"]["location"] for r in json.loads(body)} == {"Rabat", "Kenitra"}
+        status, _, _ = await api.request(port, "GET", "/api/candidates/near?location=Atlantis")
+        assert status == 400
+
+    api.run(HRBackend(DATA_DIR), scenario)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
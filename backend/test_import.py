@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Import Test - Row normalization, batched CSV/NDJSON imports, resume and routes
+"""
+
+import asyncio
+import csv
+import json
+import os
+import sys
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend
+from importer import CandidateImport, normalize_row
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+
+
+def _rows(count):
+    # Distinct names: digits are ignored when names are compared for duplicates
+    syllables = ["ba", "ki", "lo", "mu", "ne", "ra", "so", "ti", "za", "fe", "gu", "ha"]
+    return [
+        {
+            "First Name": ["Amina", "Omar", "Sara", "Karim"][i % 4],
+            "Last Name": "".join(syllables[(i // 12 ** k) % 12] for k in range(3)).title(),
+            "E-mail": f"import{i}@channel.com",
+            "City": "Rabat",
+            "Years": str(i % 10),
+            "Skills": "reactjs; aws",
+            "Available From": "01/12/2025",
+        }
+        for i in range(count)
+    ]
+
+
+def test_normalize_row():
+    canonical = {"Aws": "AWS"}
+    record = normalize_row(
+        {
+            "first_name": "Rim",
+            "Surname": "Tazi",
+            "email": "rim@x.com",
+            "skills": "ReactJS, js|aws",
+            "experience": "3.0",
+            "availability": "05.11.2025",
+            "unknown": "x",
+        },
+        canonical,
+    )
+    assert record["skills"] == ["React", "JavaScript", "AWS"]
+    assert record["experienceYears"] == 3
+    assert record["availabilityDate"] == "2025-11-05"
+    assert record["stage"] == "Applied"
+    with pytest.raises(ValueError):
+        normalize_row({"firstName": "A", "lastName": "B", "email": "a@b.c", "availability": "soon"}, {})
+    with pytest.raises(ValueError):
+        normalize_row({"firstName": "A", "email": "a@b.c"}, {})
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_csv_import_applies_batches(workers, data_dir):
+    hr_backend = HRBackend(data_dir)
+    before = len(hr_backend.candidates)
+    path = os.path.join(data_dir, "export.csv")
+    rows = _rows(120)
+    rows[5]["Years"] = "many"
+    rows[7]["E-mail"] = rows[6]["E-mail"].upper()
+    _write_csv(path, rows)
+
+    report = CandidateImport(hr_backend, path, batch_size=25, workers=workers).run()
+    assert report["status"] == "done"
+    assert report["rows"] == 120 and report["imported"] == 118
+    assert report["duplicates"] == 1 and report["errors"] == 2
+    assert sorted(error["row"] for error in report["rowErrors"]) == [6, 8]
+    assert report["rowsPerSecond"] > 0
+    assert len(hr_backend.candidates) == before + 118
+    assert not os.path.exists(path + ".checkpoint.json")
+
+    imported = hr_backend.find_candidate_by_email("import0@channel.com")
+    assert imported["skills"] == ["React", "AWS"]
+    assert imported["availabilityDate"] == "2025-12-01"
+    results = hr_backend.search_candidates({"skills": ["AWS"], "location": "Rabat", "limit": 200})
+    assert imported["id"] in [r["id"] for r in results]
+
+
+def test_interrupted_import_resumes(monkeypatch, data_dir):
+    hr_backend = HRBackend(data_dir)
+    path = os.path.join(data_dir, "export.ndjson")
+    with open(path, "w", encoding="utf-8") as f:
+        for row in _rows(100):
+            f.write(json.dumps(row) + "\n")
+
+    original = hr_backend.create_candidates
+    calls = []
+
+    def failing(records, allow_duplicates=True):
+        calls.append(len(records))
+        if len(calls) == 3:
+            raise OSError("disk full")
+        return original(records, allow_duplicates)
+
+    monkeypatch.setattr(hr_backend, "create_candidates", failing)
+    with pytest.raises(OSError):
+        CandidateImport(hr_backend, path, batch_size=30, workers=0).run()
+    with open(path + ".checkpoint.json") as f:
+        assert json.load(f)["counts"]["rows"] == 60
+
+    # Restart after the crash: same data directory, journal replayed
+    monkeypatch.undo()
+    reloaded = HRBackend(data_dir)
+    report = CandidateImport(reloaded, path, batch_size=30, workers=0).run()
+    assert report["resumedFrom"] == 60
+    assert report["imported"] == 100 and report["errors"] == 0
+    assert reloaded.find_candidate_by_email("import99@channel.com") is not None
+
+
+def test_import_routes(data_dir, api):
+    os.mkdir(os.path.join(data_dir, "imports"))
+    _write_csv(os.path.join(data_dir, "imports", "channel.csv"), _rows(10))
+
+    async def scenario(server, port):
+        status, _, body = await api.request(port, "POST", "/api/import", {"file": "../candidates.json"})
+        assert status == 400
+        status, _, body = await api.request(port, "POST", "/api/import", {"file": "channel.csv"})
+        assert status == 202
+        import_id = json.loads(body)["id"]
+        for _ in range(200):
+            status, _, body = await api.request(port, "GET", f"/api/import/{import_id}")
+            if json.loads(body)["status"] not in ("pending", "running"):
+                break
+            await asyncio.sleep(0.05)
+        progress = json.loads(body)
+        assert progress["status"] == "done" and progress["imported"] == 10
+        status, _, _ = await api.request(port, "GET", "/api/import/abc123")
+        assert status == 404
+
+    api.run(HRBackend(data_dir), scenario)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
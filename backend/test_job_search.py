@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Job Search Test - Indexed job matching vs a linear scan, ranking, pagination, endpoint
+"""
+
+import json
+import os
+import random
+import sys
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+SKILLS = ["React", "Python", "Django", "Node.js", "Docker", "AWS", "SQL", "PostgreSQL", "Go", "Java", "JavaScript"]
+LOCATIONS = ["Casablanca", "Rabat", "Sale", "Mohammedia", "Fez", "Paris", "Atlantis", ""]
+TITLES = ["Frontend Developer", "Backend Engineer", "Data Engineer", "Full Stack Developer", "DevOps Engineer"]
+
+
+def _linear_matching_jobs(hr_backend, filters):
+    """Reference: the catalogue scan _find_matching_jobs used to do."""
+    matching = []
+    for job in hr_backend.jobs:
+        if "location" in filters:
+            job_location = job.get("location", "").lower()
+            filter_location = filters["location"].lower()
+            if job_location != filter_location:
+                distance = hr_backend.gazetteer.distance_km(filter_location, job_location)
+                if distance is None or distance > filters.get("radiusKm", 50):
+                    continue
+        if filters.get("skills"):
+            job_skills = [skill.lower() for skill in job.get("skillsRequired", [])]
+            if not any(
+                f.lower() in j or j in f.lower() for f in filters["skills"] for j in job_skills
+            ):
+                continue
+        matching.append(job)
+    return matching
+
+
+def _synthetic_jobs(hr_backend, size=2000):
+    rnd = random.Random(5)
+    for _ in range(size):
+        hr_backend.create_job({
+            "title": rnd.choice(TITLES),
+            "location": rnd.choice(LOCATIONS),
+            "skillsRequired": rnd.sample(SKILLS, rnd.randint(0, 4)),
+        })
+
+
+def test_indexed_matching_equals_linear_scan(data_dir):
+    hr_backend = HRBackend(data_dir)
+    _synthetic_jobs(hr_backend)
+    rnd = random.Random(9)
+    for job_id in rnd.sample(sorted(hr_backend.jobs_by_id), 300):
+        if rnd.random() < 0.5:
+            hr_backend.delete_job(job_id)
+        else:
+            hr_backend.update_job(job_id, {"location": rnd.choice(LOCATIONS)})
+    queries = [{}, {"skills": ["Java"]}, {"location": "Casablanca"}, {"location": ""}, {"location": "Atlantis"}]
+    for _ in range(60):
+        filters = {}
+        if rnd.random() < 0.7:
+            filters["skills"] = rnd.sample(SKILLS + ["Script", "Kotlin"], rnd.randint(1, 3))
+        if rnd.random() < 0.7:
+            filters["location"] = rnd.choice(LOCATIONS)
+        if rnd.random() < 0.3:
+            filters["radiusKm"] = rnd.choice([5, 30, 100])
+        queries.append(filters)
+    for filters in queries:
+        expected = [job["id"] for job in _linear_matching_jobs(hr_backend, filters)]
+        assert [job["id"] for job in hr_backend._find_matching_jobs(filters)] == expected, filters
+
+
+def test_search_jobs_ranks_and_paginates(data_dir):
+    hr_backend = HRBackend(data_dir)
+    _synthetic_jobs(hr_backend, 500)
+    filters = hr_backend.parse_query("Python Django jobs within 30 km of Rabat")
+    full = hr_backend.search_jobs(filters, 0, 100)
+    expected_total = len(_linear_matching_jobs(hr_backend, filters))
+    assert full["total"] == expected_total and len(full["results"]) == min(expected_total, 100)
+    scores = [result["score"] for result in full["results"]]
+    assert scores == sorted(scores, reverse=True)
+    top = full["results"][0]
+    assert {"python", "django"} <= {s.lower() for s in top["job"]["skillsRequired"]}
+    assert top["job"]["location"] in ("Rabat", "Sale")
+
+    pages = [hr_backend.search_jobs(filters, offset, 7)["results"] for offset in range(0, 21, 7)]
+    assert [r["job"]["id"] for page in pages for r in page] == [r["job"]["id"] for r in full["results"][:21]]
+
+    # Title terms alone select jobs
+    titles = hr_backend.search_jobs(hr_backend.parse_query("devops engineer"), 0, 100)
+    assert titles["total"] and all("DevOps" in r["job"]["title"] for r in titles["results"])
+    with pytest.raises(ValueError):
+        hr_backend.search_jobs(filters, -1, 5)
+
+
+def test_jobs_search_endpoint(api):
+    async def scenario(server, port):
+        status, headers, body = await api.request(
+            port, "POST", "/api/jobs/search", {"query": "React jobs in Casablanca", "limit": 2}
+        )
+        assert status == 200
+        page = json.loads(body)
+        assert page["total"] == 1 and page["results"][0]["job"]["title"] == "Frontend React Developer"
+        status, _, _ = await api.request(
+            port, "POST", "/api/jobs/search", {"query": "React jobs in Casablanca", "limit": 2},
+            headers={"If-None-Match": headers["etag"]},
+        )
+        assert status == 304
+        status, _, _ = await api.request(port, "POST", "/api/jobs/search", {"query": "React", "offset": "x"})
+        assert status == 400
+
+    api.run(HRBackend(DATA_DIR), scenario)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Planner Test - Planned searches match full scans; access paths and pruning
+"""
+
+import os
+import sys
+from datetime import datetime
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+
+def _full_scan(hr_backend, filters):
+    """Reference: score every candidate, as search did before planning."""
+    today = datetime.now().date()
+    matching_jobs = hr_backend._find_matching_jobs(filters)
+    text_scores = hr_backend._text_scores(filters)
+    results = [
+        hr_backend._score_candidate(c, filters, matching_jobs, today, text_scores)
+        for c in hr_backend.candidates
+    ]
+    results.sort(key=lambda r: (-r["score"], r["candidate"]["firstName"], r["id"]))
+    return results[:filters.get("limit", 5)]
+
+
+def test_planned_search_matches_full_scan(synthetic_backend, planner_queries):
+    hr_backend = synthetic_backend()
+    for query in planner_queries:
+        for limit in (None, 0, 1, 7):
+            filters = hr_backend.parse_query(query)
+            if limit is not None:
+                filters["limit"] = limit
+            expected = [(r["id"], r["score"], r["reason"]) for r in _full_scan(hr_backend, filters)]
+            actual = [(r["id"], r["score"], r["reason"]) for r in hr_backend.search_candidates(filters)]
+            assert actual == expected, (query, limit)
+
+
+def test_rare_skill_uses_postings_and_prunes(synthetic_backend):
+    hr_backend = synthetic_backend(blanks=False)
+    rare = {
+        "id": len(hr_backend.candidates),
+        "firstName": "Nadia",
+        "lastName": "Rare",
+        "email": "nadia.rare@email.com",
+        "location": "Fez",
+        "skills": ["Haskell"],
+    }
+    hr_backend.candidates.append(rare)
+    hr_backend._build_indexes()
+    explained = hr_backend.explain_search({"skills": ["Haskell"], "location": "Fez", "limit": 1})
+    plan = explained["plan"]
+    assert plan["path"] == "skill-postings"
+    assert plan["rules"][0]["rule"].startswith("skill[0]:Haskell")
+    assert plan["rules"][0]["estimatedRows"] == 1
+    # Nadia's 3 points beat anything the location rule alone can give
+    assert plan["execution"]["rulesSkipped"] == ["location:fez"]
+    assert plan["execution"]["scored"] == 1
+    assert explained["results"] == [{"id": rare["id"], "score": 3}]
+
+
+def test_broad_query_plans_full_scan(synthetic_backend):
+    hr_backend = synthetic_backend()
+    explained = hr_backend.explain_search(hr_backend.parse_query("developer available now"))
+    assert explained["plan"]["path"] == "full-scan"
+    execution = explained["plan"]["execution"]
+    assert execution["scored"] < 50 < execution["pruned"]
+    assert explained["statistics"]["candidates"] == len(hr_backend.candidates)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
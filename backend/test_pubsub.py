@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Pub/Sub Test - Change feed deltas and resume, backend events, /api/events stream
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend
+from pubsub import ChangeFeed, format_event, last_event_id
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def test_feed_deltas_and_resume():
+    state = {"countByStage": {"Applied": 1}, "topSkills": [["react", 1]]}
+    feed = ChangeFeed(lambda: json.loads(json.dumps(state)), lambda: {"A": [1]}, history=4)
+    [snapshot] = feed.poll(None)
+    assert snapshot["event"] == "snapshot" and snapshot["data"]["analytics"] == state
+    cursor = snapshot["id"]
+    assert feed.poll(cursor) == []
+
+    # One recomputation per change, however many subscribers poll
+    state["countByStage"] = {"Applied": 2}
+    feed.changed(1)
+    first = feed.poll(cursor)
+    assert feed.poll(cursor) == first and feed.summaries_computed == 2
+    assert first[0]["data"] == {"version": 1, "changed": {"countByStage": {"Applied": 2}}}
+
+    # Writes that leave the summary as it was publish nothing
+    feed.changed(2)
+    assert feed.poll(first[0]["id"]) == []
+
+    feed.publish("shortlist", {"name": "A", "ids": [1, 2]})
+    assert [e["event"] for e in feed.poll(cursor)] == ["analytics", "shortlist"]
+
+    # A resume point older than the history gets a fresh snapshot
+    for i in range(5):
+        feed.publish("shortlist", {"name": "B", "ids": [i]})
+    [stale] = feed.poll(cursor)
+    assert stale["event"] == "snapshot" and stale["id"] == feed.sequence
+    assert feed.poll(feed.sequence + 10)[0]["event"] == "snapshot"
+
+    # wait() blocks until a writer publishes
+    threading.Timer(0.05, feed.publish, ("shortlist", {"name": "C", "ids": []})).start()
+    assert feed.wait(feed.sequence, timeout=5)[0]["data"]["name"] == "C"
+
+    assert format_event({"id": 3, "event": "shortlist", "data": {"a": 1}}) == (
+        b'id: 3\nevent: shortlist\ndata: {"a":1}\n\n'
+    )
+    assert last_event_id("7") == 7 and last_event_id("x") is None and last_event_id(None) is None
+
+
+def test_backend_publishes_changes(data_dir):
+    hr_backend = HRBackend(data_dir)
+    cursor = hr_backend.changes.poll(None)[0]["id"]
+    hr_backend.save_shortlist("Frontend", [0, 1])
+    hr_backend.create_candidate({
+        "firstName": "Nora", "lastName": "Test", "email": "nora@example.com",
+        "skills": ["Elixir"], "stage": "Offer",
+    })
+    events = hr_backend.changes.poll(cursor)
+    assert [e["event"] for e in events] == ["shortlist", "analytics"]
+    assert events[0]["data"] == {"name": "Frontend", "ids": [0, 1]}
+    changed = events[1]["data"]["changed"]
+    assert changed["countByStage"] == hr_backend.analytics_summary()["countByStage"]
+    assert events[1]["data"]["version"] == hr_backend.data_version
+
+
+async def _open_stream(port, headers=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    head = "GET /api/events HTTP/1.1\r\nHost: test\r\n" + "".join(
+        f"{name}: {value}\r\n" for name, value in (headers or {}).items()
+    ) + "\r\n"
+    writer.write(head.encode("latin-1"))
+    await writer.drain()
+    status_line = (await reader.readuntil(b"\r\n\r\n")).split(b"\r\n")[0]
+    assert b" 200 " in status_line
+    return reader, writer
+
+
+async def _next_event(reader):
+    """Read chunks until a whole event arrives (retry and keep-alive lines skipped)."""
+    text = b""
+    while True:
+        size = int((await reader.readline()).strip(), 16)
+        text += await reader.readexactly(size)
+        await reader.readexactly(2)
+        while b"\n\n" in text:
+            block, text = text.split(b"\n\n", 1)
+            fields = dict(line.split(": ", 1) for line in block.decode().split("\n") if ": " in line)
+            if "event" in fields:
+                return {"id": int(fields["id"]), "event": fields["event"], "data": json.loads(fields["data"])}
+
+
+def test_events_endpoint_fans_out_and_resumes(data_dir, api):
+    async def scenario(server, port):
+        streams = [await _open_stream(port) for _ in range(3)]
+        snapshots = [await _next_event(reader) for reader, _ in streams]
+        assert all(s["event"] == "snapshot" for s in snapshots)
+        assert snapshots[0]["data"]["shortlists"] == {"Test Shortlist": [0, 1, 2]}
+        computed = hr_backend.changes.summaries_computed
+
+        status, _, _ = await api.request(port, "POST", "/api/shortlists", {"name": "Pushed", "candidate_ids": [1]})
+        assert status == 200
+        status, _, _ = await api.request(port, "POST", "/api/candidates", {
+            "firstName": "Nora", "lastName": "Test", "email": "nora@example.com", "stage": "Offer",
+        })
+        assert status == 201
+        received = []
+        for reader, _ in streams:
+            events = [await _next_event(reader), await _next_event(reader)]
+            received.append(events)
+        assert all([e["event"] for e in events] == ["shortlist", "analytics"] for events in received)
+        assert received[0][0]["data"] == {"name": "Pushed", "ids": [1]}
+        # Three subscribers, one summary recomputation per change
+        assert hr_backend.changes.summaries_computed <= computed + 2
+
+        status, _, body = await api.request(port, "GET", "/api/metrics")
+        assert json.loads(body)["events"]["subscribers"] == 3
+        for _, writer in streams:
+            writer.close()
+
+        # Resuming from the snapshot replays what came after it
+        reader, writer = await _open_stream(port, {"Last-Event-ID": snapshots[0]["id"]})
+        replay = await _next_event(reader)
+        assert replay == received[0][0]
+        writer.close()
+
+        for _ in range(100):
+            if hr_backend.changes.subscribers == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert hr_backend.changes.subscribers == 0
+
+    hr_backend = HRBackend(data_dir)
+    api.run(hr_backend, scenario, keepalive_seconds=0.2)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Response Format Test - Compact search payloads and gzip encoding
+"""
+
+import gzip
+import json
+import os
+import sys
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend
+from responses import (
+    accepts_encoding,
+    compact_search_results,
+    compress,
+    encode_body,
+    http_date,
+    is_not_modified,
+    make_etag,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def test_compact_results_side_load_jobs_once():
+    """Each job appears once in the jobs table however many results reference it"""
+    hr_backend = HRBackend(DATA_DIR)
+    results = hr_backend.search_candidates({"skills": ["React"], "limit": 15})
+    payload = compact_search_results(results, fields=["firstName", "skills"])
+
+    assert payload["count"] == len(results)
+    assert len(payload["jobs"]) <= len(hr_backend.jobs)
+    for result in payload["results"]:
+        assert set(payload["candidates"][result["candidateId"]]) <= {"firstName", "skills"}
+        for job_ref in result["recommendedJobs"]:
+            assert job_ref["jobId"] in payload["jobs"]
+    for job in payload["jobs"].values():
+        assert "jdSnippet" not in job
+
+
+def test_encode_body_gzip_roundtrip():
+    """Large bodies are gzip-compressed only when requested"""
+    payload = {"results": [{"reason": "React match (+2)"}] * 200}
+
+    body, headers = encode_body(payload)
+    assert headers == {}
+    assert json.loads(body) == payload
+
+    body, headers = encode_body(payload, use_gzip=True)
+    assert headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(body)) == payload
+
+
+def test_accepts_encoding():
+    assert accepts_encoding("gzip, deflate, br", "gzip")
+    assert accepts_encoding("*", "gzip")
+    assert not accepts_encoding("gzip;q=0, deflate", "gzip")
+    assert not accepts_encoding("", "gzip")
+
+
+def test_conditional_validators():
+    """ETags match weakly; If-Modified-Since is honoured only without If-None-Match"""
+    etag = make_etag("analytics", 3)
+    assert etag != make_etag("analytics", 4)
+    assert is_not_modified(etag, 1000.0, if_none_match=etag[2:])
+    assert not is_not_modified(etag, 1000.0, if_none_match=make_etag("analytics", 4))
+    assert is_not_modified(etag, 1000.0, if_modified_since=http_date(1000.0))
+    assert not is_not_modified(etag, 2000.0, if_modified_since=http_date(1000.0))
+    assert not is_not_modified(
+        etag, 1000.0, if_none_match='"stale"', if_modified_since=http_date(1000.0)
+    )
+
+
+def test_deflate_roundtrip():
+    import zlib
+
+    body = b'{"skills": ["React"]}' * 100
+    assert zlib.decompress(compress(body, "deflate")) == body
+    assert gzip.decompress(compress(body, "gzip")) == body
+
+
+def test_search_cache_invalidated_on_data_change():
+    """Cached searches are dropped when the data version changes"""
+    hr_backend = HRBackend(DATA_DIR)
+    filters = {"skills": ["Python"], "limit": 3}
+    key = hr_backend.search_cache_key(filters)
+    first = hr_backend.search_candidates(filters)
+    assert hr_backend.search_candidates(filters) == first
+    assert len(hr_backend._search_cache) == 1
+
+    hr_backend._touch()
+    assert hr_backend.search_cache_key(filters) != key
+    assert len(hr_backend._search_cache) == 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Scoring Test - Profile validation, compiled scorers vs full scans, profile selection per request
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend
+from scoring import DEFAULT_PROFILE, ScoringProfile, load_profiles
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+PROFILES = {
+    "skills-only": {"jobSkill": 0, "location": {"exact": 0, "near": 0, "withinRadius": 0, "partial": 0}, "notes": 0},
+    "wide": {
+        "skill": 1.5,
+        "experience": {"inRange": 2, "nearRange": 1, "rangeSlack": 0, "nearSlack": 4},
+        "availability": {"inWindow": 0, "soon": 2, "soonDays": 180},
+        "notes": 5,
+    },
+}
+
+
+def _full_scan(hr_backend, filters):
+    """Reference: score every candidate with the filters' profile."""
+    today = datetime.now().date()
+    matching_jobs = hr_backend._find_matching_jobs(filters)
+    text_scores = hr_backend._text_scores(filters, PROFILES[filters["profile"]]["notes"])
+    results = [
+        hr_backend._score_candidate(c, filters, matching_jobs, today, text_scores)
+        for c in hr_backend.candidates
+    ]
+    results.sort(key=lambda r: (-r["score"], r["candidate"]["firstName"], r["id"]))
+    return results[:filters["limit"]]
+
+
+def test_profiles_validate_and_compile():
+    with pytest.raises(ValueError):
+        ScoringProfile("typo", {"skills": 3})
+    with pytest.raises(ValueError):
+        ScoringProfile("negative", {"location": {"exact": -1}})
+    profiles = load_profiles(DATA_DIR)
+    assert DEFAULT_PROFILE in profiles and "skills-first" in profiles
+    # Rules worth nothing are not compiled in
+    assert len(profiles[DEFAULT_PROFILE]._binders) == 6
+    assert len(ScoringProfile("skills-only", PROFILES["skills-only"])._binders) == 3
+
+
+def test_profiles_planned_search_matches_full_scan(synthetic_backend, planner_queries):
+    hr_backend = synthetic_backend()
+    hr_backend.scoring_profiles.update(
+        (name, ScoringProfile(name, weights)) for name, weights in PROFILES.items()
+    )
+    for name in PROFILES:
+        for query in planner_queries:
+            filters = dict(hr_backend.parse_query(query), profile=name, limit=7)
+            expected = [(r["id"], r["score"], r["reason"]) for r in _full_scan(hr_backend, filters)]
+            actual = [(r["id"], r["score"], r["reason"]) for r in hr_backend.search_candidates(filters)]
+            assert actual == expected, (name, query)
+
+    explained = hr_backend.explain_search(dict(hr_backend.parse_query("bootcamp React in Rabat"), profile="skills-only"))
+    assert explained["profile"] == "skills-only"
+    assert [rule["rule"].split(":")[0] for rule in explained["plan"]["rules"]] == ["skill[0]"]
+
+
+def test_profile_selected_per_request(api):
+    hr_backend = HRBackend(DATA_DIR)
+    default = hr_backend.search_candidates(hr_backend.search_filters({"query": "React in Casablanca"}))
+    custom = hr_backend.search_candidates(
+        hr_backend.search_filters({"query": "React in Casablanca", "profile": "local-hiring"})
+    )
+    assert default[0]["score"] == 3 and custom[0]["score"] == 4.5
+    with pytest.raises(ValueError):
+        hr_backend.search_filters({"query": "React", "profile": "missing"})
+
+    async def scenario(server, port):
+        status, _, body = await api.request(port, "GET", "/api/scoring/profiles")
+        assert {profile["name"] for profile in json.loads(body)} == {"default", "skills-first", "local-hiring"}
+        status, _, body = await api.request(port, "POST", "/api/search", {"query": "React in Casablanca", "profile": "local-hiring"})
+        assert status == 200 and json.loads(body)[0]["score"] == 4.5
+        status, _, _ = await api.request(port, "POST", "/api/search", {"query": "React", "profile": "missing"})
+        assert status == 400
+
+    api.run(hr_backend, scenario)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Similar Test - LSH "more like this" vs brute force, incremental upkeep, endpoint
+"""
+
+import json
+import os
+import random
+import sys
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend, normalize_skill
+from geo import get_gazetteer
+from similar import SimilarityIndex
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+SKILLS = ["React", "reactjs", "Python", "Django", "Node.js", "Docker", "AWS", "SQL", "Go", "Java", "Rust", "Kotlin", "Vue"]
+LOCATIONS = ["Casablanca", "Rabat", "Mohammedia", "Fez", "Paris", ""]
+
+
+def _synthetic(size):
+    rnd = random.Random(3)
+    return [
+        {
+            "id": i,
+            "skills": rnd.sample(SKILLS, rnd.randint(0, 5)),
+            "experienceYears": rnd.randint(0, 12),
+            "location": rnd.choice(LOCATIONS),
+        }
+        for i in range(size)
+    ]
+
+
+def _brute_force(index, candidate_id, k):
+    """Reference: the same similarity against every other candidate."""
+    profile = index.profiles[candidate_id]
+    scored = []
+    for other_id, other in index.profiles.items():
+        if other_id == candidate_id or not (profile[0] and other[0]):
+            continue
+        similarity = round(
+            0.7 * index.weighted_jaccard(profile[0], other[0])
+            + 0.15 * max(0.0, 1 - abs(profile[1] - other[1]) / 5)
+            + 0.15 * index._location_similarity(profile[2], other[2]),
+            4,
+        )
+        scored.append((-similarity, other_id))
+    return [-negated for negated, _ in sorted(scored)[:k]]
+
+
+def test_lsh_matches_brute_force():
+    index = SimilarityIndex(normalize_skill, get_gazetteer())
+    for candidate in _synthetic(3000):
+        index.add(candidate)
+    # Synonyms collapse: "reactjs" and "React" are one skill
+    assert "reactjs" not in index.skill_counts and "react" in index.skill_counts
+    exact = 0
+    lookups = [candidate_id for candidate_id in range(0, 3000, 37) if index.profiles[candidate_id][0]]
+    for candidate_id in lookups:
+        found = [match["similarity"] for match in index.similar(candidate_id, 5)]
+        assert found == sorted(found, reverse=True)
+        exact += found == _brute_force(index, candidate_id, 5)
+    assert exact >= 0.9 * len(lookups)
+    assert index.similar(10 ** 6) is None
+
+
+def test_similar_candidates_follow_writes(data_dir):
+    hr_backend = HRBackend(data_dir)
+    base = {"lastName": "Test", "location": "Rabat", "experienceYears": 4}
+    anchor = hr_backend.create_candidate(dict(base, firstName="Ali", email="ali@x.com", skills=["Elixir", "Phoenix", "SQL"]))
+    twin = hr_backend.create_candidate(dict(base, firstName="Hiba", email="hiba@x.com", skills=["Elixir", "Phoenix", "SQL"]))
+    near = hr_backend.create_candidate(
+        dict(base, firstName="Reda", email="reda@x.com", skills=["Elixir", "SQL"], location="Sale")
+    )
+    matches = hr_backend.similar_candidates(anchor["id"], 2)
+    assert [m["id"] for m in matches] == [twin["id"], near["id"]]
+    assert matches[0]["similarity"] == 1.0 and matches[0]["candidate"]["firstName"] == "Hiba"
+    assert matches[1]["sharedSkills"] == ["elixir", "sql"]
+
+    hr_backend.update_candidate(twin["id"], {"skills": ["Cobol"]})
+    hr_backend.delete_candidate(near["id"])
+    matches = hr_backend.similar_candidates(anchor["id"], 3)
+    assert twin["id"] not in [m["id"] for m in matches] and near["id"] not in [m["id"] for m in matches]
+
+    fresh = HRBackend(data_dir)
+    assert fresh.similar.buckets == hr_backend.similar.buckets
+    assert fresh.similar.skill_counts == hr_backend.similar.skill_counts
+
+
+def test_similar_endpoint(api):
+    async def scenario(server, port):
+        status, _, body = await api.request(port, "GET", "/api/candidates/0/similar?limit=3")
+        assert status == 200
+        matches = json.loads(body)
+        assert len(matches) == 3 and all(m["id"] != 0 for m in matches)
+        status, _, _ = await api.request(port, "GET", "/api/candidates/999999/similar")
+        assert status == 404
+
+    api.run(HRBackend(DATA_DIR), scenario)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
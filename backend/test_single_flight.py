@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Single-Flight Test - Identical concurrent searches share one scan
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from admission import Deadline
+from backend import HRBackend, SearchCancelled
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+class SlowBackend(HRBackend):
+    """Backend whose scans take long enough for requests to overlap."""
+
+    def _search_candidates(self, filters, should_cancel=None, deadline=None):
+        time.sleep(0.2)
+        if should_cancel is not None and should_cancel():
+            raise SearchCancelled("cancelled")
+        return super()._search_candidates(filters, should_cancel, deadline)
+
+
+def _run_concurrently(hr_backend, filters_list, should_cancel=None):
+    results = [None] * len(filters_list)
+
+    def worker(i, filters):
+        try:
+            results[i] = hr_backend.search_candidates(filters, should_cancel)
+        except SearchCancelled as e:
+            results[i] = e
+
+    threads = [
+        threading.Thread(target=worker, args=(i, filters))
+        for i, filters in enumerate(filters_list)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_searches_coalesce_without_cache():
+    hr_backend = SlowBackend(DATA_DIR, search_cache_size=0)
+    filters = hr_backend.parse_query("React developer in Casablanca")
+    results = _run_concurrently(hr_backend, [dict(filters) for _ in range(8)])
+
+    assert hr_backend.search_stats["executed"] == 1
+    assert hr_backend.search_stats["coalesced"] == 7
+    assert all(r == results[0] for r in results)
+    # Callers get their own list
+    assert len({id(r) for r in results}) == 8
+
+
+def test_different_searches_run_separately():
+    hr_backend = SlowBackend(DATA_DIR, search_cache_size=0)
+    _run_concurrently(hr_backend, [{"skills": ["React"]}, {"skills": ["Python"]}])
+    assert hr_backend.search_stats["executed"] == 2
+    assert hr_backend.search_stats["coalesced"] == 0
+
+
+def test_follower_retries_when_leader_cancelled():
+    hr_backend = SlowBackend(DATA_DIR, search_cache_size=0)
+    filters = {"skills": ["React"]}
+    leader_result = {}
+
+    def leader():
+        try:
+            hr_backend.search_candidates(filters, should_cancel=lambda: True)
+        except SearchCancelled as e:
+            leader_result["error"] = e
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    time.sleep(0.05)
+    results = hr_backend.search_candidates(filters)
+    thread.join()
+
+    assert "error" in leader_result
+    assert results and results[0]["score"] > 0
+    assert hr_backend.search_stats["executed"] == 1
+
+
+def test_follower_stops_at_its_own_deadline():
+    hr_backend = SlowBackend(DATA_DIR, search_cache_size=0)
+    filters = {"skills": ["React"]}
+    leader_results = []
+    thread = threading.Thread(target=lambda: leader_results.append(hr_backend.search_candidates(filters)))
+    thread.start()
+    time.sleep(0.05)
+
+    deadline = Deadline(0.02)
+    start = time.perf_counter()
+    results = hr_backend.search_candidates(filters, deadline=deadline)
+    # Its own scan (slowed like the leader's) rather than the rest of the leader's
+    assert time.perf_counter() - start < 0.35
+    assert deadline.reached and results
+    thread.join()
+    assert results[0]["score"] == leader_results[0][0]["score"]
+    assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+
+    # The leader still finishes in full for everyone else
+    assert hr_backend.search_stats["coalesced"] == 1 and hr_backend.search_stats["partial"] == 1
+    assert hr_backend.search_stats["executed"] == 2
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
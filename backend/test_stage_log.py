@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Stage Log Test - Transition log, daily rollups, snapshots and the stage routes
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import date
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend
+from stage_log import StageLog
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DAY = 86400
+# 2025-03-03 00:00 UTC
+MONDAY = 1740960000
+
+
+def _record_week(log):
+    # Candidates 1-3 apply on Monday and reach Interview after 1, 2 and 4 days
+    for candidate_id in (1, 2, 3):
+        log.record(candidate_id, None, "Applied", MONDAY)
+    log.record(1, "Applied", "Interview", MONDAY + DAY)
+    log.record(2, "Applied", "Interview", MONDAY + 2 * DAY)
+    log.record(3, "Applied", "Interview", MONDAY + 4 * DAY)
+    log.record(1, "Interview", "Offer", MONDAY + 4 * DAY + 3600)
+
+
+def test_rollups_and_medians():
+    tmp = tempfile.mkdtemp()
+    try:
+        log = StageLog(tmp)
+        _record_week(log)
+        funnel = log.funnel()
+        assert [day["date"] for day in funnel["days"]] == ["2025-03-03", "2025-03-04", "2025-03-05", "2025-03-07"]
+        assert funnel["totals"]["entered"] == {"Applied": 3, "Interview": 3, "Offer": 1}
+        assert funnel["totals"]["medianDaysInStage"]["Applied"] == 2.0
+        friday = funnel["days"][-1]
+        assert friday["exited"] == {"Applied": 1, "Interview": 1}
+        assert friday["medianDaysInStage"] == {"Applied": 4.0, "Interview": 3.04}
+
+        window = log.funnel(date(2025, 3, 4), date(2025, 3, 5))
+        assert window["totals"]["entered"] == {"Interview": 2}
+        assert window["totals"]["medianDaysInStage"] == {"Applied": 1.5}
+        assert log.time_in_stage(2, now=MONDAY + 3 * DAY) == {"stage": "Interview", "since": "2025-03-05", "days": 1.0}
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_reload_uses_snapshot_and_log_tail():
+    tmp = tempfile.mkdtemp()
+    try:
+        log = StageLog(tmp, snapshot_every=4)
+        _record_week(log)
+        expected = log.funnel()
+        with open(log.snapshot_path) as f:
+            assert json.load(f)["events"] == 4
+        log.close()
+
+        # A torn final line (crash mid-append) is dropped
+        with open(log.path, "ab") as f:
+            f.write(b'[1741392000,9,"Ap')
+        reloaded = StageLog(tmp)
+        assert reloaded.funnel() == expected
+        assert reloaded.events == 7
+        reloaded.record(9, None, "Applied", MONDAY + 5 * DAY)
+        assert StageLog(tmp).events == 8
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_backend_logs_stage_changes(data_dir):
+    hr_backend = HRBackend(data_dir)
+    in_interview = {c["id"] for c in hr_backend.candidates if c["stage"] == "Interview"}
+    assert {c["id"] for c in hr_backend.candidates_in_stage("interview")} == in_interview
+
+    candidate = hr_backend.create_candidate({"firstName": "Nora", "lastName": "Bennis", "email": "nora@x.com"})
+    moved = hr_backend.move_candidate(candidate["id"], "Interview")
+    assert moved["stage"] == "Interview" and moved["timeInStage"]["stage"] == "Interview"
+    assert candidate["id"] in {c["id"] for c in hr_backend.candidates_in_stage("Interview")}
+    hr_backend.update_candidate(candidate["id"], {"notes": "called"})
+    hr_backend.delete_candidate(candidate["id"])
+    assert candidate["id"] not in {c["id"] for c in hr_backend.candidates_in_stage("Interview")}
+
+    totals = hr_backend.stage_funnel()["totals"]
+    assert totals["entered"] == {"Applied": 1, "Interview": 1}
+    assert totals["exited"] == {"Applied": 1, "Interview": 1}
+    assert HRBackend(data_dir).stage_funnel()["totals"] == totals
+    with pytest.raises(ValueError):
+        hr_backend.stage_funnel(start="last week")
+    with pytest.raises(ValueError):
+        hr_backend.move_candidate(candidate["id"], " ")
+
+
+def test_stage_routes(data_dir, api):
+    async def scenario(server, port):
+        status, _, body = await api.request(port, "POST", "/api/candidates/1/stage", {"stage": "Offer"})
+        assert status == 200 and json.loads(body)["stage"] == "Offer"
+        status, _, body = await api.request(port, "GET", "/api/stages/Offer/candidates")
+        assert 1 in [c["id"] for c in json.loads(body)]
+        status, headers, body = await api.request(port, "GET", "/api/analytics/funnel?from=2020-01-01")
+        assert status == 200 and json.loads(body)["totals"]["entered"] == {"Offer": 1}
+        status, _, _ = await api.request(port, "GET", "/api/analytics/funnel", headers={"If-None-Match": headers["etag"]})
+        assert status == 200
+        status, _, _ = await api.request(port, "GET", "/api/analytics/funnel?from=yesterday")
+        assert status == 400
+        status, _, _ = await api.request(port, "POST", "/api/candidates/999/stage", {"stage": "Offer"})
+        assert status == 404
+
+    api.run(HRBackend(data_dir), scenario)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Storage Engine Test - SQLite engine import, search parity and shortlist durability
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend
+from storage import JSONStorage
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+QUERIES = [
+    "React developer in Casablanca",
+    "Python Django 3 years",
+    "top 10 SQL developers in Rabat available now",
+    "Full stack Node.js next 2 months",
+    "developer",
+]
+
+
+def test_sqlite_search_matches_json(data_dir):
+    """Searches over the SQLite engine rank exactly like over the JSON files"""
+    json_backend = HRBackend(data_dir, search_cache_size=0)
+    sqlite_backend = HRBackend(data_dir, search_cache_size=0, storage="sqlite")
+    assert sqlite_backend.shortlists == json_backend.shortlists
+
+    for query in QUERIES:
+        filters = json_backend.parse_query(query)
+        expected = [(r["id"], r["score"]) for r in json_backend.search_candidates(filters)]
+        actual = [(r["id"], r["score"]) for r in sqlite_backend.search_candidates(filters)]
+        assert actual == expected, query
+
+
+def test_sqlite_shortlists_persist(data_dir):
+    hr_backend = HRBackend(data_dir, storage="sqlite")
+    ids = [c["id"] for c in hr_backend.candidates[:2]]
+    assert hr_backend.save_shortlist("Durable", ids)
+
+    reloaded = HRBackend(data_dir, storage="sqlite")
+    assert reloaded.shortlists["Durable"] == ids
+    assert reloaded.storage._conn().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_keeps_documents_only(data_dir):
+    hr_backend = HRBackend(data_dir, storage="sqlite")
+    conn = hr_backend.storage._conn()
+    tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert tables == {"candidates", "jobs", "shortlists"}
+    assert [row[1] for row in conn.execute("PRAGMA table_info(candidates)")] == ["id", "doc"]
+    assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL").fetchall() == []
+
+
+def test_compaction_keeps_writes_after_the_mark(data_dir):
+    engine = JSONStorage(data_dir)
+    candidates, jobs = engine.load_candidates(), engine.load_jobs()
+    engine.upsert_candidate(dict(candidates[0], notes="before"))
+    snapshot = [dict(candidates[0], notes="before")] + candidates[1:]
+    mark = engine.journal_mark()
+    # Journalled while the files are being rewritten
+    engine.upsert_candidate(dict(candidates[1], notes="during"))
+    engine.compact(snapshot, jobs, mark)
+    assert engine.journal_entries == 1
+
+    reloaded = JSONStorage(data_dir)
+    by_id = {c["id"]: c for c in reloaded.load_candidates()}
+    assert by_id[candidates[0]["id"]]["notes"] == "before"
+    assert by_id[candidates[1]["id"]]["notes"] == "during"
+    assert reloaded.journal_entries == 1
+
+
+def test_sqlite_close_closes_every_thread(data_dir):
+    hr_backend = HRBackend(data_dir, storage="sqlite")
+    opened = []
+    thread = threading.Thread(target=lambda: opened.append(hr_backend.storage._conn()))
+    thread.start()
+    thread.join()
+    assert opened[0] is not hr_backend.storage._conn()
+
+    hr_backend.storage.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
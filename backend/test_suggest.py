@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Suggest Test - Typeahead ranking, synonym and alias keys, refresh after writes, /api/suggest
+"""
+
+import json
+import os
+import sys
+import time
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from backend import HRBackend
+from suggest import SuggestIndex
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def test_index_matches_brute_force():
+    words = ["react", "redis", "rest", "rabat", "ruby", "python", "new york", "newark", "r"]
+    entries = [(w, "skill", w.title(), len(w), False) for w in words]
+    index = SuggestIndex(entries)
+    for prefix in ["r", "re", "red", "n", "new", "new y", "p", "x", "rabat"]:
+        expected = {w.title() for w in words if w.startswith(prefix)}
+        found = index.suggest(prefix, limit=20)["suggestions"]
+        assert {s["text"] for s in found} == expected, prefix
+        counts = [s["count"] for s in found]
+        assert counts == sorted(counts, reverse=True), prefix
+
+    # The longest run of trailing words that completes something wins
+    assert index.suggest("developers in new y")["completes"] == "new y"
+    assert index.suggest("developers in ra")["completes"] == "ra"
+    assert index.suggest("react ")["suggestions"] == [] and index.suggest("")["suggestions"] == []
+
+
+def test_backend_suggestions():
+    hr_backend = HRBackend(DATA_DIR)
+    react = hr_backend.suggest("re")["suggestions"][0]
+    assert react["text"] == "React" and react["kind"] == "skill" and react["understood"]
+    assert react["count"] == len(hr_backend.candidate_ids_by_skill["react"])
+
+    # Synonym keys and city aliases lead to the canonical name
+    assert hr_backend.suggest("nodej")["suggestions"][0]["text"] == "Node.js"
+    found = hr_backend.suggest("React developers in Casa")
+    assert found["completes"] == "casa" and found["suggestions"][0]["text"] == "Casablanca"
+    titles = [s["text"] for s in hr_backend.suggest("Frontend", limit=25)["suggestions"] if s["kind"] == "title"]
+    assert titles == [job["title"] for job in hr_backend.jobs if job["title"].lower().startswith("frontend")]
+    assert len(hr_backend.suggest("j", limit=2)["suggestions"]) == 2
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        hr_backend.suggest("python developers in ra")
+    assert (time.perf_counter() - start) / 1000 < 0.001
+
+
+def test_suggestions_follow_writes(data_dir):
+    hr_backend = HRBackend(data_dir)
+    assert not hr_backend.suggestions_ready()
+    assert hr_backend.suggest("elix")["suggestions"] == []
+    assert hr_backend.suggestions_ready()
+    hr_backend.create_candidate({
+        "firstName": "Nora", "lastName": "Test", "email": "nora@example.com", "skills": ["Elixir"],
+    })
+    assert not hr_backend.suggestions_ready()
+    [elixir] = hr_backend.suggest("elix")["suggestions"]
+    assert elixir == {"text": "Elixir", "kind": "skill", "count": 1, "understood": False, "matched": "elixir"}
+
+    # While another request rebuilds the index, readers use the previous one
+    hr_backend.create_candidate({
+        "firstName": "Omar", "lastName": "Test", "email": "omar@example.com", "skills": ["Elixir"],
+    })
+    with hr_backend._suggest_lock:
+        assert hr_backend.suggest("elix")["suggestions"][0]["count"] == 1
+    assert hr_backend.suggest("elix")["suggestions"][0]["count"] == 2
+
+
+def test_suggest_endpoint(api):
+    async def scenario(server, port):
+        status, headers, body = await api.request(port, "GET", "/api/suggest?prefix=developers%20in%20rab&limit=3")
+        assert status == 200
+        data = json.loads(body)
+        assert data["prefix"] == "developers in rab" and data["suggestions"][0]["text"] == "Rabat"
+        status, _, _ = await api.request(port, "GET", "/api/suggest?prefix=rab&limit=3", headers={
+            "If-None-Match": headers["etag"],
+        })
+        assert status == 200
+        status, _, _ = await api.request(port, "GET", "/api/suggest?prefix=developers%20in%20rab&limit=3", headers={
+            "If-None-Match": headers["etag"],
+        })
+        assert status == 304
+        status, _, _ = await api.request(port, "GET", "/api/suggest?prefix=r&limit=many")
+        assert status == 400
+
+    api.run(HRBackend(DATA_DIR), scenario)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tenants Test - Lazy loading, LRU/idle eviction and per-tenant request routing
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import backend as backend_module
+from backend import HRBackend
+from tenants import TenantRegistry, UnknownTenant, split_tenant_path
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def _tenants_root(*names):
+    root = tempfile.mkdtemp()
+    for name in names:
+        os.mkdir(os.path.join(root, name))
+        for filename in ("candidates.json", "jobs.json", "shortlists.json"):
+            shutil.copy(os.path.join(DATA_DIR, filename), os.path.join(root, name))
+    return root
+
+
+def test_split_tenant_path():
+    assert split_tenant_path("/t/acme/api/search") == ("acme", "/api/search")
+    assert split_tenant_path("/api/search") == (None, "/api/search")
+
+
+def test_registry_loads_lazily_and_evicts():
+    root = _tenants_root("acme", "globex", "initech")
+    try:
+        registry = TenantRegistry(root, max_tenants=2, idle_seconds=3600)
+        with pytest.raises(UnknownTenant):
+            registry.acquire("umbrella")
+        with pytest.raises(UnknownTenant):
+            registry.acquire("../acme")
+
+        acme = registry.acquire("acme")
+        acme.create_candidate({"firstName": "Lina", "lastName": "Fassi", "email": "lina@acme.com"})
+        registry.release("acme")
+        for name in ("globex", "initech"):
+            registry.acquire(name)
+            registry.release(name)
+        # acme was least recently used: unloaded, its journal folded into candidates.json
+        assert not registry.is_loaded("acme") and registry.is_loaded("initech")
+        assert not os.path.exists(os.path.join(root, "acme", "journal.jsonl"))
+        reloaded = registry.acquire("acme")
+        assert reloaded is not acme and reloaded.find_candidate_by_email("lina@acme.com")
+        assert registry.acquire("globex").find_candidate_by_email("lina@acme.com") is None
+        registry.release("globex")
+
+        # Idle tenants are unloaded, busy ones stay however idle they are
+        assert registry.evict(now=10 ** 9) == 1
+        assert registry.is_loaded("acme") and not registry.is_loaded("globex")
+        metrics = registry.metrics()
+        assert metrics["acme"]["loads"] == 2 and metrics["acme"]["evictions"] == 1
+        assert metrics["globex"]["evictions"] == 2 and metrics["initech"]["loaded"] is False
+        assert metrics["acme"]["activeRequests"] == 1
+        registry.close()
+    finally:
+        shutil.rmtree(root)
+
+
+def test_async_routes_per_tenant(api):
+    root = _tenants_root("acme", "globex")
+    default = HRBackend(os.path.join(root, "acme"))
+
+    async def scenario(server, port):
+        payload = {"firstName": "Omar", "lastName": "Idrissi", "email": "omar@globex.com"}
+        status, _, _ = await api.request(port, "POST", "/t/globex/api/candidates", payload)
+        assert status == 201
+        status, _, body = await api.request(port, "POST", "/api/duplicates/check", payload, headers={"X-Tenant": "globex"})
+        assert json.loads(body)[0]["candidate"]["email"] == "omar@globex.com"
+        status, _, body = await api.request(port, "POST", "/api/duplicates/check", payload)
+        assert json.loads(body) == []
+        status, _, _ = await api.request(port, "GET", "/t/nope/api/analytics")
+        assert status == 404
+        # Each tenant sees only itself unless the admin token is sent
+        status, _, body = await api.request(port, "GET", "/api/tenants", headers={"X-Tenant": "globex"})
+        assert list(json.loads(body)) == ["globex"] and json.loads(body)["globex"]["requests"] == 3
+        status, _, body = await api.request(port, "GET", "/api/tenants")
+        assert list(json.loads(body)) == ["default"]
+        status, _, body = await api.request(port, "GET", "/api/tenants", headers={"X-Admin-Token": "wrong"})
+        assert list(json.loads(body)) == ["default"]
+        status, _, body = await api.request(port, "GET", "/api/tenants", headers={"X-Admin-Token": "s3cret"})
+        assert json.loads(body)["globex"]["requests"] == 3 and "default" in json.loads(body)
+
+    server_registry = TenantRegistry(root, default=lambda: default)
+    os.environ["HR_AGENT_ADMIN_TOKEN"] = "s3cret"
+    try:
+        api.run(default, scenario, tenants=server_registry)
+    finally:
+        del os.environ["HR_AGENT_ADMIN_TOKEN"]
+        shutil.rmtree(root)
+
+
+def test_flask_routes_per_tenant():
+    import api_server
+
+    root = _tenants_root("acme")
+    previous_backend, previous_root = backend_module._backend, api_server.tenants.root
+    backend_module._backend = HRBackend(DATA_DIR)
+    api_server.tenants.root = root
+    try:
+        client = api_server.app.test_client()
+        response = client.post("/t/acme/api/candidates", json={"firstName": "Sami", "lastName": "Alaoui", "email": "sami@acme.com"})
+        assert response.status_code == 201
+        response = client.get("/api/metrics", headers={"X-Tenant": "acme"})
+        assert response.get_json()["tenant"]["requests"] == 2
+        assert "X-Tenant" in response.headers["Vary"]
+        assert backend_module._backend.find_candidate_by_email("sami@acme.com") is None
+        assert client.get("/api/analytics", headers={"X-Tenant": "missing"}).status_code == 404
+        assert list(client.get("/api/tenants", headers={"X-Tenant": "acme"}).get_json()) == ["acme"]
+    finally:
+        api_server.tenants.close()
+        backend_module._backend = previous_backend
+        api_server.tenants.root = previous_root
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
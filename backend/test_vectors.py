@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Vector Matching Test - TF-IDF similarity, LSH lookups and incremental updates
+"""
+
+import os
+import random
+import sys
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import vectors
+from backend import HRBackend
+from vectors import LSHIndex, VectorSpace, candidate_features, cosine
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def test_related_terms_match_without_shared_skills(data_dir):
+    features = candidate_features({"skills": [], "notes": "Built SPAs with hooks"})
+    assert "react" in features and "frontend" in features
+
+    hr_backend = HRBackend(data_dir)
+    candidate = hr_backend.create_candidate({
+        "firstName": "Rim",
+        "lastName": "Tazi",
+        "email": "rim.tazi@email.com",
+        "notes": "Built SPAs with hooks",
+    })
+    matches = hr_backend.semantic_jobs_for_candidate(candidate["id"])
+    assert matches[0]["job"]["title"] == "Frontend React Developer"
+    assert "react" in matches[0]["sharedTerms"]
+
+    # Writes after the matcher is built keep it current
+    hr_backend.update_candidate(candidate["id"], {"notes": "Django REST APIs on AWS"})
+    matches = hr_backend.semantic_jobs_for_candidate(candidate["id"])
+    assert matches[0]["job"]["title"] == "Backend Python Developer"
+    job_id = matches[0]["jobId"]
+    assert candidate["id"] in [m["id"] for m in hr_backend.semantic_candidates_for_job(job_id, 20)]
+
+    hr_backend.delete_candidate(candidate["id"])
+    assert hr_backend.semantic_jobs_for_candidate(candidate["id"]) is None
+    assert candidate["id"] not in hr_backend.semantic.candidate_index.vectors
+
+
+def test_lsh_finds_neighbours_without_full_scan():
+    rnd = random.Random(5)
+    vocabulary = [f"term{i}" for i in range(2000)]
+    topics = [rnd.sample(vocabulary, 30) for _ in range(40)]
+    space = VectorSpace()
+    documents = []
+    for _ in range(2000):
+        terms = rnd.sample(rnd.choice(topics), 12) + rnd.sample(vocabulary, 3)
+        features = {term: 1.0 for term in terms}
+        space.add_document(features)
+        documents.append(features)
+
+    index = LSHIndex()
+    vectors_by_id = {}
+    for doc_id, features in enumerate(documents):
+        vectors_by_id[doc_id] = space.vectorize(features)
+        index.add(doc_id, vectors_by_id[doc_id])
+
+    examined = 0
+    quality = 0.0
+    for query in range(20):
+        vector = vectors_by_id[query]
+        examined += len(index.candidates(vector, min_candidates=5 * vectors.PROBE_PER_RESULT))
+        exact = sorted(
+            (cosine(vector, other) for doc_id, other in vectors_by_id.items() if doc_id != query),
+            reverse=True,
+        )[:5]
+        found = index.nearest(vector, 5, exclude=query)
+        quality += sum(similarity for _, similarity in found) / sum(exact)
+    assert examined / 20 < len(documents) / 4
+    assert quality / 20 > 0.6
+
+    index.remove(0)
+    assert 0 not in index.vectors
+    assert all(0 not in bucket for table in index.buckets for bucket in table.values())
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+HR Agent Vectors - TF-IDF matching of candidates to jobs with an LSH index
+Candidates (skills + notes) and jobs (title + skills + description) become
+sparse TF-IDF vectors; random-projection LSH finds near neighbours without
+comparing against every record, and exact cosine similarity reranks them.
+Pure Python 3 standard library implementation (NumPy used when installed)
+"""
+
+import hashlib
+import math
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from fulltext import tokenize
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional speedup
+    numpy = None
+
+# Skills are the strongest signal; weight them above free text
+SKILL_WEIGHT = 2.0
+
+# Related terms added (at RELATED_WEIGHT) when a token appears, so notes like
+# "built SPAs with hooks" meet descriptions that only say React or frontend
+RELATED_TERMS = {
+    "hook": ["react"],
+    "jsx": ["react"],
+    "redux": ["react", "javascript"],
+    "nextjs": ["react"],
+    "next.js": ["react"],
+    "spa": ["react", "javascript", "frontend"],
+    "ui": ["frontend"],
+    "component": ["frontend"],
+    "responsive": ["frontend", "css"],
+    "express": ["node.js", "backend"],
+    "api": ["backend"],
+    "rest": ["backend", "api"],
+    "microservice": ["backend", "docker"],
+    "container": ["docker"],
+    "kubernete": ["docker", "devop"],
+    "k8s": ["docker", "devop"],
+    "cloud": ["aws"],
+    "ec2": ["aws"],
+    "lambda": ["aws"],
+    "postgres": ["postgresql", "sql"],
+    "mysql": ["sql", "database"],
+    "database": ["sql"],
+    "django": ["python"],
+    "flask": ["python"],
+    "pandas": ["python", "data"],
+    "ml": ["machine", "learning", "python"],
+}
+RELATED_WEIGHT = 0.5
+
+# LSH layout: TABLES hash tables of BITS random hyperplanes each
+LSH_TABLES = 16
+LSH_BITS = 8
+
+# Probe neighbouring buckets when a lookup finds fewer than this many per result
+PROBE_PER_RESULT = 20
+
+# Indexes this small are compared exhaustively; hashing only pays off above it
+EXACT_SCAN_BELOW = 256
+
+
+def candidate_features(candidate: Dict[str, Any]) -> Dict[str, float]:
+    """Raw term weights for a candidate: skills (boosted) and notes."""
+    return _features(candidate.get("skills", []), [candidate.get("notes", "")])
+
+
+def job_features(job: Dict[str, Any]) -> Dict[str, float]:
+    """Raw term weights for a job: skills (boosted), title and description."""
+    return _features(job.get("skillsRequired", []), [job.get("title", ""), job.get("jdSnippet", "")])
+
+
+def _features(skills: Iterable[str], texts: Iterable[str]) -> Dict[str, float]:
+    counts = {}
+    for skill in skills:
+        for term in tokenize(skill):
+            counts[term] = counts.get(term, 0.0) + SKILL_WEIGHT
+    for text in texts:
+        for term in tokenize(text):
+            counts[term] = counts.get(term, 0.0) + 1.0
+    for term, weight in list(counts.items()):
+        for related in RELATED_TERMS.get(term, ()):
+            counts[related] = counts.get(related, 0.0) + RELATED_WEIGHT * weight
+    return counts
+
+
+def cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """Dot product of two L2-normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+class VectorSpace:
+    """
+    Document frequencies shared by candidates and jobs. Vectors use
+    sublinear tf times smoothed idf, L2-normalized. Frequencies are updated
+    as documents come and go; existing vectors keep the idf they were
+    built with until the space is rebuilt.
+    """
+
+    def __init__(self):
+        self.doc_freq = {}
+        self.doc_count = 0
+
+    def add_document(self, features: Dict[str, float]):
+        self.doc_count += 1
+        for term in features:
+            self.doc_freq[term] = self.doc_freq.get(term, 0) + 1
+
+    def remove_document(self, features: Dict[str, float]):
+        self.doc_count -= 1
+        for term in features:
+            count = self.doc_freq.get(term, 0) - 1
+            if count > 0:
+                self.doc_freq[term] = count
+            else:
+                self.doc_freq.pop(term, None)
+
+    def idf(self, term: str) -> float:
+        return math.log((1 + self.doc_count) / (1 + self.doc_freq.get(term, 0))) + 1.0
+
+    def vectorize(self, features: Dict[str, float]) -> Dict[str, float]:
+        vector = {
+            term: (1.0 + math.log(weight)) * self.idf(term) if weight >= 1 else weight * self.idf(term)
+            for term, weight in features.items()
+        }
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        if norm == 0:
+            return {}
+        return {term: weight / norm for term, weight in vector.items()}
+
+
+class LSHIndex:
+    """
+    Random-projection (SimHash) LSH over sparse vectors. A term's hyperplane
+    components are derived from a hash of the term, so no projection matrix
+    over the whole vocabulary is stored. Vectors with a small angle between
+    them share a bucket in at least one table with high probability.
+    """
+
+    def __init__(self, tables: int = LSH_TABLES, bits: int = LSH_BITS):
+        self.tables = tables
+        self.bits = bits
+        self.buckets = [{} for _ in range(tables)]
+        self.signatures = {}
+        self.vectors = {}
+        self._planes = {}
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def _plane_signs(self, term: str) -> List[int]:
+        """+1/-1 component of every hyperplane for term (cached)."""
+        signs = self._planes.get(term)
+        if signs is None:
+            width = self.tables * self.bits
+            digest = hashlib.blake2b(term.encode("utf-8"), digest_size=(width + 7) // 8).digest()
+            value = int.from_bytes(digest, "big")
+            signs = [1 if (value >> i) & 1 else -1 for i in range(width)]
+            if numpy is not None:
+                signs = numpy.array(signs, dtype=numpy.float64)
+            self._planes[term] = signs
+        return signs
+
+    def signature(self, vector: Dict[str, float]) -> Tuple[int, ...]:
+        """One bucket key per table: the sign bits of the projections."""
+        width = self.tables * self.bits
+        if numpy is not None and vector:
+            rows = numpy.vstack([self._plane_signs(term) for term in vector])
+            weights = numpy.fromiter(vector.values(), dtype=numpy.float64, count=len(vector))
+            projections = (weights @ rows).tolist()
+        else:
+            projections = [0.0] * width
+            for term, weight in vector.items():
+                for i, sign in enumerate(self._plane_signs(term)):
+                    projections[i] += sign * weight
+        keys = []
+        for table in range(self.tables):
+            key = 0
+            for bit in range(self.bits):
+                key = (key << 1) | (projections[table * self.bits + bit] > 0)
+            keys.append(key)
+        return tuple(keys)
+
+    def add(self, doc_id: int, vector: Dict[str, float]):
+        if doc_id in self.vectors:
+            self.remove(doc_id)
+        signature = self.signature(vector)
+        self.vectors[doc_id] = vector
+        self.signatures[doc_id] = signature
+        for table, key in enumerate(signature):
+            self.buckets[table].setdefault(key, set()).add(doc_id)
+
+    def remove(self, doc_id: int):
+        signature = self.signatures.pop(doc_id, None)
+        if signature is None:
+            return
+        del self.vectors[doc_id]
+        for table, key in enumerate(signature):
+            bucket = self.buckets[table].get(key)
+            if bucket is not None:
+                bucket.discard(doc_id)
+                if not bucket:
+                    del self.buckets[table][key]
+
+    def candidates(self, vector: Dict[str, float], min_candidates: int = 0) -> Set[int]:
+        """
+        Documents sharing a bucket with vector in any table. If that yields
+        fewer than min_candidates, neighbouring buckets (one bit flipped) are
+        probed as well.
+        """
+        signature = self.signature(vector)
+        found = set()
+        for table, key in enumerate(signature):
+            found.update(self.buckets[table].get(key, ()))
+        if len(found) < min_candidates:
+            for table, key in enumerate(signature):
+                for bit in range(self.bits):
+                    found.update(self.buckets[table].get(key ^ (1 << bit), ()))
+        return found
+
+    def nearest(
+        self, vector: Dict[str, float], k: int = 5, exclude: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """Top k (doc_id, cosine) among LSH candidates, best first."""
+        if len(self.vectors) < EXACT_SCAN_BELOW:
+            pool = self.vectors
+        else:
+            pool = self.candidates(vector, min_candidates=k * PROBE_PER_RESULT)
+        scored = []
+        for doc_id in pool:
+            if doc_id == exclude:
+                continue
+            similarity = cosine(vector, self.vectors[doc_id])
+            if similarity > 0:
+                scored.append((doc_id, similarity))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:k]
+
+
+class SemanticMatcher:
+    """
+    Candidate and job vectors in one TF-IDF space, each side with its own
+    LSH index, so "best jobs for a candidate" and "best candidates for a
+    job" look at a handful of buckets instead of every record.
+    """
+
+    def __init__(self):
+        self.space = VectorSpace()
+        self.candidate_index = LSHIndex()
+        self.job_index = LSHIndex()
+        self._features = {}
+
+    def build(self, candidates: List[Dict[str, Any]], jobs: List[Dict[str, Any]]):
+        """Index everything, counting document frequencies before vectorizing."""
+        features = [("candidate", c["id"], candidate_features(c)) for c in candidates]
+        features += [("job", j["id"], job_features(j)) for j in jobs]
+        for _, _, terms in features:
+            self.space.add_document(terms)
+        for kind, doc_id, terms in features:
+            self._features[(kind, doc_id)] = terms
+            self._index(kind).add(doc_id, self.space.vectorize(terms))
+
+    def _index(self, kind: str) -> LSHIndex:
+        return self.candidate_index if kind == "candidate" else self.job_index
+
+    def add(self, kind: str, record: Dict[str, Any]):
+        self.remove(kind, record["id"])
+        terms = candidate_features(record) if kind == "candidate" else job_features(record)
+        self.space.add_document(terms)
+        self._features[(kind, record["id"])] = terms
+        self._index(kind).add(record["id"], self.space.vectorize(terms))
+
+    def remove(self, kind: str, doc_id: int):
+        terms = self._features.pop((kind, doc_id), None)
+        if terms is not None:
+            self.space.remove_document(terms)
+            self._index(kind).remove(doc_id)
+
+    def jobs_for_candidate(self, candidate_id: int, k: int = 5) -> List[Tuple[int, float]]:
+        vector = self.candidate_index.vectors.get(candidate_id)
+        if vector is None:
+            return []
+        return self.job_index.nearest(vector, k)
+
+    def candidates_for_job(self, job_id: int, k: int = 5) -> List[Tuple[int, float]]:
+        vector = self.job_index.vectors.get(job_id)
+        if vector is None:
+            return []
+        return self.candidate_index.nearest(vector, k)
+
+    def shared_terms(self, a: Dict[str, float], b: Dict[str, float], top: int = 5) -> List[str]:
+        """Terms contributing most to the similarity of two vectors."""
+        shared = [(a[term] * b[term], term) for term in a if term in b]
+        shared.sort(key=lambda item: (-item[0], item[1]))
+        return [term for _, term in shared[:top]]
@@ -44,8 +44,16 @@ export async function searchCandidates(query) {
   }
 }
 
+// Typeahead suggestions completing the end of a search query.
+// Pass an AbortSignal to drop a request the next keystroke made stale.
+export async function getSuggestions(prefix, { limit = 8, signal } = {}) {
+  const params = new URLSearchParams({ prefix, limit: String(limit) });
+  const response = await fetch(`${API_BASE_URL}/suggest?${params}`, { signal });
+  return await handleResponse(response);
+}
+
 // Save a shortlist of candidates
-export async function saveShortlist(name, candidateIndices) {
+export async function saveShortlist(name, candidateIds) {
   try {
     const response = await fetch(`${API_BASE_URL}/shortlists`, {
       method: 'POST',
@@ -54,7 +62,7 @@ export async function saveShortlist(name, candidateIndices) {
       },
       body: JSON.stringify({
         name,
-        candidateIndices
+        candidate_ids: candidateIds
       }),
     });
     
@@ -89,7 +97,7 @@ export async function getShortlists() {
 // Get specific shortlist details
 export async function getShortlistDetails(name) {
   try {
-    const response = await fetch(`${API_BASE_URL}/shortlist/${encodeURIComponent(name)}`, {
+    const response = await fetch(`${API_BASE_URL}/shortlists/${encodeURIComponent(name)}`, {
       method: 'GET',
       headers: {
         'Content-Type': 'application/json',
@@ -173,6 +181,22 @@ export async function getAnalytics() {
   }
 }
 
+// Subscribe to server-sent change events (analytics deltas, shortlist saves).
+// EventSource reconnects on its own and resumes from the last event ID.
+// Returns a function that closes the stream.
+export function subscribeToChanges({ onSnapshot, onAnalytics, onShortlist } = {}) {
+  const source = new EventSource(`${API_BASE_URL}/events`);
+  const listen = (type, handler) => {
+    if (handler) {
+      source.addEventListener(type, (event) => handler(JSON.parse(event.data)));
+    }
+  };
+  listen('snapshot', onSnapshot);
+  listen('analytics', onAnalytics);
+  listen('shortlist', onShortlist);
+  return () => source.close();
+}
+
 // Get all jobs
 export async function getJobs() {
   try {
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, PieChart, Pie, Cell } from 'recharts';
-import { getAnalytics } from '../api';
+import { getAnalytics, subscribeToChanges } from '../api';
 
 const COLORS = ['#667eea', '#764ba2', '#f093fb', '#f5576c', '#4facfe'];
 
@@ -11,6 +11,11 @@ const AnalyticsDashboard = () => {
 
   useEffect(() => {
     loadAnalytics();
+    // Live updates: the server pushes only the sections that changed
+    return subscribeToChanges({
+      onSnapshot: (data) => data.analytics && setAnalytics(data.analytics),
+      onAnalytics: (data) => setAnalytics((current) => ({ ...current, ...data.changed })),
+    });
   }, []);
 
   const loadAnalytics = async () => {
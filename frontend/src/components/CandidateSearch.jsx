@@ -1,5 +1,9 @@
-import React, { useState } from 'react';
-import { searchCandidates, saveShortlist } from '../api';
+import React, { useEffect, useRef, useState } from 'react';
+import { searchCandidates, saveShortlist, getSuggestions } from '../api';
+
+// Wait for a pause in typing before asking for suggestions
+const SUGGEST_DEBOUNCE_MS = 150;
+const NO_SUGGESTIONS = { completes: '', suggestions: [] };
 
 const CandidateSearch = () => {
   const [query, setQuery] = useState('');
@@ -10,6 +14,48 @@ const CandidateSearch = () => {
   const [shortlistName, setShortlistName] = useState('');
   const [showShortlistForm, setShowShortlistForm] = useState(false);
   const [saveMessage, setSaveMessage] = useState('');
+  const [suggestions, setSuggestions] = useState(NO_SUGGESTIONS);
+  const suggestRequest = useRef(null);
+  const suggestTimer = useRef(null);
+
+  // Drop a pending or running suggestion request
+  const cancelSuggestions = () => {
+    clearTimeout(suggestTimer.current);
+    if (suggestRequest.current) suggestRequest.current.abort();
+    suggestRequest.current = null;
+  };
+
+  // Nothing fires after the search box is gone
+  useEffect(() => () => {
+    clearTimeout(suggestTimer.current);
+    if (suggestRequest.current) suggestRequest.current.abort();
+  }, []);
+
+  // Ask for suggestions once typing pauses; empty input asks for nothing
+  const handleQueryChange = (value) => {
+    setQuery(value);
+    cancelSuggestions();
+    if (!value.trim()) {
+      setSuggestions(NO_SUGGESTIONS);
+      return;
+    }
+    suggestTimer.current = setTimeout(async () => {
+      const controller = new AbortController();
+      suggestRequest.current = controller;
+      try {
+        setSuggestions(await getSuggestions(value, { signal: controller.signal }));
+      } catch (err) {
+        if (err.name !== 'AbortError') setSuggestions(NO_SUGGESTIONS);
+      }
+    }, SUGGEST_DEBOUNCE_MS);
+  };
+
+  // Replace the words being completed with the picked suggestion
+  const applySuggestion = (suggestion) => {
+    const head = query.trimEnd().slice(0, query.trimEnd().length - suggestions.completes.length);
+    setQuery(`${head}${suggestion.text} `);
+    setSuggestions(NO_SUGGESTIONS);
+  };
 
   const handleSearch = async (e) => {
     e.preventDefault();
@@ -17,6 +63,8 @@ const CandidateSearch = () => {
 
     setLoading(true);
     setError('');
+    cancelSuggestions();
+    setSuggestions(NO_SUGGESTIONS);
     setResults([]);
     setSelectedCandidates([]);
 
@@ -30,12 +78,12 @@ const CandidateSearch = () => {
     }
   };
 
-  const toggleCandidateSelection = (candidateIndex) => {
+  const toggleCandidateSelection = (candidateId) => {
     setSelectedCandidates(prev => {
-      if (prev.includes(candidateIndex)) {
-        return prev.filter(idx => idx !== candidateIndex);
+      if (prev.includes(candidateId)) {
+        return prev.filter(id => id !== candidateId);
       } else {
-        return [...prev, candidateIndex];
+        return [...prev, candidateId];
       }
     });
   };
@@ -91,11 +139,30 @@ const CandidateSearch = () => {
                 id="query"
                 type="text"
                 value={query}
-                onChange={(e) => setQuery(e.target.value)}
+                onChange={(e) => handleQueryChange(e.target.value)}
                 placeholder="e.g., Find top 5 React developers in Casablanca, 2-5 years experience"
                 className="input-field pl-12 text-lg"
                 disabled={loading}
+                autoComplete="off"
               />
+              {suggestions.suggestions.length > 0 && (
+                <ul className="absolute z-10 left-0 right-0 mt-1 bg-white border border-slate-200 rounded-xl shadow-lg overflow-hidden">
+                  {suggestions.suggestions.map((suggestion) => (
+                    <li key={`${suggestion.kind}:${suggestion.text}`}>
+                      <button
+                        type="button"
+                        onClick={() => applySuggestion(suggestion)}
+                        className="w-full flex justify-between px-4 py-2 text-left hover:bg-slate-50"
+                      >
+                        <span className="font-medium text-slate-800">{suggestion.text}</span>
+                        <span className="text-xs text-slate-500">
+                          {suggestion.kind} · {suggestion.count}
+                        </span>
+                      </button>
+                    </li>
+                  ))}
+                </ul>
+              )}
             </div>
           </div>
           
@@ -180,8 +247,8 @@ const CandidateSearch = () => {
             {results.map((result, index) => (
               <div
                 key={index}
-                className={`candidate-card group ${selectedCandidates.includes(result.index) ? 'selected' : ''}`}
-                onClick={() => toggleCandidateSelection(result.index)}
+                className={`candidate-card group ${selectedCandidates.includes(result.id) ? 'selected' : ''}`}
+                onClick={() => toggleCandidateSelection(result.id)}
               >
                 <div className="flex items-start justify-between">
                   <div className="flex-1">
@@ -298,8 +365,8 @@ const CandidateSearch = () => {
                   <div className="ml-4">
                     <input
                       type="checkbox"
-                      checked={selectedCandidates.includes(result.index)}
-                      onChange={() => toggleCandidateSelection(result.index)}
+                      checked={selectedCandidates.includes(result.id)}
+                      onChange={() => toggleCandidateSelection(result.id)}
                       className="h-5 w-5 text-primary-600 rounded focus:ring-primary-500"
                     />
                   </div>
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { getShortlists, getShortlistDetails } from '../api';
+import { getShortlists, getShortlistDetails, subscribeToChanges } from '../api';
 
 const ShortlistManager = () => {
   const [shortlists, setShortlists] = useState([]);
@@ -10,6 +10,8 @@ const ShortlistManager = () => {
 
   useEffect(() => {
     loadShortlists();
+    // Reload when a shortlist is saved anywhere instead of polling
+    return subscribeToChanges({ onShortlist: () => loadShortlists() });
   }, []);
 
   const loadShortlists = async () => {